@@ -4,8 +4,12 @@ from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi.security import OAuth2PasswordBearer
-from models.database import users_collection
+from models.user import users_repository
+from pymongo.errors import DuplicateKeyError
 from services.encryption import encrypt_password, decrypt_password
+from services.workers import run_io
+from services.principal_cache import token_id, get_principal, put_principal
+import uuid
 from typing import Optional
 
 router = APIRouter()
@@ -32,57 +36,64 @@ class UserLogin(BaseModel):
 
 def create_access_token(identifier: str):
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    data = {"sub": identifier, "exp": expire}
+    data = {"sub": identifier, "exp": expire, "jti": uuid.uuid4().hex}
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        identifier: str = payload.get("sub")
-
-        if not identifier:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-        user = users_collection.find_one(
-            {"$or": [{"email": identifier}, {"mobile_number": identifier}]}
-        )
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-
-        return {"identifier": identifier, "name": user["name"], "mobile_number": user["mobile_number"]}
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    identifier: str = payload.get("sub")
+    if not identifier:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    # ✅ Principal cache: no database round trip for a token we have already resolved
+    cache_key = token_id(payload, token)
+    principal = get_principal(cache_key)
+    if principal is not None:
+        return principal
+
+    user = await run_io(users_repository.find_by_identifier, identifier)
+    if not user:
+        raise HTTPException(status_code=401, detail="User not found")
+
+    principal = {
+        "identifier": identifier,
+        "name": user["name"],
+        "email": user["email"],
+        "mobile_number": user["mobile_number"],
+    }
+    put_principal(cache_key, principal, payload.get("exp"))
+    return principal
+
 
 @router.post("/register")
 async def register_user(user: UserRegister):
-    existing_user = users_collection.find_one(
-        {"$or": [{"email": user.email}, {"mobile_number": user.mobile_number}]}
-    )
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email or Mobile Number already registered")
-
     encrypted_password, nonce, encryption_key = encrypt_password(user.password)
 
-    users_collection.insert_one({
-        "name": user.name,
-        "email": user.email,
-        "password": encrypted_password,
-        "nonce": nonce,
-        "encryption_key": encryption_key,
-        "mobile_number": user.mobile_number,
-        "created_at": datetime.utcnow(),
-    })
+    # ✅ Unique indexes on email / mobile_number reject duplicates in the same round trip
+    try:
+        users_repository.create({
+            "name": user.name,
+            "email": user.email,
+            "password": encrypted_password,
+            "nonce": nonce,
+            "encryption_key": encryption_key,
+            "mobile_number": user.mobile_number,
+            "created_at": datetime.utcnow(),
+        })
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email or Mobile Number already registered")
 
     return {"message": "User registered successfully! You can now log in."}
 
 
 @router.post("/login")
 async def login_user(user: UserLogin):
-    db_user = users_collection.find_one(
-        {"$or": [{"email": user.identifier}, {"mobile_number": user.identifier}]}
-    )
+    db_user = users_repository.find_by_identifier(user.identifier)
 
     if not db_user:
         raise HTTPException(status_code=400, detail="User not found")
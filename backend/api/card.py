@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from models.database import cardholders_collection
+from models.cardholder import cardholders_repository
 
 router = APIRouter()
 
@@ -19,12 +19,12 @@ class CardNumberRequest(BaseModel):
 # ✅ Register a New Card
 @router.post("/register")
 async def register_card_api(request: CardRegisterRequest):
-    existing_card = cardholders_collection.find_one({"card_number": request.card_number})
+    existing_card = cardholders_repository.find_by_card_number(request.card_number)
 
     if existing_card:
         raise HTTPException(status_code=400, detail="Card is already registered")
 
-    cardholders_collection.insert_one({
+    cardholders_repository.insert_one({
         "card_number": request.card_number,
         "cardholder_name": request.cardholder_name,
         "expiry": request.expiry,
@@ -42,7 +42,7 @@ async def get_mobile_number(request: CardNumberRequest):
     """
     formatted_card_number = request.card_number.replace(" ", "").strip()
 
-    card_data = cardholders_collection.find_one({"card_number": formatted_card_number})
+    card_data = cardholders_repository.find_by_card_number(formatted_card_number)
 
     if not card_data:
         raise HTTPException(status_code=404, detail="Card not found")
@@ -3,11 +3,9 @@ from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional
 import random
-import asyncio
-from models.database import transactions_collection
+import uuid
 from api.auth import get_current_user
-from services.encryption import encrypt_password
-from quantum_simulation.quantum_encrypt import encrypt_message
+from services.payment_pipeline import simulate_settlement, encrypt_payment_details, record_transaction
 
 router = APIRouter()
 
@@ -44,12 +42,10 @@ async def process_payment(transaction: TransactionRequest, current_user: dict =
     if transaction.payment_method == "upi" and not transaction.upi_id:
         raise HTTPException(status_code=400, detail="UPI ID required for UPI Payments.")
 
-    processing_time = random.randint(3, 7)
-    await asyncio.sleep(processing_time)
+    processing_time = await simulate_settlement()
 
-    encrypted_data = encrypt_message(f"{transaction.amount} INR via {transaction.payment_method}", "quantumSecureKey")
-    
-    encrypted_string = str(encrypted_data)
+    # ✅ Merchant-side session when a bank is named, the client's otherwise
+    encrypted_data = await encrypt_payment_details(transaction.amount, transaction.payment_method, transaction.bank_code or current_user.get("identifier"))
 
     status = "Success" if random.random() > 0.2 else "Failed"
 
@@ -60,10 +56,10 @@ async def process_payment(transaction: TransactionRequest, current_user: dict =
         "status": status,
         "timestamp": datetime.utcnow(),
         "bank_code": transaction.bank_code,
-        "transaction_id": encrypt_password(f"{transaction.amount}-{datetime.utcnow()}"),
-        "encrypted_data": encrypted_string
+        "transaction_id": uuid.uuid4().hex,
+        "encrypted_data": encrypted_data
     }
-    transactions_collection.insert_one(transaction_record)
+    await record_transaction(transaction_record)
 
     if status == "Failed":
         raise HTTPException(status_code=400, detail="Transaction Failed! Try Again.")
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
-from models.fraud_logs import log_fraud_attempt
-from services.ml_fraud_detection import detect_fraud
-from models.database import fraud_logs_collection
+from models.fraud_logs import build_fraud_log
+from services.fraud_log_writer import get_fraud_log_writer
+from services.fraud_scoring import get_fraud_batcher
+from services.feature_store import feature_store
+from services.fraud_rules import get_rule_engine
+from config.settings import FRAUD_THRESHOLD
 from api.auth import get_current_user
 from pydantic import BaseModel
 import logging
-from datetime import datetime
 
 router = APIRouter()
 
@@ -39,38 +41,27 @@ async def check_fraudulent_transaction(request: FraudCheckRequest, current_user:
         "ip_address": request.ip_address
     }
 
-    # ✅ Use ML Model for Fraud Detection
-    is_fraudulent = detect_fraud(transaction_data)
+    # ✅ Per-user rolling behaviour (velocity, devices, IPs, location)
+    transaction_data.update(feature_store.features(
+        current_user["email"], request.device, request.ip_address, request.location
+    ))
 
-    # ✅ Apply Additional Rules for Fraud Detection
+    # ✅ Use ML Model for Fraud Detection (micro-batched with concurrent checks)
+    fraud_probability = await get_fraud_batcher().score(transaction_data)
+    is_fraudulent = fraud_probability >= FRAUD_THRESHOLD
+
+    # ✅ Apply Additional Rules for Fraud Detection (config/fraud_rules.json, hot-reloaded)
     reason = []
-    if request.amount > 10000:
-        is_fraudulent = True
-        reason.append("High transaction amount")
-    
-    suspicious_locations = ["Russia", "North Korea", "Iran"]
-    if request.location in suspicious_locations:
-        is_fraudulent = True
-        reason.append("Unusual location")
-    
-    if request.device == "Unknown":
+    if is_fraudulent:
+        reason.append(f"ML risk score {fraud_probability:.2f}")
+    fired_rules = get_rule_engine().evaluate(transaction_data)
+    if fired_rules:
         is_fraudulent = True
-        reason.append("Unrecognized device")
+        reason.extend(rule.reason for rule in fired_rules)
 
     # ✅ If Fraud Detected, Log It and Block Transaction
     if is_fraudulent:
-        log_fraud_attempt(current_user["email"], transaction_data)
-        fraud_logs_collection.insert_one({
-            "user_email": current_user["email"],
-            "amount": request.amount,
-            "payment_method": request.payment_method,
-            "location": request.location,
-            "device": request.device,
-            "ip_address": request.ip_address,
-            "is_fraud": True,
-            "reason": ", ".join(reason),
-            "timestamp": datetime.utcnow()
-        })
+        await get_fraud_log_writer().submit(build_fraud_log(current_user["email"], transaction_data, ", ".join(reason)))
         raise HTTPException(status_code=403, detail=f"Potential Fraud Detected! Reason: {', '.join(reason)}")
 
     return {"message": "Transaction is Secure!"}
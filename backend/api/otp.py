@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from services.otp_service import send_otp, verify_otp
 from services.card_service import get_registered_mobile
+from services.workers import run_io
 import uuid
 
 router = APIRouter()
@@ -22,17 +23,19 @@ async def send_otp_api(request: OTPSendRequest):
     Ensure that the transaction ID is included in the process.
     """
     formatted_card_number = request.card_number.replace(" ", "").strip()  # Ensure no extra spaces
-    mobile_number = get_registered_mobile(formatted_card_number)
+    mobile_number = await run_io(get_registered_mobile, formatted_card_number)
 
     if not mobile_number:
         raise HTTPException(status_code=400, detail="Card not registered or mobile number missing.")
 
     # Generate a new transaction_id if not provided
     transaction_id = request.transaction_id or str(uuid.uuid4())
-    response = send_otp(mobile_number, transaction_id)
+    response = await run_io(send_otp, mobile_number, transaction_id)
 
     if "error" in response:
         raise HTTPException(status_code=500, detail=response["error"])
+    if response["status"] == "failed":
+        raise HTTPException(status_code=429, detail=response["message"])
 
     return {
         "message": "OTP sent successfully",
@@ -45,7 +48,7 @@ async def verify_otp_api(request: OTPVerifyRequest):
     """
     Verify the OTP using the registered mobile number and the transaction ID.
     """
-    is_valid = verify_otp(request.mobile_number, request.otp, request.transaction_id)
+    is_valid = await run_io(verify_otp, request.mobile_number, request.otp, request.transaction_id)
 
     if is_valid["status"] == "failed":
         raise HTTPException(status_code=400, detail=is_valid["message"])
@@ -1,6 +1,10 @@
 from web3 import Web3
+from datetime import datetime
+from services.blockchain_anchor import AnchorService
+from services.pq_signatures import get_record_signer
 import json
 import os
+import uuid
 
 # ✅ Connect to Local Hardhat Node
 w3 = Web3(Web3.HTTPProvider("http://127.0.0.1:8545"))
@@ -29,3 +33,25 @@ def store_transaction_on_blockchain(amount, method, status):
     w3.eth.wait_for_transaction_receipt(tx_hash)
     return tx_hash.hex()
 
+# ✅ Commit one Merkle root for a whole batch of payments, plus the service's signature over it
+def commit_batch_on_blockchain(batch_id, merkle_root, size):
+    # Signature first: a retry after a failed anchorBatch only appends a duplicate signature
+    signature = get_record_signer().sign(batch_id.to_bytes(32, "big") + merkle_root)
+    sig_hash = contract.functions.storePQSignature(signature).transact({"from": w3.eth.accounts[0]})
+    w3.eth.wait_for_transaction_receipt(sig_hash)
+
+    tx_hash = contract.functions.anchorBatch(batch_id, merkle_root, size).transact({"from": w3.eth.accounts[0]})
+    w3.eth.wait_for_transaction_receipt(tx_hash)
+    return tx_hash.hex()
+
+anchor_service = AnchorService(commit_batch_on_blockchain)
+
+# ✅ Queue a payment for batched anchoring (returns batch id + Merkle proof)
+async def anchor_transaction(amount, method, status):
+    return await anchor_service.anchor({
+        "id": uuid.uuid4().hex,
+        "amount": int(amount),
+        "method": method,
+        "status": status,
+        "timestamp": datetime.utcnow().isoformat(),
+    })
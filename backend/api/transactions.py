@@ -1,12 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 import random
-import time
-from models.database import transactions_collection
+import uuid
 from api.auth import get_current_user
-from services.encryption import encrypt_password
-from quantum_simulation.quantum_encrypt import encrypt_message
+from services.payment_pipeline import simulate_settlement, encrypt_payment_details, record_transaction
+from services.transaction_export import export_transactions
+from services.workers import run_io
 
 router = APIRouter()
 
@@ -18,6 +19,9 @@ class TransactionRequest(BaseModel):
     card_number: str | None = None
     upi_id: str | None = None
     status: str = "Pending"
+    device: str | None = None
+    ip_address: str | None = None
+    location: str | None = None
 
 
 @router.post("/process")
@@ -39,10 +43,9 @@ async def process_payment(transaction: TransactionRequest, current_user: dict =
     if transaction.payment_method == "upi" and (not transaction.upi_id or not transaction.upi_id.strip()):
         raise HTTPException(status_code=400, detail="UPI ID required for UPI Payments.")
 
-    processing_time = random.randint(3, 7)
-    time.sleep(processing_time)
+    processing_time = await simulate_settlement()
 
-    encrypted_data = encrypt_message(f"{transaction.amount} INR via {transaction.payment_method}", "quantumSecureKey")
+    encrypted_data = await encrypt_payment_details(transaction.amount, transaction.payment_method, current_user.get("identifier"))
     status = "Success" if random.random() > 0.2 else "Failed"
 
     if "identifier" not in current_user:
@@ -50,16 +53,20 @@ async def process_payment(transaction: TransactionRequest, current_user: dict =
 
     transaction_record = {
         "user_identifier": current_user["identifier"],
+        "user_email": current_user.get("email"),
         "amount": transaction.amount,
         "payment_method": transaction.payment_method,
         "status": status,
         "timestamp": datetime.utcnow(),
         "bank_code": transaction.bank_code,
-        "transaction_id": encrypt_password(f"{transaction.amount}-{datetime.utcnow()}"),
+        "device": transaction.device,
+        "ip_address": transaction.ip_address,
+        "location": transaction.location,
+        "transaction_id": uuid.uuid4().hex,
         "encrypted_data": encrypted_data
     }
 
-    transactions_collection.insert_one(transaction_record)
+    await record_transaction(transaction_record)
 
     if status == "Failed":
         raise HTTPException(status_code=400, detail="Transaction Failed! Try Again.")
@@ -69,3 +76,19 @@ async def process_payment(transaction: TransactionRequest, current_user: dict =
         "transaction_id": transaction_record["transaction_id"],
         "processing_time": f"{processing_time} seconds"
     }
+
+
+@router.get("/export")
+async def export_transaction_history(current_user: dict = Depends(get_current_user)):
+    """
+    Streams the user's transaction history as encrypted JSON lines (chunked
+    AES-GCM under their session key), without materializing it in memory.
+    """
+    if "identifier" not in current_user:
+        raise HTTPException(status_code=401, detail="User authentication failed")
+
+    key_id, frames = await run_io(export_transactions, current_user["identifier"])
+    return StreamingResponse(frames, media_type="application/octet-stream", headers={
+        "Content-Disposition": 'attachment; filename="transactions.jsonl.enc"',
+        "X-Key-Id": key_id,
+    })
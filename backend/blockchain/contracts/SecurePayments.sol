@@ -14,6 +14,17 @@ contract SecurePayments {
     // ✅ PQ Signatures Storage
     mapping(address => bytes[]) public pqSignatures;
 
+    // ✅ Merkle-anchored Payment Batches
+    struct Batch {
+        bytes32 merkleRoot;
+        uint256 size;
+        uint256 timestamp;
+    }
+
+    mapping(uint256 => Batch) public batches;
+
+    event BatchAnchored(uint256 indexed batchId, bytes32 merkleRoot, uint256 size);
+
     // ✅ Store Payment Data
     function storeTransaction(
         uint256 _amount,
@@ -25,6 +36,29 @@ contract SecurePayments {
         );
     }
 
+    // ✅ Anchor a Batch of Payments by its Merkle Root
+    function anchorBatch(uint256 _batchId, bytes32 _merkleRoot, uint256 _size) public {
+        require(batches[_batchId].timestamp == 0, "Batch already anchored");
+        batches[_batchId] = Batch(_merkleRoot, _size, block.timestamp);
+        emit BatchAnchored(_batchId, _merkleRoot, _size);
+    }
+
+    // ✅ Verify a Payment Leaf against an Anchored Batch (sorted-pair SHA-256 tree)
+    function verifyInclusion(
+        uint256 _batchId,
+        bytes32 _leaf,
+        bytes32[] memory _proof
+    ) public view returns (bool) {
+        bytes32 computed = _leaf;
+        for (uint256 i = 0; i < _proof.length; i++) {
+            bytes32 sibling = _proof[i];
+            computed = computed <= sibling
+                ? sha256(abi.encodePacked(computed, sibling))
+                : sha256(abi.encodePacked(sibling, computed));
+        }
+        return batches[_batchId].timestamp != 0 && computed == batches[_batchId].merkleRoot;
+    }
+
     // ✅ Get User Transactions
     function getTransactions(address _user) public view returns (Transaction[] memory) {
         return transactions[_user];
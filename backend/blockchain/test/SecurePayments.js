@@ -0,0 +1,64 @@
+const { loadFixture } = require("@nomicfoundation/hardhat-toolbox/network-helpers");
+const { expect } = require("chai");
+
+// ✅ Mirrors services/blockchain_anchor.py: sorted-pair SHA-256, odd node promoted
+function hashPair(a, b) {
+  return a.toLowerCase() <= b.toLowerCase()
+    ? ethers.sha256(ethers.concat([a, b]))
+    : ethers.sha256(ethers.concat([b, a]));
+}
+
+function buildTree(leaves) {
+  const levels = [leaves];
+  while (levels[levels.length - 1].length > 1) {
+    const level = levels[levels.length - 1];
+    const parents = [];
+    for (let i = 0; i + 1 < level.length; i += 2) parents.push(hashPair(level[i], level[i + 1]));
+    if (level.length % 2) parents.push(level[level.length - 1]);
+    levels.push(parents);
+  }
+  return levels;
+}
+
+function proofFor(levels, index) {
+  const proof = [];
+  for (const level of levels.slice(0, -1)) {
+    const sibling = index ^ 1;
+    if (sibling < level.length) proof.push(level[sibling]);
+    index = Math.floor(index / 2);
+  }
+  return proof;
+}
+
+describe("SecurePayments batch anchoring", function () {
+  async function deployFixture() {
+    const SecurePayments = await ethers.getContractFactory("SecurePayments");
+    const contract = await SecurePayments.deploy();
+    const leaves = [...Array(5).keys()].map((i) => ethers.sha256(ethers.toUtf8Bytes(`payment-${i}`)));
+    const levels = buildTree(leaves);
+    return { contract, leaves, levels };
+  }
+
+  it("Should anchor a batch root and verify every payment proof", async function () {
+    const { contract, leaves, levels } = await loadFixture(deployFixture);
+    const root = levels[levels.length - 1][0];
+
+    await expect(contract.anchorBatch(1, root, leaves.length))
+      .to.emit(contract, "BatchAnchored")
+      .withArgs(1, root, leaves.length);
+
+    for (let i = 0; i < leaves.length; i++) {
+      expect(await contract.verifyInclusion(1, leaves[i], proofFor(levels, i))).to.equal(true);
+    }
+  });
+
+  it("Should reject re-anchoring and forged leaves", async function () {
+    const { contract, leaves, levels } = await loadFixture(deployFixture);
+    const root = levels[levels.length - 1][0];
+    await contract.anchorBatch(7, root, leaves.length);
+
+    await expect(contract.anchorBatch(7, root, leaves.length)).to.be.revertedWith("Batch already anchored");
+    const forged = ethers.sha256(ethers.toUtf8Bytes("forged"));
+    expect(await contract.verifyInclusion(7, forged, proofFor(levels, 0))).to.equal(false);
+  });
+});
@@ -0,0 +1,93 @@
+import json
+import os
+
+# ✅ Payment Settlement Simulation (seconds)
+SETTLEMENT_MIN_SECONDS = float(os.getenv("SETTLEMENT_MIN_SECONDS", "3"))
+SETTLEMENT_MAX_SECONDS = float(os.getenv("SETTLEMENT_MAX_SECONDS", "7"))
+SECURE_SETTLEMENT_SECONDS = float(os.getenv("SECURE_SETTLEMENT_SECONDS", "6"))
+
+# ✅ Worker Pools (blocking I/O on threads, CPU-bound crypto on processes)
+IO_WORKERS = int(os.getenv("IO_WORKERS", "32"))
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", str(os.cpu_count() or 1)))
+
+# ✅ Quantum-inspired Payload Encryption
+QUANTUM_MASTER_SALT = os.getenv("QUANTUM_MASTER_SALT", "secure-payments-master-salt").encode()
+DERIVED_KEY_CACHE_SIZE = int(os.getenv("DERIVED_KEY_CACHE_SIZE", "4096"))
+
+# ✅ Blockchain Batch Anchoring
+ANCHOR_BATCH_SIZE = int(os.getenv("ANCHOR_BATCH_SIZE", "64"))
+ANCHOR_FLUSH_INTERVAL_MS = int(os.getenv("ANCHOR_FLUSH_INTERVAL_MS", "250"))
+ANCHOR_COMMIT_RETRIES = int(os.getenv("ANCHOR_COMMIT_RETRIES", "3"))
+
+# ✅ MongoDB (one pool per worker process; size it as total connections / workers)
+MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017/")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "secure_payment_db")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000"))
+
+# ✅ Authenticated Principal Cache (set PRINCIPAL_CACHE_SIZE=0 to disable)
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
+# ✅ Rate Limiting (requests per window; backend: memory | sqlite | mongo)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_SQLITE_PATH = os.getenv("RATE_LIMIT_SQLITE_PATH", "/tmp/secure_payments_rate_limits.db")
+RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+RATE_LIMIT_PER_MINUTE = int(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+USER_RATE_LIMIT_PER_MINUTE = int(os.getenv("USER_RATE_LIMIT_PER_MINUTE", "120"))
+ROUTE_RATE_LIMITS = json.loads(os.getenv("ROUTE_RATE_LIMITS", '{"/auth/login": 10, "/otp/send": 5, "/otp/verify": 10}'))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# ✅ Fraud Scoring (micro-batching of concurrent /fraud/check requests)
+FRAUD_THRESHOLD = float(os.getenv("FRAUD_THRESHOLD", "0.5"))
+FRAUD_BATCH_MAX_SIZE = int(os.getenv("FRAUD_BATCH_MAX_SIZE", "64"))
+FRAUD_BATCH_MAX_WAIT_MS = float(os.getenv("FRAUD_BATCH_MAX_WAIT_MS", "2"))
+
+# ✅ Streaming Fraud Feature Store (per worker, snapshotted across restarts)
+FEATURE_STORE_MAX_USERS = int(os.getenv("FEATURE_STORE_MAX_USERS", "100000"))
+FEATURE_STORE_MAX_DISTINCT = int(os.getenv("FEATURE_STORE_MAX_DISTINCT", "32"))
+FEATURE_STORE_SNAPSHOT_PATH = os.getenv("FEATURE_STORE_SNAPSHOT_PATH", "/tmp/secure_payments_features.pkl")
+FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS", "60"))
+
+# ✅ Write-Behind Fraud Log Pipeline
+FRAUD_LOG_QUEUE_SIZE = int(os.getenv("FRAUD_LOG_QUEUE_SIZE", "10000"))
+FRAUD_LOG_BATCH_SIZE = int(os.getenv("FRAUD_LOG_BATCH_SIZE", "500"))
+
+# ✅ Declarative Fraud Rules (hot-reloaded when the file changes)
+FRAUD_RULES_PATH = os.getenv("FRAUD_RULES_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_rules.json"))
+FRAUD_RULES_RELOAD_SECONDS = float(os.getenv("FRAUD_RULES_RELOAD_SECONDS", "2"))
+
+# ✅ Pre-generated QKD Key Pool
+QKD_KEY_BYTES = int(os.getenv("QKD_KEY_BYTES", "16"))
+QKD_POOL_LOW_WATER = int(os.getenv("QKD_POOL_LOW_WATER", "256"))
+QKD_POOL_HIGH_WATER = int(os.getenv("QKD_POOL_HIGH_WATER", "2048"))
+QKD_REFILL_BATCH = int(os.getenv("QKD_REFILL_BATCH", "512"))
+QKD_POOL_WAIT_SECONDS = float(os.getenv("QKD_POOL_WAIT_SECONDS", "5"))
+QKD_KEY_CACHE_SIZE = int(os.getenv("QKD_KEY_CACHE_SIZE", "10000"))
+QKD_KEY_WRAP_PASSWORD = os.getenv("QKD_KEY_WRAP_PASSWORD", "quantumSecureKey")
+
+# ✅ Transaction Record Signatures (Dilithium via liboqs, Ed25519 stand-in without it)
+PQ_SIGNATURE_ALGORITHM = os.getenv("PQ_SIGNATURE_ALGORITHM", "Dilithium2")
+PQ_KEY_DIR = os.getenv("PQ_KEY_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "security", "keys"))
+PQ_VERIFY_CHUNK_SIZE = int(os.getenv("PQ_VERIFY_CHUNK_SIZE", "256"))
+
+# ✅ Hybrid KEM (X25519 + ML-KEM) session keys for payload encryption
+KEM_ALGORITHM = os.getenv("KEM_ALGORITHM", "ML-KEM-768")
+KEM_SESSION_MAX_MESSAGES = int(os.getenv("KEM_SESSION_MAX_MESSAGES", "1000"))
+KEM_SESSION_MAX_AGE_SECONDS = float(os.getenv("KEM_SESSION_MAX_AGE_SECONDS", "3600"))
+KEM_PLATFORM_PARTY = os.getenv("KEM_PLATFORM_PARTY", "platform")
+KEM_KEY_CACHE_SIZE = int(os.getenv("KEM_KEY_CACHE_SIZE", "10000"))
+KEM_KEY_WRAP_PASSWORD = os.getenv("KEM_KEY_WRAP_PASSWORD", QKD_KEY_WRAP_PASSWORD)
+
+# ✅ Streaming (chunked AES-GCM) encryption for large payloads and exports
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(64 * 1024)))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# ✅ OTP Store (hashed, TTL-indexed, single round-trip verify)
+OTP_TTL_SECONDS = int(os.getenv("OTP_TTL_SECONDS", "300"))
+OTP_RESEND_SECONDS = int(os.getenv("OTP_RESEND_SECONDS", "60"))
+OTP_MAX_ATTEMPTS = int(os.getenv("OTP_MAX_ATTEMPTS", "5"))
+OTP_HASH_PASSWORD = os.getenv("OTP_HASH_PASSWORD", QKD_KEY_WRAP_PASSWORD)
@@ -3,24 +3,40 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from pymongo import MongoClient
 from passlib.context import CryptContext
-import time
 import uvicorn
+import uuid
 from pydantic import BaseModel, Field
 from api.auth import router as auth_router, get_current_user
 from api.transactions import router as transactions_router
 from api.fraud_detection import router as fraud_router
-from api.payment_gateway import store_transaction_on_blockchain
+from api.payment_gateway import anchor_transaction, anchor_service
 from api.otp import router as otp_router
 from api.card import router as card_router
 from api.financial_institutions import router as financial_router
 from security.firewalls.ddos_protection import RateLimitMiddleware
 from security.ssl_config import SSL_CERT_FILE, SSL_KEY_FILE
 from monitoring.prometheus_metrics import setup_metrics
-from quantum_simulation.quantum_encrypt import encrypt_message
 from services.encryption import encrypt_password, decrypt_password
+from services.payment_pipeline import simulate_settlement, encrypt_payment_details, record_transaction
+from quantum_simulation.envelope import to_text
+from services.workers import run_io, shutdown_workers
 from models.fraud_logs import log_fraud_attempt
+from models.database import ping, close_client
+from models.migrations import ensure_indexes
+from pymongo.errors import DuplicateKeyError
+from models.user import users_repository
+from models.transaction import transactions_repository
+from config.settings import (
+    SECURE_SETTLEMENT_SECONDS,
+    RATE_LIMIT_PER_MINUTE,
+    FEATURE_STORE_SNAPSHOT_PATH,
+    FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS,
+)
+from services.feature_store import feature_store
+from services.fraud_log_writer import get_fraud_log_writer
+from services.qkd_key_pool import get_key_pool
+import asyncio
 
 app = FastAPI()
 
@@ -39,14 +55,47 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(RateLimitMiddleware, limit_per_minute=30)
+app.add_middleware(RateLimitMiddleware, limit_per_minute=RATE_LIMIT_PER_MINUTE)
 
 setup_metrics(app)
 
-client = MongoClient("mongodb://localhost:27017/")
-db = client["secure_payment_db"]
-users_collection = db["users"]
-transactions_collection = db["transactions"]
+
+@app.on_event("startup")
+async def init_database():
+    await run_io(ensure_indexes)
+
+
+async def snapshot_features_periodically():
+    while True:
+        await asyncio.sleep(FEATURE_STORE_SNAPSHOT_INTERVAL_SECONDS)
+        try:
+            await run_io(feature_store.snapshot, FEATURE_STORE_SNAPSHOT_PATH)
+        except Exception as e:
+            print(f"🚨 Feature store snapshot failed: {e}")
+
+
+@app.on_event("startup")
+async def start_key_pool():
+    get_key_pool().start()
+
+
+@app.on_event("startup")
+async def restore_feature_store():
+    restored = await run_io(feature_store.restore, FEATURE_STORE_SNAPSHOT_PATH)
+    print(f"✅ Feature store restored for {restored} users")
+    app.state.feature_snapshot_task = asyncio.create_task(snapshot_features_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_worker_pools():
+    app.state.feature_snapshot_task.cancel()
+    await anchor_service.flush()
+    await get_fraud_log_writer().close()
+    get_key_pool().stop()
+    await run_io(feature_store.snapshot, FEATURE_STORE_SNAPSHOT_PATH)
+    shutdown_workers()
+    close_client()
+
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -67,7 +116,7 @@ def verify_password(plain_password, hashed_password) -> bool:
 
 def create_access_token(identifier: str):
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    data = {"sub": identifier, "exp": expire}
+    data = {"sub": identifier, "exp": expire, "jti": uuid.uuid4().hex}
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
 
 
@@ -89,12 +138,6 @@ async def register_user(
     mobile_number: str,
     password: str
 ):
-    existing_user = users_collection.find_one(
-        {"$or": [{"email": email}, {"mobile_number": mobile_number}]}
-    )
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email or Mobile Number already registered")
-
     encrypted_password, nonce, encryption_key = encrypt_password(password)
 
     new_user = {
@@ -106,7 +149,10 @@ async def register_user(
         "encryption_key": encryption_key,
         "created_at": datetime.utcnow(),
     }
-    users_collection.insert_one(new_user)
+    try:
+        users_repository.create(new_user)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email or Mobile Number already registered")
     return {"message": "User registered successfully"}
 
 
@@ -117,9 +163,7 @@ class UserLogin(BaseModel):
 
 @app.post("/auth/login")
 async def login_user(user: UserLogin):
-    db_user = users_collection.find_one(
-        {"$or": [{"email": user.identifier}, {"mobile_number": user.identifier}]}
-    )
+    db_user = users_repository.find_by_identifier(user.identifier)
 
     if not db_user:
         raise HTTPException(status_code=400, detail="User not found")
@@ -160,11 +204,11 @@ async def secure_payment(
     if payment_method == "netbanking" and (not bank_code or not bank_code.strip()):
         raise HTTPException(status_code=400, detail="Bank code required for Net Banking")
 
-    time.sleep(6)
+    await simulate_settlement(SECURE_SETTLEMENT_SECONDS, SECURE_SETTLEMENT_SECONDS)
 
-    encrypted_data = encrypt_message(f"{amount} INR via {payment_method}", "quantumSecureKey")
+    encrypted_data = await encrypt_payment_details(amount, payment_method, user.get("identifier"))
 
-    blockchain_tx = store_transaction_on_blockchain(int(amount), payment_method, "Success")
+    anchor = await anchor_transaction(amount, payment_method, "Success")
 
     if "identifier" not in user:
         raise HTTPException(status_code=401, detail="User authentication failed")
@@ -175,20 +219,25 @@ async def secure_payment(
         "payment_method": payment_method,
         "status": "Success",
         "timestamp": datetime.utcnow(),
-        "transaction_id": blockchain_tx
+        "transaction_id": anchor["leaf"],
+        "batch_id": anchor["batch_id"],
+        "merkle_root": anchor["merkle_root"],
+        "merkle_proof": anchor["merkle_proof"],
     }
-    transactions_collection.insert_one(transaction)
+    await record_transaction(transaction)
 
     return {
         "message": "Secure Payment Processed",
-        "transaction_id": blockchain_tx,
-        "encrypted_data": encrypted_data
+        "transaction_id": anchor["leaf"],
+        "batch_id": anchor["batch_id"],
+        "merkle_proof": anchor["merkle_proof"],
+        "encrypted_data": to_text(encrypted_data)
     }
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "running", "timestamp": datetime.utcnow()}
+    return {"status": "running", "database": await run_io(ping), "timestamp": datetime.utcnow()}
 
 
 if not SSL_CERT_FILE or not SSL_KEY_FILE:
@@ -1,14 +1,28 @@
-from pymongo import MongoClient
+from pymongo import ASCENDING
+from models.database import Repository
+
+
+class CardholderRepository(Repository):
+    collection_name = "cardholders"
+
+    def find_by_card_number(self, card_number):
+        return self.find_one({"card_number": card_number})
+
+    def find_by_card_number_variants(self, *card_numbers):
+        """Match any of the given spellings (spaced / unspaced) of a card number."""
+        return self.find_one({"$or": [{"card_number": number} for number in card_numbers]})
+
+    def ensure_indexes(self):
+        self.collection.create_index([("card_number", ASCENDING)])
+
+
+cardholders_repository = CardholderRepository()
 
-# ✅ Connect to MongoDB
-client = MongoClient("mongodb://localhost:27017/")
-db = client["secure_payment_db"]
-cardholders_collection = db["cardholders"]
 
 # ✅ Function to Register Card and Mobile Number
 def register_card(card_number, cardholder_name, expiry, mobile_number, user_email):
     """Stores card details with a registered mobile number"""
-    existing_card = cardholders_collection.find_one({"card_number": card_number})
+    existing_card = cardholders_repository.find_by_card_number(card_number)
     if existing_card:
         return {"error": "Card already registered!"}
 
@@ -19,5 +33,5 @@ def register_card(card_number, cardholder_name, expiry, mobile_number, user_emai
         "mobile_number": mobile_number,
         "user_email": user_email,
     }
-    cardholders_collection.insert_one(card_data)
+    cardholders_repository.insert_one(card_data)
     return {"message": "Card registered successfully"}
@@ -1,13 +1,101 @@
+import threading
+import time
 from pymongo import MongoClient
+from config.settings import (
+    MONGO_URI,
+    MONGO_DB_NAME,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+)
 
-MONGO_URI = "mongodb://localhost:27017/"
-client = MongoClient(MONGO_URI)
-db = client["secure_payment_db"]
+# ✅ One shared client (and connection pool) per worker process, created on first use
+_client = None
+_client_lock = threading.Lock()
 
-users_collection = db["users"]
-transactions_collection = db["transactions"]
-fraud_logs_collection = db["fraud_logs"]
-cardholders_collection = db["cardholders"]
-banks_collection = db["banks"]
 
-print("Connected to MongoDB - Database Initialized")
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                    waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    connect=False,
+                )
+    return _client
+
+
+def set_client(client):
+    """Swap the shared client, e.g. for `mongomock.MongoClient()` in tests."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def close_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def get_db():
+    return get_client().get_database(MONGO_DB_NAME)
+
+
+def ping():
+    """Health probe: round trip to the server and report latency."""
+    start = time.perf_counter()
+    try:
+        get_client().admin.command("ping")
+    except Exception as e:
+        return {"status": "down", "error": str(e)}
+    return {"status": "up", "latency_ms": round((time.perf_counter() - start) * 1000, 2)}
+
+
+class Repository:
+    """
+    Base class for collection access. Subclasses set `collection_name` and add
+    domain queries; the collection handle is resolved lazily from the shared client.
+    """
+    collection_name = None
+
+    @property
+    def collection(self):
+        return get_db()[self.collection_name]
+
+    def insert_one(self, document):
+        return self.collection.insert_one(document)
+
+    def insert_many(self, documents, ordered=True):
+        return self.collection.insert_many(documents, ordered=ordered)
+
+    def find_one(self, *args, **kwargs):
+        return self.collection.find_one(*args, **kwargs)
+
+    def find(self, *args, **kwargs):
+        return self.collection.find(*args, **kwargs)
+
+    def update_one(self, *args, **kwargs):
+        return self.collection.update_one(*args, **kwargs)
+
+    def delete_one(self, *args, **kwargs):
+        return self.collection.delete_one(*args, **kwargs)
+
+    def count_documents(self, *args, **kwargs):
+        return self.collection.count_documents(*args, **kwargs)
+
+    def bulk_write(self, requests, ordered=False):
+        return self.collection.bulk_write(requests, ordered=ordered)
+
+    def ensure_indexes(self):
+        """Create the indexes this collection relies on (run at startup)."""
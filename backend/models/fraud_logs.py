@@ -1,28 +1,50 @@
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING
+from models.database import Repository
 from datetime import datetime
 
-# ✅ Connect to MongoDB
-client = MongoClient("mongodb://localhost:27017/")
-db = client["secure_payment_db"]
-fraud_logs_collection = db["fraud_logs"]
 
-# ✅ Function to Log Fraud Attempts
-def log_fraud_attempt(user_email: str, transaction_data: dict):
+class FraudLogRepository(Repository):
+    collection_name = "fraud_logs"
+
+    def ensure_indexes(self):
+        self.collection.create_index([("user_email", ASCENDING), ("timestamp", DESCENDING)])
+        self.collection.create_index([("timestamp", DESCENDING)])
+
+
+fraud_logs_repository = FraudLogRepository()
+
+
+# ✅ One document per flagged transaction
+def build_fraud_log(user_email: str, transaction_data: dict, reason: str = "Fraudulent transaction detected") -> dict:
     """
-    Logs a fraud attempt in the database.
+    Builds the fraud log document for a flagged transaction.
 
     :param user_email: Email of the user associated with the fraudulent transaction
     :param transaction_data: Transaction details (amount, payment method, etc.)
+    :param reason: Why the transaction was flagged
     """
-    fraud_log = {
+    return {
         "user_email": user_email,
         "amount": transaction_data.get("amount"),
         "payment_method": transaction_data.get("payment_method"),
         "status": transaction_data.get("status"),
+        "location": transaction_data.get("location"),
+        "device": transaction_data.get("device"),
+        "ip_address": transaction_data.get("ip_address"),
+        "is_fraud": True,
+        "reason": reason,
         "timestamp": datetime.utcnow(),
-        "reason": "Fraudulent transaction detected",
     }
-    
-    fraud_logs_collection.insert_one(fraud_log)
+
+
+# ✅ Function to Log Fraud Attempts
+def log_fraud_attempt(user_email: str, transaction_data: dict, reason: str = "Fraudulent transaction detected"):
+    """
+    Logs a fraud attempt in the database (synchronously; request handlers use
+    services.fraud_log_writer instead).
+
+    :param user_email: Email of the user associated with the fraudulent transaction
+    :param transaction_data: Transaction details (amount, payment method, etc.)
+    """
+    fraud_logs_repository.insert_one(build_fraud_log(user_email, transaction_data, reason))
     print(f"Fraud attempt logged for {user_email}")
-    
\ No newline at end of file
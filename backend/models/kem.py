@@ -0,0 +1,39 @@
+from datetime import datetime
+from pymongo import ASCENDING
+from models.database import Repository
+
+
+class KemRecipientRepository(Repository):
+    """Public KEM keys of clients/merchants (`_id` = party id). The platform's own entry also carries its wrapped secret."""
+    collection_name = "kem_recipients"
+
+    def find_recipient(self, party_id):
+        return self.find_one({"_id": party_id})
+
+    def save_recipient(self, party_id, public):
+        return self.update_one({"_id": party_id}, {"$set": {"public": public, "updated_at": datetime.utcnow()}}, upsert=True)
+
+
+class KemSessionRepository(Repository):
+    """One document per session key: who it was encapsulated to and the encapsulation (never the key)."""
+    collection_name = "kem_sessions"
+
+    def ensure_indexes(self):
+        self.collection.create_index([("party_id", ASCENDING), ("created_at", ASCENDING)])
+
+    def save_session(self, key_id, party_id, recipient, kem, encapsulation):
+        return self.insert_one({
+            "_id": key_id,
+            "party_id": party_id,
+            "recipient": recipient,
+            "kem": kem,
+            "encapsulation": encapsulation,
+            "created_at": datetime.utcnow(),
+        })
+
+    def find_session(self, key_id):
+        return self.find_one({"_id": key_id})
+
+
+kem_recipients_repository = KemRecipientRepository()
+kem_sessions_repository = KemSessionRepository()
@@ -0,0 +1,31 @@
+from models.user import users_repository
+from models.transaction import transactions_repository
+from models.fraud_logs import fraud_logs_repository
+from models.cardholder import cardholders_repository
+from models.otp import otp_repository
+from models.rate_limit import rate_limit_repository
+from models.qkd_key import qkd_keys_repository
+from models.kem import kem_recipients_repository, kem_sessions_repository
+
+# ✅ Every repository whose indexes are bootstrapped at startup
+REPOSITORIES = [
+    users_repository,
+    transactions_repository,
+    fraud_logs_repository,
+    cardholders_repository,
+    otp_repository,
+    rate_limit_repository,
+    qkd_keys_repository,
+    kem_recipients_repository,
+    kem_sessions_repository,
+]
+
+
+def ensure_indexes():
+    """
+    Startup migration: create the indexes every hot query depends on.
+    create_index is idempotent, so this is safe to run on every boot.
+    """
+    for repository in REPOSITORIES:
+        repository.ensure_indexes()
+    print("✅ MongoDB indexes ensured")
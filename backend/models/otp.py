@@ -0,0 +1,61 @@
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from models.database import Repository
+
+
+class OtpRepository(Repository):
+    """
+    One pending OTP per (mobile_number, transaction_id), stored as a keyed hash.
+    Every operation is a single round trip; expiry is enforced in the queries
+    and expired entries are reaped by the TTL index.
+    """
+    collection_name = "otp_storage"
+
+    def ensure_indexes(self):
+        self.collection.create_index([("mobile_number", ASCENDING), ("transaction_id", ASCENDING)], unique=True)
+        # ✅ TTL index evicts expired OTPs
+        self.collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+    def find_for_transaction(self, mobile_number, transaction_id):
+        return self.find_one({"mobile_number": mobile_number, "transaction_id": transaction_id})
+
+    def issue(self, mobile_number, transaction_id, otp_hash, now, expires_at, resend_at):
+        """
+        Stores a new OTP unless the pending one is still inside its resend window.
+        The window check and the upsert are one atomic write: a blocked resend
+        makes the upsert collide with the unique index. Returns False when blocked.
+        """
+        try:
+            self.update_one(
+                {"mobile_number": mobile_number, "transaction_id": transaction_id, "resend_at": {"$lte": now}},
+                {"$set": {"otp_hash": otp_hash, "expires_at": expires_at, "resend_at": resend_at, "attempts": 0}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def consume(self, mobile_number, transaction_id, otp_hash, now, max_attempts):
+        """Deletes and returns the entry if the hash matches, it has not expired and attempts are left."""
+        return self.collection.find_one_and_delete({
+            "mobile_number": mobile_number,
+            "transaction_id": transaction_id,
+            "otp_hash": otp_hash,
+            "expires_at": {"$gt": now},
+            "attempts": {"$lt": max_attempts},
+        })
+
+    def record_failure(self, mobile_number, transaction_id):
+        """Counts a wrong guess; returns the updated entry (None if there is no pending OTP)."""
+        return self.collection.find_one_and_update(
+            {"mobile_number": mobile_number, "transaction_id": transaction_id},
+            {"$inc": {"attempts": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    def discard(self, mobile_number, transaction_id, otp_hash):
+        """Removes an OTP that was never delivered (only if it was not replaced meanwhile)."""
+        return self.delete_one({"mobile_number": mobile_number, "transaction_id": transaction_id, "otp_hash": otp_hash})
+
+
+otp_repository = OtpRepository()
@@ -0,0 +1,23 @@
+from datetime import datetime
+from models.database import Repository
+
+
+class QkdKeyRepository(Repository):
+    """
+    Persistent store of issued-or-pooled QKD keys, wrapped (AES-GCM) under a
+    key derived from the master key. `_id` is the key id kept with ciphertexts.
+    """
+    collection_name = "qkd_keys"
+
+    def save_wrapped(self, entries):
+        """entries: iterable of (key_id, nonce, wrapped_key)."""
+        now = datetime.utcnow()
+        documents = [{"_id": key_id, "nonce": nonce, "wrapped_key": wrapped, "created_at": now} for key_id, nonce, wrapped in entries]
+        if documents:
+            self.insert_many(documents, ordered=False)
+
+    def find_wrapped(self, key_id):
+        return self.find_one({"_id": key_id}, {"nonce": 1, "wrapped_key": 1})
+
+
+qkd_keys_repository = QkdKeyRepository()
@@ -0,0 +1,18 @@
+from datetime import datetime
+from pymongo import ASCENDING
+from models.database import Repository
+
+
+class RateLimitRepository(Repository):
+    collection_name = "rate_limits"
+
+    @staticmethod
+    def expiry(timestamp):
+        return datetime.utcfromtimestamp(timestamp)
+
+    def ensure_indexes(self):
+        # ✅ TTL index evicts idle limiter keys
+        self.collection.create_index([("expires_at", ASCENDING)], expireAfterSeconds=0)
+
+
+rate_limit_repository = RateLimitRepository()
@@ -1,16 +1,42 @@
-from models.database import db
+from pymongo import ASCENDING, DESCENDING
+from models.database import Repository
+
+
+class TransactionRepository(Repository):
+    collection_name = "transactions"
+
+    def __init__(self):
+        self._save_listeners = []
+
+    def add_save_listener(self, listener):
+        """`listener(transaction)` is called after every successful save."""
+        self._save_listeners.append(listener)
+
+    def ensure_indexes(self):
+        self.collection.create_index([("user_identifier", ASCENDING), ("timestamp", DESCENDING)])
+        self.collection.create_index([("user_email", ASCENDING), ("timestamp", DESCENDING)])
+
+    def save(self, transaction):
+        inserted_id = self.insert_one(transaction).inserted_id
+        for listener in self._save_listeners:
+            listener(transaction)
+        return inserted_id
+
+    def get(self, transaction_id):
+        return self.find_one({"_id": transaction_id})
+
+
+transactions_repository = TransactionRepository()
 
-# ✅ MongoDB Collection for Transactions
-transactions_collection = db["transactions"]
 
 def save_transaction(transaction):
     """
     ✅ Saves a transaction in the database.
     """
-    return transactions_collection.insert_one(transaction).inserted_id
+    return transactions_repository.save(transaction)
 
 def get_transaction(transaction_id):
     """
     ✅ Retrieves a transaction by ID.
     """
-    return transactions_collection.find_one({"_id": transaction_id})
+    return transactions_repository.get(transaction_id)
@@ -1,16 +1,59 @@
-from models.database import db
+from pymongo import ASCENDING, ReturnDocument
+from models.database import Repository
+
+
+def identifier_field(identifier):
+    """Login identifiers are either an email or a mobile number; pick the one indexed field to query."""
+    return "email" if "@" in identifier else "mobile_number"
+
+
+class UserRepository(Repository):
+    collection_name = "users"
+
+    def __init__(self):
+        self._update_listeners = []
+
+    def add_update_listener(self, listener):
+        """`listener(*identifiers)` is called after a user document changes."""
+        self._update_listeners.append(listener)
+
+    def create(self, user_data):
+        """Insert a user; raises DuplicateKeyError if the email or mobile number is taken."""
+        return self.insert_one(user_data)
+
+    def find_by_identifier(self, identifier):
+        """Retrieves a user by email or mobile number with a single-index equality match."""
+        return self.find_one({identifier_field(identifier): identifier})
+
+    def update_by_identifier(self, identifier, fields):
+        """Update a user and notify listeners with both old and new identifiers."""
+        before = self.collection.find_one_and_update(
+            {identifier_field(identifier): identifier},
+            {"$set": fields},
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is not None:
+            identifiers = {before.get("email"), before.get("mobile_number"), fields.get("email"), fields.get("mobile_number")}
+            for listener in self._update_listeners:
+                listener(*identifiers)
+        return before
+
+    def ensure_indexes(self):
+        self.collection.create_index([("email", ASCENDING)], unique=True)
+        self.collection.create_index([("mobile_number", ASCENDING)], unique=True)
+
+
+users_repository = UserRepository()
 
-# ✅ MongoDB Collection for Users
-users_collection = db["users"]
 
 def create_user(user_data):
     """
     ✅ Saves a new user in the database.
     """
-    return users_collection.insert_one(user_data)
+    return users_repository.create(user_data)
 
 def find_user_by_email_or_mobile(identifier):
     """
     ✅ Retrieves a user by email or mobile number.
     """
-    return users_collection.find_one({"$or": [{"email": identifier}, {"mobile_number": identifier}]})
+    return users_repository.find_by_identifier(identifier)
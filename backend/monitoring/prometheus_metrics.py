@@ -1,25 +1,51 @@
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from fastapi import FastAPI, Request, Response
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from fastapi import FastAPI, Response
 import time
 
 # ✅ Define Metrics
 REQUEST_COUNT = Counter("http_requests_total", "Total HTTP Requests", ["method", "endpoint", "http_status"])
 REQUEST_LATENCY = Histogram("http_request_latency_seconds", "HTTP Request Latency", ["method", "endpoint"])
+PRINCIPAL_CACHE_REQUESTS = Counter("principal_cache_requests_total", "Authenticated principal cache lookups", ["result"])
+FRAUD_BATCH_SIZE = Histogram("fraud_scoring_batch_size", "Transactions per vectorized fraud scoring call", buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+FRAUD_SCORING_LATENCY = Histogram("fraud_scoring_latency_seconds", "Queue wait plus model time per scored transaction", buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25))
+FRAUD_RULE_HITS = Counter("fraud_rule_hits_total", "Fraud rule matches", ["rule_id"])
+FRAUD_LOG_QUEUE_DEPTH = Gauge("fraud_log_queue_depth", "Fraud log documents waiting to be written")
+FRAUD_LOG_FLUSH_LATENCY = Histogram("fraud_log_flush_latency_seconds", "Time to write one batch of fraud logs", buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1))
+QKD_POOL_SIZE = Gauge("qkd_key_pool_size", "Pre-generated QKD keys ready to use")
+QKD_POOL_WAITS = Counter("qkd_key_pool_waits_total", "Encryptions that found the QKD key pool empty")
+FRAUD_LOG_WRITE_ERRORS = Counter("fraud_log_write_errors_total", "Fraud log documents that failed to be written")
+
+
+class PrometheusMiddleware:
+    """Pure ASGI request metrics: records status and latency without wrapping the response."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            process_time = time.perf_counter() - start_time
+            REQUEST_COUNT.labels(scope["method"], scope["path"], status_code).inc()
+            REQUEST_LATENCY.labels(scope["method"], scope["path"]).observe(process_time)
+
 
 def setup_metrics(app: FastAPI):
     """Middleware to track API metrics."""
-    
-    @app.middleware("http")
-    async def prometheus_middleware(request: Request, call_next):
-        start_time = time.time()
-        
-        response = await call_next(request)
-        
-        process_time = time.time() - start_time
-        REQUEST_COUNT.labels(request.method, request.url.path, response.status_code).inc()
-        REQUEST_LATENCY.labels(request.method, request.url.path).observe(process_time)
-        
-        return response
+    app.add_middleware(PrometheusMiddleware)
 
     # ✅ Expose `/metrics` Endpoint for Prometheus
     @app.get("/metrics")
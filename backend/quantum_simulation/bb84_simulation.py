@@ -1,20 +1,191 @@
-import random
+import math
+from typing import NamedTuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
-# ✅ Function to Simulate BB84 Quantum Key Distribution
-def bb84_key_exchange():
-    key_length = 128  # 128-bit encryption
-    alice_bits = [random.randint(0, 1) for _ in range(key_length)]
-    alice_bases = [random.choice(["+", "x"]) for _ in range(key_length)]
+# ✅ Post-processing parameters
+QBER_ABORT_THRESHOLD = 0.11    # above this no secret key can be distilled
+EC_EFFICIENCY = 1.5            # measured parity leakage vs the Shannon limit, used for sizing
+EC_PASSES = 8
+EC_BLOCK_GROWTH = 1.5
+VERIFY_BITS = 64               # hash comparison after error correction
+SECURITY_MARGIN_BITS = 64      # extra compression in privacy amplification
+
+
+class BB84Batch(NamedTuple):
+    alice_keys: np.ndarray   # (sessions, key_bytes) uint8, packed
+    bob_keys: np.ndarray     # (sessions, key_bytes) uint8, packed
+    qber: np.ndarray         # (sessions,) estimated from the disclosed sample
+    accepted: np.ndarray     # (sessions,) bool: QBER ok, keys reconciled, enough secrecy left
+
+
+def binary_entropy(p):
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+
+
+def _raw_length(key_bits, expected_qber, sample_fraction):
+    """Qubits per session so that the distilled key usually reaches `key_bits`."""
+    # Floor keeps array sizes sane when the channel is bad enough to abort anyway
+    secret_fraction = max(0.15, 1 - (1 + EC_EFFICIENCY) * float(binary_entropy(expected_qber)))
+    fixed_cost = SECURITY_MARGIN_BITS + VERIFY_BITS + 8 * EC_PASSES
+    # Headroom for the spread of the sampled QBER across sessions
+    reconciled = 1.25 * (key_bits + fixed_cost) / secret_fraction
+    sifted = reconciled / (1 - sample_fraction)
+    return int(2 * sifted * 1.1) + 64, int(math.ceil(sifted))
+
+
+def _transmit(rng, sessions, n, noise, eavesdrop):
+    """Alice's bits/bases and Bob's bases/results, with intercept-resend Eve and a noisy channel."""
+    alice_bits = rng.integers(0, 2, (sessions, n), dtype=np.uint8)
+    alice_bases = rng.integers(0, 2, (sessions, n), dtype=np.uint8)
+
+    sent_bits, sent_bases = alice_bits, alice_bases
+    if eavesdrop > 0:
+        intercepted = rng.random((sessions, n)) < eavesdrop
+        eve_bases = rng.integers(0, 2, (sessions, n), dtype=np.uint8)
+        eve_bits = np.where(eve_bases == alice_bases, alice_bits, rng.integers(0, 2, (sessions, n), dtype=np.uint8))
+        sent_bits = np.where(intercepted, eve_bits, alice_bits)
+        sent_bases = np.where(intercepted, eve_bases, alice_bases)
+
+    bob_bases = rng.integers(0, 2, (sessions, n), dtype=np.uint8)
+    bob_bits = np.where(bob_bases == sent_bases, sent_bits, rng.integers(0, 2, (sessions, n), dtype=np.uint8))
+    bob_bits ^= (rng.random((sessions, n)) < noise).astype(np.uint8)
+    return alice_bits, alice_bases, bob_bits, bob_bases
+
+
+def _sift(alice_bits, bob_bits, matching, length):
+    """Keep the first `length` matching-basis positions per session (rectangular result)."""
+    order = np.argsort(~matching, axis=1, kind="stable")[:, :length]
+    enough = matching.sum(axis=1) >= length
+    return np.take_along_axis(alice_bits, order, 1), np.take_along_axis(bob_bits, order, 1), enough
+
+
+def _parity_pass(alice, bob, block):
+    """
+    One Cascade-style pass: compare block parities, then binary-search every
+    mismatched block for one error, all sessions and blocks at once.
+    Returns (corrected bob bits, parity bits disclosed per session).
+    """
+    sessions, n = alice.shape
+    blocks = -(-n // block)
+    pad = ((0, 0), (0, blocks * block - n))
+    a = np.pad(alice, pad).reshape(sessions, blocks, block)
+    b = np.pad(bob, pad).reshape(sessions, blocks, block)
+
+    # Prefix sums turn any sub-range parity into two lookups
+    ca = np.zeros((sessions, blocks, block + 1), dtype=np.int32)
+    cb = np.zeros_like(ca)
+    np.cumsum(a, axis=2, out=ca[..., 1:])
+    np.cumsum(b, axis=2, out=cb[..., 1:])
+    mismatch = ((ca[..., -1] - cb[..., -1]) & 1).astype(bool)
+
+    lo = np.zeros((sessions, blocks), dtype=np.int64)
+    hi = np.full((sessions, blocks), block, dtype=np.int64)
+    rounds = max(1, math.ceil(math.log2(block)))
+    for _ in range(rounds):
+        mid = (lo + hi) // 2
+        parity_a = np.take_along_axis(ca, mid[..., None], 2)[..., 0] - np.take_along_axis(ca, lo[..., None], 2)[..., 0]
+        parity_b = np.take_along_axis(cb, mid[..., None], 2)[..., 0] - np.take_along_axis(cb, lo[..., None], 2)[..., 0]
+        in_left = ((parity_a - parity_b) & 1).astype(bool)
+        active = hi - lo > 1
+        hi = np.where(active & in_left, mid, hi)
+        lo = np.where(active & ~in_left, mid, lo)
 
-    bob_bases = [random.choice(["+", "x"]) for _ in range(key_length)]
-    bob_measurements = [
-        alice_bits[i] if alice_bases[i] == bob_bases[i] else random.randint(0, 1)
-        for i in range(key_length)
-    ]
+    s_idx, blk_idx = np.nonzero(mismatch)
+    b[s_idx, blk_idx, lo[s_idx, blk_idx]] ^= 1
+    leaked = blocks + rounds * mismatch.sum(axis=1)
+    return b.reshape(sessions, -1)[:, :n], leaked
+
+
+def reconcile(alice, bob, qber, rng, passes=EC_PASSES):
+    """
+    Parity-based error correction (Cascade without backtracking, so more passes
+    with slowly growing blocks). The permutation of each later pass is public.
+    """
+    sessions, n = alice.shape
+    q = float(np.mean(qber)) if len(qber) else 0.0
+    block = int(np.clip(0.73 / max(q, 1e-3), 4, n))
+    leaked = np.zeros(sessions, dtype=np.int64)
+    for i in range(passes):
+        if i == 0:
+            bob, disclosed = _parity_pass(alice, bob, block)
+        else:
+            perm = rng.permutation(n)
+            corrected, disclosed = _parity_pass(alice[:, perm], bob[:, perm], block)
+            bob = np.empty_like(bob)
+            bob[:, perm] = corrected
+        leaked += disclosed
+        block = min(int(block * EC_BLOCK_GROWTH), n)
+    return bob, leaked
+
+
+def toeplitz_hash(bits, out_bits, seed):
+    """Privacy amplification: multiply by the binary Toeplitz matrix of a public seed (n + out_bits - 1 bits)."""
+    n = bits.shape[1]
+    matrix = sliding_window_view(seed, n)[:out_bits, ::-1]
+    # float32 matmul is exact here (counts stay far below 2**24) and uses BLAS
+    return (bits.astype(np.float32) @ matrix.T.astype(np.float32)).astype(np.int64) & 1
+
+
+def simulate_bb84(sessions, key_bytes=32, noise=0.01, eavesdrop=0.0, sample_fraction=0.1,
+                  qber_abort=QBER_ABORT_THRESHOLD, rng=None):
+    """
+    Runs `sessions` independent BB84 exchanges at once.
+
+    :param noise: Channel bit-flip probability
+    :param eavesdrop: Fraction of qubits Eve intercepts and resends (adds ~25% errors on those)
+    :param sample_fraction: Share of the sifted key disclosed to estimate QBER
+    :return: BB84Batch with packed keys; use only rows where `accepted`
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    key_bits = key_bytes * 8
+    raw, sifted_length = _raw_length(key_bits, noise + eavesdrop / 4, sample_fraction)
+
+    alice_bits, alice_bases, bob_bits, bob_bases = _transmit(rng, sessions, raw, noise, eavesdrop)
+    alice, bob, enough = _sift(alice_bits, bob_bits, alice_bases == bob_bases, sifted_length)
+
+    # ✅ Parameter estimation on a disclosed random sample, which is then discarded
+    sample = rng.permutation(sifted_length)
+    disclosed, kept = sample[:int(sifted_length * sample_fraction)], sample[int(sifted_length * sample_fraction):]
+    qber = (alice[:, disclosed] != bob[:, disclosed]).mean(axis=1) if len(disclosed) else np.zeros(sessions)
+    alice, bob = alice[:, kept], bob[:, kept]
+
+    bob, leaked = reconcile(alice, bob, qber[qber <= qber_abort], rng)
+    reconciled = (alice == bob).all(axis=1)
+    leaked += VERIFY_BITS
+
+    n = alice.shape[1]
+    secure_bits = n - leaked - np.ceil(n * binary_entropy(qber)) - SECURITY_MARGIN_BITS
+    accepted = enough & (qber <= qber_abort) & reconciled & (secure_bits >= key_bits)
+
+    seed = rng.integers(0, 2, n + key_bits - 1, dtype=np.uint8)
+    alice_keys = np.packbits(toeplitz_hash(alice, key_bits, seed).astype(np.uint8), axis=1)
+    bob_keys = np.packbits(toeplitz_hash(bob, key_bits, seed).astype(np.uint8), axis=1)
+    return BB84Batch(alice_keys, bob_keys, qber, accepted)
+
+
+def generate_qkd_keys(count, key_bytes=32, max_rounds=8, **channel):
+    """
+    `count` distilled keys as bytes, simulating extra sessions for aborted ones.
+    Raises RuntimeError when the channel keeps aborting (e.g. an eavesdropper).
+    """
+    rng = channel.pop("rng", None) or np.random.default_rng()
+    keys = []
+    for _ in range(max_rounds):
+        batch = simulate_bb84(int((count - len(keys)) * 1.1) + 1, key_bytes, rng=rng, **channel)
+        keys.extend(row.tobytes() for row in batch.alice_keys[batch.accepted])
+        if len(keys) >= count:
+            return keys[:count]
+    raise RuntimeError(f"🚨 QKD aborted: only {len(keys)}/{count} keys distilled (mean QBER {float(np.mean(batch.qber)):.3f})")
+
+
+# ✅ Function to Simulate BB84 Quantum Key Distribution
+def bb84_key_exchange(key_bytes=16):
+    """One distilled key as a '0'/'1' string (kept for older callers; prefer generate_qkd_keys)."""
+    key = generate_qkd_keys(1, key_bytes)[0]
+    return "".join(f"{byte:08b}" for byte in key)
 
-    # ✅ Generate Final Secure Key
-    secure_key = [alice_bits[i] for i in range(key_length) if alice_bases[i] == bob_bases[i]]
-    return "".join(map(str, secure_key))
 
 if __name__ == "__main__":
-    print("Simulated Quantum Secure Key:", bb84_key_exchange())
+    print("Simulated Quantum Secure Key:", generate_qkd_keys(1)[0].hex())
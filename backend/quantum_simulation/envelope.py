@@ -0,0 +1,86 @@
+import ast
+import base64
+import struct
+from typing import NamedTuple
+from bson.binary import Binary
+from quantum_simulation.key_management import LEGACY_FORMAT_VERSION, CURRENT_FORMAT_VERSION, HYBRID_KEM_FORMAT_VERSION
+
+# ✅ Binary ciphertext envelope, stored as one BSON Binary (user-defined subtype)
+#
+#   version (u8) | len(key_ref) (u8) | key_ref | len(iv) (u8) | iv | ciphertext + tag
+#
+# key_ref is whatever locates the key for that version: the PBKDF2 salt (v1),
+# the HKDF nonce (v2) or the session key id as raw bytes (v3).
+ENVELOPE_SUBTYPE = 0x80
+TAG_SIZE = 16
+
+
+class Envelope(NamedTuple):
+    version: int
+    key_ref: bytes
+    iv: bytes
+    sealed: bytes  # ciphertext + tag, as AESGCM returns it
+
+    @property
+    def key_id(self):
+        """Session key id (hex) of a v3 envelope."""
+        return self.key_ref.hex()
+
+    @property
+    def ciphertext(self):
+        return self.sealed[:-TAG_SIZE]
+
+    @property
+    def tag(self):
+        return self.sealed[-TAG_SIZE:]
+
+
+def encode_envelope(version, key_ref, iv, sealed) -> Binary:
+    if len(key_ref) > 255 or len(iv) > 255:
+        raise ValueError("key_ref and iv must be shorter than 256 bytes")
+    return Binary(struct.pack("BB", version, len(key_ref)) + key_ref + bytes([len(iv)]) + iv + sealed, ENVELOPE_SUBTYPE)
+
+
+def decode_envelope(blob) -> Envelope:
+    view = memoryview(blob)
+    if len(view) < 3:
+        raise ValueError("Envelope too short")
+    version, ref_length = view[0], view[1]
+    iv_at = 2 + ref_length
+    iv_end = iv_at + 1 + view[iv_at]
+    if iv_end + TAG_SIZE > len(view):
+        raise ValueError("Envelope truncated")
+    return Envelope(version, bytes(view[2:iv_at]), bytes(view[iv_at + 1:iv_end]), bytes(view[iv_end:]))
+
+
+def is_envelope(value):
+    return isinstance(value, Binary) and value.subtype == ENVELOPE_SUBTYPE
+
+
+def to_text(blob) -> str:
+    """Base64 of an envelope, for JSON responses."""
+    return base64.b64encode(blob).decode()
+
+
+# ✅ Conversion from the base64 dict formats (read path and migration)
+
+def from_legacy(value) -> Binary:
+    """Envelope for a v1/v2/v3 base64 dict (or its str() form, as older bank transfers stored it)."""
+    if isinstance(value, str):
+        value = ast.literal_eval(value)
+    version = value.get("version", LEGACY_FORMAT_VERSION)
+    sealed = base64.b64decode(value["ciphertext"]) + base64.b64decode(value["tag"])
+    if version == LEGACY_FORMAT_VERSION:
+        key_ref = base64.b64decode(value["salt"])
+    elif version == CURRENT_FORMAT_VERSION:
+        key_ref = base64.b64decode(value["nonce"])
+    elif version == HYBRID_KEM_FORMAT_VERSION:
+        key_ref = bytes.fromhex(value["key_id"])
+    else:
+        raise ValueError(f"Unsupported ciphertext version: {version}")
+    return encode_envelope(version, key_ref, base64.b64decode(value["iv"]), sealed)
+
+
+def as_envelope(value) -> Envelope:
+    """Decoded envelope from either storage format."""
+    return decode_envelope(value if isinstance(value, (bytes, bytearray, memoryview)) else from_legacy(value))
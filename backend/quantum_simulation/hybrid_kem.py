@@ -0,0 +1,76 @@
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey, X25519PublicKey
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.backends import default_backend
+from config.settings import KEM_ALGORITHM
+
+try:
+    import oqs
+except ImportError:  # liboqs not installed: X25519 only
+    oqs = None
+
+COMBINER_INFO = b"hybrid-kem/v1"
+KEY_LENGTH = 32
+
+
+def _raw_private(key):
+    return key.private_bytes(serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption())
+
+
+def _raw_public(key):
+    return key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+
+def kem_name(public: dict) -> str:
+    return f"X25519+{public['algorithm']}" if public.get("pq") else "X25519"
+
+
+def generate_keypair(algorithm=KEM_ALGORITHM):
+    """
+    Recipient keypair as (public, secret) dicts of raw bytes.
+    The PQ half is present only when liboqs is installed.
+    """
+    x25519 = X25519PrivateKey.generate()
+    public = {"x25519": _raw_public(x25519.public_key())}
+    secret = {"x25519": _raw_private(x25519)}
+    if oqs is not None:
+        with oqs.KeyEncapsulation(algorithm) as kem:
+            public.update(algorithm=algorithm, pq=kem.generate_keypair())
+            secret.update(algorithm=algorithm, pq=kem.export_secret_key())
+    return public, secret
+
+
+def _combine(x25519_secret, pq_secret, encapsulation):
+    """Both shared secrets and both ciphertexts go into one HKDF, so the key holds if either KEM does."""
+    info = COMBINER_INFO + encapsulation["x25519"] + encapsulation.get("pq", b"")
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=KEY_LENGTH, salt=None, info=info, backend=default_backend())
+    return hkdf.derive(pq_secret + x25519_secret)
+
+
+def encapsulate(public: dict):
+    """(shared key, encapsulation) for a recipient's public key."""
+    ephemeral = X25519PrivateKey.generate()
+    encapsulation = {"x25519": _raw_public(ephemeral.public_key())}
+    x25519_secret = ephemeral.exchange(X25519PublicKey.from_public_bytes(public["x25519"]))
+
+    pq_secret = b""
+    if public.get("pq"):
+        if oqs is None:
+            raise RuntimeError(f"Recipient requires {public['algorithm']} but liboqs is not installed")
+        with oqs.KeyEncapsulation(public["algorithm"]) as kem:
+            encapsulation["pq"], pq_secret = kem.encap_secret(public["pq"])
+    return _combine(x25519_secret, pq_secret, encapsulation), encapsulation
+
+
+def decapsulate(secret: dict, encapsulation: dict) -> bytes:
+    """Recovers the shared key from an encapsulation with the recipient's secret key."""
+    private = X25519PrivateKey.from_private_bytes(secret["x25519"])
+    x25519_secret = private.exchange(X25519PublicKey.from_public_bytes(encapsulation["x25519"]))
+
+    pq_secret = b""
+    if encapsulation.get("pq"):
+        if oqs is None or not secret.get("pq"):
+            raise RuntimeError("PQ encapsulation needs liboqs and the recipient's PQ secret key")
+        with oqs.KeyEncapsulation(secret["algorithm"], secret["pq"]) as kem:
+            pq_secret = kem.decap_secret(encapsulation["pq"])
+    return _combine(x25519_secret, pq_secret, encapsulation)
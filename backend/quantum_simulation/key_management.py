@@ -0,0 +1,59 @@
+from functools import lru_cache
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.backends import default_backend
+from config.settings import QUANTUM_MASTER_SALT, DERIVED_KEY_CACHE_SIZE
+
+PBKDF2_ITERATIONS = 100000
+KEY_LENGTH = 32
+
+# ✅ Ciphertext format versions
+LEGACY_FORMAT_VERSION = 1  # PBKDF2(password, per-message salt)
+CURRENT_FORMAT_VERSION = 2  # HKDF(master key, per-message nonce)
+HYBRID_KEM_FORMAT_VERSION = 3  # per-party session key from the hybrid KEM, referenced by key_id
+HKDF_INFO = b"quantum-encrypt/v2"
+WRAP_INFO = b"qkd-key-wrap/v1"
+
+
+def _pbkdf2(password: str, salt: bytes) -> bytes:
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=KEY_LENGTH, salt=salt, iterations=PBKDF2_ITERATIONS, backend=default_backend())
+    return kdf.derive(password.encode())
+
+
+@lru_cache(maxsize=16)
+def get_master_key(password: str) -> bytes:
+    """Stretch the password once per process; every message key hangs off this."""
+    return _pbkdf2(password, QUANTUM_MASTER_SALT)
+
+
+def derive_message_key(password: str, nonce: bytes) -> bytes:
+    """Cheap per-message key: HKDF-SHA256 over the master key with the message nonce as salt."""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=KEY_LENGTH, salt=nonce, info=HKDF_INFO, backend=default_backend())
+    return hkdf.derive(get_master_key(password))
+
+
+@lru_cache(maxsize=16)
+def get_wrap_key(password: str, info: bytes = WRAP_INFO) -> bytes:
+    """Key-encryption key for stored secrets (QKD keys, KEM secrets), derived from the master key."""
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=KEY_LENGTH, salt=None, info=info, backend=default_backend())
+    return hkdf.derive(get_master_key(password))
+
+
+@lru_cache(maxsize=DERIVED_KEY_CACHE_SIZE)
+def get_message_key(password: str, nonce: bytes) -> bytes:
+    """Bounded LRU of v2 message keys used when decrypting stored records."""
+    return derive_message_key(password, nonce)
+
+
+@lru_cache(maxsize=DERIVED_KEY_CACHE_SIZE)
+def get_legacy_key(password: str, salt: bytes) -> bytes:
+    """Bounded LRU of v1 (salt-based PBKDF2) keys so old records stay readable."""
+    return _pbkdf2(password, salt)
+
+
+def clear_key_caches():
+    get_master_key.cache_clear()
+    get_wrap_key.cache_clear()
+    get_message_key.cache_clear()
+    get_legacy_key.cache_clear()
@@ -1,23 +1,25 @@
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
-import base64
+from quantum_simulation.key_management import get_message_key, get_legacy_key, LEGACY_FORMAT_VERSION, CURRENT_FORMAT_VERSION
+from quantum_simulation.envelope import as_envelope
 
 # Quantum-inspired AES-GCM Decryption
-def decrypt_message(encrypted_data: dict, password: str) -> str:
-    salt = base64.b64decode(encrypted_data["salt"])
-    iv = base64.b64decode(encrypted_data["iv"])
-    tag = base64.b64decode(encrypted_data["tag"])
-    ciphertext = base64.b64decode(encrypted_data["ciphertext"])
+def decrypt_message(encrypted_data, password: str) -> bytes:
+    """Accepts a binary envelope or the base64 dict formats (v1/v2)."""
+    envelope = as_envelope(encrypted_data)
 
-    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000, backend=default_backend())
-    key = kdf.derive(password.encode())
+    # ✅ Old records carry a PBKDF2 salt, new ones an HKDF nonce
+    if envelope.version == LEGACY_FORMAT_VERSION:
+        key = get_legacy_key(password, envelope.key_ref)
+    elif envelope.version == CURRENT_FORMAT_VERSION:
+        key = get_message_key(password, envelope.key_ref)
+    else:
+        raise ValueError(f"Unsupported ciphertext version: {envelope.version}")
 
-    cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=default_backend())
+    cipher = Cipher(algorithms.AES(key), modes.GCM(envelope.iv, envelope.tag), backend=default_backend())
     decryptor = cipher.decryptor()
     
-    return decryptor.update(ciphertext) + decryptor.finalize()
+    return decryptor.update(envelope.ciphertext) + decryptor.finalize()
 
 if __name__ == "__main__":
     encrypted_data = {
@@ -1,15 +1,13 @@
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
+from quantum_simulation.key_management import derive_message_key, CURRENT_FORMAT_VERSION
 import os
 import base64
 
 # Quantum-inspired AES-GCM Encryption
 def encrypt_message(message: str, password: str) -> dict:
-    salt = os.urandom(16)
-    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000, backend=default_backend())
-    key = kdf.derive(password.encode())
+    nonce = os.urandom(16)
+    key = derive_message_key(password, nonce)
 
     iv = os.urandom(12)
     cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend())
@@ -17,9 +15,10 @@ def encrypt_message(message: str, password: str) -> dict:
     
     ciphertext = encryptor.update(message.encode()) + encryptor.finalize()
     return {
+        "version": CURRENT_FORMAT_VERSION,
         "ciphertext": base64.b64encode(ciphertext).decode(),
         "iv": base64.b64encode(iv).decode(),
-        "salt": base64.b64encode(salt).decode(),
+        "nonce": base64.b64encode(nonce).decode(),
         "tag": base64.b64encode(encryptor.tag).decode()
     }
 
@@ -1,9 +1,4 @@
-from pymongo import MongoClient
-
-# ✅ Connect to MongoDB
-client = MongoClient("mongodb://localhost:27017/")
-db = client["secure_payment_db"]
-cardholders_collection = db["cardholders"]
+from models.cardholder import cardholders_repository
 
 # ✅ Sample Card Data (Card Number, Cardholder Name, Expiry Date, Registered Mobile Number, User Email)
 sample_cards = [
@@ -14,8 +9,8 @@ sample_cards = [
 
 # ✅ Insert Data
 for card in sample_cards:
-    if not cardholders_collection.find_one({"card_number": card["card_number"]}):
-        cardholders_collection.insert_one(card)
+    if not cardholders_repository.find_by_card_number(card["card_number"]):
+        cardholders_repository.insert_one(card)
         print(f"✅ Inserted card: {card['card_number']}")
 
 print("✅ Sample Cards Added Successfully!")
@@ -0,0 +1,50 @@
+"""
+Benchmark: anchored payments per second against batch size.
+
+A simulated chain takes `--block-time` seconds per transaction receipt, like
+Hardhat with interval mining. Batch size 1 with a zero flush interval is the old
+one-storeTransaction-per-payment behaviour.
+
+Run from the backend directory:
+    python -m scripts.bench_anchoring --payments 2000 --block-time 0.2
+"""
+import argparse
+import asyncio
+import time
+from services.blockchain_anchor import AnchorService
+
+
+def make_commit(block_time):
+    def commit(batch_id, merkle_root, size):
+        time.sleep(block_time)
+        return f"0x{batch_id:064x}"
+    return commit
+
+
+async def run_case(payments, batch_size, block_time, flush_interval_ms):
+    service = AnchorService(make_commit(block_time), batch_size=batch_size, flush_interval_ms=flush_interval_ms)
+    start = time.perf_counter()
+    await asyncio.gather(*[service.anchor({"id": i, "amount": 100}) for i in range(payments)])
+    acknowledged = time.perf_counter() - start
+    await service.flush()
+    anchored = time.perf_counter() - start
+    return payments / acknowledged, payments / anchored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--block-time", type=float, default=0.2, help="seconds per transaction receipt")
+    parser.add_argument("--flush-ms", type=int, default=250)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 64, 256, 1024])
+    args = parser.parse_args()
+
+    print(f"{'batch size':>10}{'acked pay/s':>16}{'anchored pay/s':>18}")
+    for batch_size in args.batch_sizes:
+        payments = args.payments if batch_size > 1 else min(args.payments, 20)
+        acked, anchored = asyncio.run(run_case(payments, batch_size, args.block_time, args.flush_ms))
+        print(f"{batch_size:>10}{acked:>16,.0f}{anchored:>18,.1f}")
+
+
+if __name__ == "__main__":
+    main()
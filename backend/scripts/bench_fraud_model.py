@@ -0,0 +1,44 @@
+"""
+Latency comparison: sklearn RandomForestClassifier.predict_proba versus the
+compiled numpy evaluator, at several batch sizes.
+
+Run from the backend directory:
+    python -m scripts.bench_fraud_model
+"""
+import argparse
+import time
+import numpy as np
+from services.forest_evaluator import CompiledForest
+from services.ml_fraud_detection import load_fraud_detection_model
+
+
+def per_call_us(func, X, repeat):
+    func(X)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(X)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 16, 256, 4096])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    model = load_fraud_detection_model()
+    compiled = CompiledForest.from_model(model)
+    rng = np.random.default_rng(0)
+
+    print(f"{'batch':>6}{'sklearn us':>14}{'compiled us':>14}{'speedup':>10}{'max |diff|':>12}")
+    for size in args.batch_sizes:
+        X = np.column_stack([rng.uniform(0, 50000, size), rng.integers(0, 3, size)])
+        repeat = max(5, args.repeat // max(1, size // 256))
+        sk = per_call_us(model.predict_proba, X, repeat)
+        np_us = per_call_us(compiled.predict_proba, X, repeat)
+        diff = np.abs(model.predict_proba(X)[:, 1] - compiled.predict_fraud_proba(X)).max()
+        print(f"{size:>6}{sk:>14,.0f}{np_us:>14,.0f}{sk / np_us:>9.1f}x{diff:>12.2g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark: fraud model training time and peak RSS against dataset size.
+
+Synthetic documents are generated lazily and fed through the same chunked
+pipeline as scripts/train_fraud_model.py, so peak memory should stay flat as
+the row count grows. Each size runs in a fresh process so ru_maxrss is per run.
+
+Run from the backend directory:
+    python -m scripts.bench_fraud_training --rows 100000 1000000 5000000 --chunk-size 50000
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+import numpy as np
+from services.fraud_training import train_incremental
+
+METHODS = ["card", "upi", "netbanking"]
+
+
+def synthetic_chunks(rows, chunk_size, fraud, seed):
+    """Chunks of projected documents, like iter_collection would yield."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_size):
+        size = min(chunk_size, rows - start)
+        amounts = rng.lognormal(9.5 if fraud else 6.5, 1.0, size)
+        methods = rng.integers(0, 3, size)
+        yield [{"_id": start + i, "amount": float(a), "payment_method": METHODS[m]} for i, (a, m) in enumerate(zip(amounts, methods))]
+
+
+def run(rows, chunk_size, fraud_ratio, queue):
+    start = time.perf_counter()
+    fraud_rows = max(1, int(rows * fraud_ratio))
+    model, state = train_incremental(
+        synthetic_chunks(rows, chunk_size, False, 1),
+        synthetic_chunks(fraud_rows, max(1, int(chunk_size * fraud_ratio)), True, 2),
+    )
+    seconds = time.perf_counter() - start
+    queue.put((seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, len(model.estimators_)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000, 3000000])
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--fraud-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak RSS MB':>14}{'trees':>8}")
+    for rows in args.rows:
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=run, args=(rows, args.chunk_size, args.fraud_ratio, queue))
+        process.start()
+        seconds, peak_mb, trees = queue.get()
+        process.join()
+        print(f"{rows:>10,}{seconds:>10.1f}{rows / seconds:>12,.0f}{peak_mb:>14.0f}{trees:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark: /health through the old BaseHTTPMiddleware stack versus the pure
+ASGI stack (rate limiting + Prometheus metrics + CORS in both).
+
+Run from the backend directory:
+    python -m scripts.bench_middleware --requests 5000 --concurrency 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+import httpx
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from monitoring.prometheus_metrics import setup_metrics
+from security.firewalls.ddos_protection import RateLimitMiddleware
+from security.firewalls.rate_limiter import RateLimiter, InMemoryBackend
+
+HUGE_LIMIT = 10 ** 9
+
+# ✅ The previous implementation, reproduced here for comparison
+LEGACY_REGISTRY = CollectorRegistry()
+LEGACY_COUNT = Counter("http_requests_total", "Total HTTP Requests", ["method", "endpoint", "http_status"], registry=LEGACY_REGISTRY)
+LEGACY_LATENCY = Histogram("http_request_latency_seconds", "HTTP Request Latency", ["method", "endpoint"], registry=LEGACY_REGISTRY)
+LEGACY_REQUEST_LOGS = {}
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, limit_per_minute=20):
+        super().__init__(app)
+        self.limit_per_minute = limit_per_minute
+
+    async def dispatch(self, request: Request, call_next):
+        client_ip = request.client.host
+        current_time = time.time()
+        if client_ip not in LEGACY_REQUEST_LOGS:
+            LEGACY_REQUEST_LOGS[client_ip] = []
+        LEGACY_REQUEST_LOGS[client_ip] = [t for t in LEGACY_REQUEST_LOGS[client_ip] if current_time - t < 60]
+        if len(LEGACY_REQUEST_LOGS[client_ip]) >= self.limit_per_minute:
+            raise HTTPException(status_code=429, detail="Too many requests. Slow down!")
+        LEGACY_REQUEST_LOGS[client_ip].append(current_time)
+        return await call_next(request)
+
+
+def base_app():
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "running", "timestamp": datetime.utcnow()}
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:5173"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    return app
+
+
+def legacy_app(rate_limit):
+    app = base_app()
+    app.add_middleware(LegacyRateLimitMiddleware, limit_per_minute=rate_limit)
+
+    @app.middleware("http")
+    async def prometheus_middleware(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        LEGACY_COUNT.labels(request.method, request.url.path, response.status_code).inc()
+        LEGACY_LATENCY.labels(request.method, request.url.path).observe(time.time() - start_time)
+        return response
+
+    return app
+
+
+def asgi_app(rate_limit):
+    app = base_app()
+    limiter = RateLimiter(InMemoryBackend())
+    app.add_middleware(RateLimitMiddleware, limit_per_minute=rate_limit, limiter=limiter, user_limit=HUGE_LIMIT)
+    setup_metrics(app)
+    return app
+
+
+async def run_load(app, total, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/health")
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one() for _ in range(total)])
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rate-limit", type=int, default=HUGE_LIMIT, help="per-IP limit (high = measure overhead only)")
+    args = parser.parse_args()
+
+    print(f"{'stack':<22}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for label, factory in [("BaseHTTPMiddleware", legacy_app), ("pure ASGI", asgi_app)]:
+        app = factory(args.rate_limit)
+        asyncio.run(run_load(app, min(500, args.requests), args.concurrency))  # ✅ Warm-up
+        result = asyncio.run(run_load(app, args.requests, args.concurrency))
+        print(f"{label:<22}{result['rps']:>10,.0f}{result['p50']:>10.2f}{result['p99']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
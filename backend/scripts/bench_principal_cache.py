@@ -0,0 +1,77 @@
+"""
+Benchmark: authenticated requests per second with and without the principal cache.
+
+Users live in mongomock with an artificial round-trip delay standing in for a
+real mongod (`--db-latency-ms`).
+
+Run from the backend directory:
+    python -m scripts.bench_principal_cache --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+import httpx
+import mongomock
+from fastapi import FastAPI, Depends
+from models import database
+from models.user import users_repository
+from api.auth import get_current_user, create_access_token
+from services.principal_cache import principal_cache
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(current_user: dict = Depends(get_current_user)):
+        return current_user
+
+    return app
+
+
+def slow_lookup(delay, original):
+    def lookup(identifier):
+        time.sleep(delay)
+        return original(identifier)
+    return lookup
+
+
+async def run_load(app, tokens, total, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            async with semaphore:
+                response = await client.get("/me", headers={"Authorization": f"Bearer {tokens[i % len(tokens)]}"})
+                assert response.status_code == 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(total)])
+        return total / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    database.set_client(mongomock.MongoClient())
+    for i in range(args.users):
+        users_repository.create({"name": f"user{i}", "email": f"user{i}@bench.io", "mobile_number": f"9{i:09d}"})
+    users_repository.find_by_identifier = slow_lookup(args.db_latency_ms / 1000, users_repository.find_by_identifier)
+    tokens = [create_access_token(f"user{i}@bench.io") for i in range(args.users)]
+    app = build_app()
+
+    for label, maxsize in [("without cache", 0), ("with cache", 10000)]:
+        principal_cache.maxsize = maxsize
+        principal_cache.clear()
+        principal_cache.hits = principal_cache.misses = 0
+        rps = asyncio.run(run_load(app, tokens, args.requests, args.concurrency))
+        print(f"{label:<16}{rps:>10,.0f} req/s   (cache hits={principal_cache.hits}, misses={principal_cache.misses})")
+
+
+if __name__ == "__main__":
+    main()
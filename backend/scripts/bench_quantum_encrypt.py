@@ -0,0 +1,76 @@
+"""
+Microbenchmark: encryptions per second on a single core, before and after the
+derived-key cache.
+
+Run from the backend directory:
+    python -m scripts.bench_quantum_encrypt --seconds 3
+"""
+import argparse
+import base64
+import os
+import time
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.backends import default_backend
+from quantum_simulation.quantum_encrypt import encrypt_message
+from quantum_simulation.quantum_decrypt import decrypt_message
+
+PASSWORD = "quantumSecureKey"
+MESSAGE = "2499.0 INR via card"
+
+
+def legacy_encrypt_message(message: str, password: str) -> dict:
+    """The pre-cache implementation: PBKDF2 (100k iterations) on every call."""
+    salt = os.urandom(16)
+    kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000, backend=default_backend())
+    key = kdf.derive(password.encode())
+
+    iv = os.urandom(12)
+    encryptor = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend()).encryptor()
+    ciphertext = encryptor.update(message.encode()) + encryptor.finalize()
+    return {
+        "ciphertext": base64.b64encode(ciphertext).decode(),
+        "iv": base64.b64encode(iv).decode(),
+        "salt": base64.b64encode(salt).decode(),
+        "tag": base64.b64encode(encryptor.tag).decode()
+    }
+
+
+def measure(func, seconds):
+    count = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        func()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0, help="time budget per case")
+    args = parser.parse_args()
+
+    encrypt_message(MESSAGE, PASSWORD)  # ✅ Derive the master key outside the timed loop
+    stored = [encrypt_message(MESSAGE, PASSWORD) for _ in range(100)]
+    legacy = legacy_encrypt_message(MESSAGE, PASSWORD)
+
+    cases = [
+        ("encrypt v1 (PBKDF2 per message)", lambda: legacy_encrypt_message(MESSAGE, PASSWORD)),
+        ("encrypt v2 (master key + HKDF)", lambda: encrypt_message(MESSAGE, PASSWORD)),
+        ("decrypt v1 (LRU hit)", lambda: decrypt_message(legacy, PASSWORD)),
+        ("decrypt v2 (LRU hit)", lambda: decrypt_message(stored[0], PASSWORD)),
+    ]
+    print(f"{'case':<36}{'ops/sec/core':>14}")
+    results = {}
+    for name, func in cases:
+        results[name] = measure(func, args.seconds)
+        print(f"{name:<36}{results[name]:>14,.0f}")
+
+    speedup = results[cases[1][0]] / results[cases[0][0]]
+    print(f"\nencrypt speedup: {speedup:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: streaming (chunked AES-GCM) encryption/decryption throughput and
+peak memory on a large input, against one-shot AES-GCM on the whole buffer.
+
+The input is synthesized on the fly and the output is discarded, so peak RSS
+reflects the cipher path only. Each mode runs in its own subprocess.
+
+Run from the backend directory:
+    python -m scripts.bench_stream_encryption --size-mb 1024
+    python -m scripts.bench_stream_encryption --size-mb 1024 --oneshot-mb 256
+"""
+import argparse
+import io
+import os
+import resource
+import subprocess
+import sys
+import time
+
+KEY = bytes(range(32))
+
+
+class SyntheticReader(io.RawIOBase):
+    """`size` bytes of a repeated random block, without holding them in memory."""
+
+    def __init__(self, size, block=os.urandom(1 << 20)):
+        self.remaining = size
+        self.block = memoryview(block)
+        self.offset = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = min(len(buffer), self.remaining, len(self.block) - self.offset)
+        buffer[:n] = self.block[self.offset:self.offset + n]
+        self.offset = (self.offset + n) % len(self.block)
+        self.remaining -= n
+        return n
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_mode(mode, size, chunk_size):
+    from services.stream_encryption import encrypt_stream, decrypt_stream
+    from services.transaction_export import IterReader
+    baseline = peak_rss_mb()
+    data = SyntheticReader(size).read() if mode == "oneshot-encrypt" else None
+    start = time.perf_counter()
+    if mode == "stream-encrypt":
+        for _ in encrypt_stream(KEY, SyntheticReader(size), chunk_size=chunk_size):
+            pass
+    elif mode == "stream-roundtrip":
+        frames = encrypt_stream(KEY, SyntheticReader(size), chunk_size=chunk_size)
+        for _ in decrypt_stream(KEY, IterReader(frames)):
+            pass
+    else:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        AESGCM(KEY).encrypt(os.urandom(12), data, None)
+    elapsed = time.perf_counter() - start
+    print(f"{mode:>17} {size / 2**20:8.0f} MB  {size / 2**20 / elapsed:8.1f} MB/s  "
+          f"peak RSS {peak_rss_mb():7.1f} MB (+{peak_rss_mb() - baseline:.1f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--chunk-kb", type=int, default=64)
+    parser.add_argument("--oneshot-mb", type=int, default=256, help="one-shot comparison size (0 to skip)")
+    parser.add_argument("--mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.size_mb * 2**20, args.chunk_kb * 1024)
+        return
+
+    runs = [("stream-encrypt", args.size_mb), ("stream-roundtrip", args.size_mb)]
+    if args.oneshot_mb:
+        runs.append(("oneshot-encrypt", args.oneshot_mb))
+    for mode, size_mb in runs:
+        subprocess.run([sys.executable, "-m", "scripts.bench_stream_encryption", "--mode", mode,
+                        "--size-mb", str(size_mb), "--chunk-kb", str(args.chunk_kb)], check=True)
+
+
+if __name__ == "__main__":
+    main()
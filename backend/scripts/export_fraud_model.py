@@ -0,0 +1,31 @@
+"""
+Offline step: compile the sklearn fraud model into the array-backed format
+served by services/forest_evaluator.CompiledForest.
+
+Run from the backend directory:
+    python -m scripts.export_fraud_model [--model services/fraud_detection_model.pkl] [--out services/fraud_model_compiled]
+"""
+import argparse
+import os
+import joblib
+import sklearn
+from services.forest_evaluator import compile_forest, save_compiled_forest
+from services.ml_fraud_detection import MODEL_PATH, COMPILED_MODEL_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--out", default=COMPILED_MODEL_DIR)
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    meta = save_compiled_forest(compile_forest(model), args.out, {
+        "source": os.path.basename(args.model),
+        "sklearn_version": sklearn.__version__,
+    })
+    print(f"✅ Compiled {meta['n_trees']} trees / {meta['n_nodes']} nodes (max depth {meta['max_depth']}) into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
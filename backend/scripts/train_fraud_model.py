@@ -0,0 +1,54 @@
+"""
+Offline step: train the fraud model on stored history and publish a new version.
+
+Transactions are streamed as legitimate examples and fraud_logs as fraudulent
+ones, in chunks through server-side cursors. By default the run continues from
+the live version: only documents newer than its watermarks are read and new
+trees are added to the existing forest. `--full` retrains from scratch.
+
+Serving processes swap to the new version on their next reload check
+(FRAUD_MODEL_RELOAD_SECONDS).
+
+Run from the backend directory:
+    python -m scripts.train_fraud_model [--full] [--chunk-size 50000] [--registry services/fraud_models]
+"""
+import argparse
+import time
+from models.transaction import transactions_repository
+from models.fraud_logs import fraud_logs_repository
+from services.fraud_training import iter_collection, train_incremental, publish_model, load_training_checkpoint
+from services.ml_fraud_detection import MODEL_REGISTRY_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registry", default=MODEL_REGISTRY_DIR)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--trees-per-chunk", type=int, default=10)
+    parser.add_argument("--max-trees", type=int, default=200)
+    parser.add_argument("--full", action="store_true", help="ignore the live version and retrain from scratch")
+    args = parser.parse_args()
+
+    model, state = (None, None) if args.full else load_training_checkpoint(args.registry)
+    state = state or {}
+    start = time.perf_counter()
+    model, state = train_incremental(
+        iter_collection(transactions_repository, state.get("transactions_watermark"), args.chunk_size),
+        iter_collection(fraud_logs_repository, state.get("fraud_logs_watermark"), args.chunk_size),
+        model=model, state=state, trees_per_chunk=args.trees_per_chunk, max_trees=args.max_trees,
+    )
+    rows = state["rows"]
+    if not hasattr(model, "estimators_"):
+        print(f"🚨 Nothing to train on ({rows['transactions']} transactions, {rows['fraud_logs']} fraud logs)")
+        return
+    if not rows["transactions"] and not rows["fraud_logs"]:
+        print("✅ No new data since the live version")
+        return
+
+    directory = publish_model(model, state, args.registry, {"mode": "full" if args.full else "incremental"})
+    print(f"✅ Trained on {rows['transactions']} transactions / {rows['fraud_logs']} fraud logs "
+          f"in {time.perf_counter() - start:.1f}s, {len(model.estimators_)} trees -> {directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,124 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-import time
+from jose import JWTError, jwt
+from config.settings import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_SQLITE_PATH,
+    RATE_LIMIT_WINDOW_SECONDS,
+    RATE_LIMIT_MAX_KEYS,
+    USER_RATE_LIMIT_PER_MINUTE,
+    ROUTE_RATE_LIMITS,
+)
+from security.firewalls.rate_limiter import RateLimiter, InMemoryBackend, SQLiteBackend, MongoBackend
+from services.workers import run_io
 
-# ✅ Dictionary to track request timestamps per IP
-REQUEST_LOGS = {}
+TOO_MANY_REQUESTS_BODY = b'{"detail":"Too many requests. Slow down!"}'
 
-# ✅ Rate Limiting Middleware
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, limit_per_minute=20):
-        super().__init__(app)
-        self.limit_per_minute = limit_per_minute
+# ✅ Shared limiter engine (middleware and check_ddos use the same state)
+_limiter = None
 
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        current_time = time.time()
 
-        # ✅ If IP is not in logs, initialize it
-        if client_ip not in REQUEST_LOGS:
-            REQUEST_LOGS[client_ip] = []
+def create_backend(name=RATE_LIMIT_BACKEND):
+    if name == "memory":
+        return InMemoryBackend(max_keys=RATE_LIMIT_MAX_KEYS)
+    if name == "sqlite":
+        return SQLiteBackend(RATE_LIMIT_SQLITE_PATH)
+    if name == "mongo":
+        from models.rate_limit import rate_limit_repository
+        return MongoBackend(rate_limit_repository)
+    raise ValueError(f"Unknown rate limit backend: {name}")
 
-        # ✅ Remove old requests older than 1 min
-        REQUEST_LOGS[client_ip] = [t for t in REQUEST_LOGS[client_ip] if current_time - t < 60]
 
-        # ✅ If limit exceeded, raise error
-        if len(REQUEST_LOGS[client_ip]) >= self.limit_per_minute:
-            raise HTTPException(status_code=429, detail="Too many requests. Slow down!")
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(create_backend(), window_seconds=RATE_LIMIT_WINDOW_SECONDS)
+    return _limiter
 
-        # ✅ Log the request timestamp
-        REQUEST_LOGS[client_ip].append(current_time)
-        
-        return await call_next(request)
 
-# ✅ Function to Check DDoS (For Manual Calls)
-def check_ddos(client_ip: str, limit_per_minute=20):
-    current_time = time.time()
+def set_rate_limiter(limiter):
+    global _limiter
+    _limiter = limiter
+
+
+def route_limit(path, route_limits):
+    """Longest configured prefix wins, e.g. /auth/login before /auth."""
+    best = None
+    for prefix, limit in route_limits.items():
+        if path.startswith(prefix) and (best is None or len(prefix) > len(best[0])):
+            best = (prefix, limit)
+    return best
+
+
+def user_from_authorization(authorization):
+    """Verified `sub` of a bearer token, or None for anonymous requests."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    from api.auth import SECRET_KEY, ALGORITHM
+    try:
+        return jwt.decode(authorization[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+def rate_limit_keys(client_ip, path, authorization, limit_per_minute, route_limits, user_limit):
+    """(key, limit) pairs a request must pass: per IP, per route, per authenticated user."""
+    keys = [(f"ip:{client_ip}", limit_per_minute)]
+    matched = route_limit(path, route_limits)
+    if matched:
+        keys.append((f"route:{matched[0]}:{client_ip}", matched[1]))
+    user = user_from_authorization(authorization)
+    if user:
+        keys.append((f"user:{user}", user_limit))
+    return keys
 
-    if client_ip not in REQUEST_LOGS:
-        REQUEST_LOGS[client_ip] = []
 
-    REQUEST_LOGS[client_ip] = [t for t in REQUEST_LOGS[client_ip] if current_time - t < 60]
+def authorization_header(scope):
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value.decode("latin-1")
+    return None
 
-    if len(REQUEST_LOGS[client_ip]) >= limit_per_minute:
-        return True  # DDoS detected
-    return False
+
+# ✅ Rate Limiting Middleware (pure ASGI: no request/response wrappers, streaming-safe)
+class RateLimitMiddleware:
+    def __init__(self, app, limit_per_minute=20, limiter=None, route_limits=None, user_limit=USER_RATE_LIMIT_PER_MINUTE):
+        self.app = app
+        self.limit_per_minute = limit_per_minute
+        self.limiter = limiter
+        self.route_limits = ROUTE_RATE_LIMITS if route_limits is None else route_limits
+        self.user_limit = user_limit
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        limiter = self.limiter or get_rate_limiter()
+        client = scope.get("client")
+        keys = rate_limit_keys(
+            client[0] if client else "unknown", scope["path"], authorization_header(scope),
+            self.limit_per_minute, self.route_limits, self.user_limit
+        )
+        blocking = getattr(limiter.backend, "blocking", False)
+        for key, limit in keys:
+            decision = await run_io(limiter.check, key, limit) if blocking else limiter.check(key, limit)
+            if not decision.allowed:
+                return await self.reject(send, decision.retry_after)
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def reject(send, retry_after):
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(TOO_MANY_REQUESTS_BODY)).encode()),
+                (b"retry-after", str(int(retry_after) + 1).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": TOO_MANY_REQUESTS_BODY})
+
+# ✅ Function to Check DDoS (For Manual Calls)
+def check_ddos(client_ip: str, limit_per_minute=20):
+    decision = get_rate_limiter().check(f"ip:{client_ip}", limit_per_minute, consume=False)
+    return not decision.allowed  # True = DDoS detected
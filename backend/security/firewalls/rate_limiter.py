@@ -0,0 +1,184 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+from pymongo import ReturnDocument
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    retry_after: float
+
+
+def sliding_window_estimate(previous, current, now, window_seconds):
+    """
+    Sliding-window counter: weight the previous fixed window by how much of it
+    still overlaps the sliding window ending at `now`.
+    """
+    elapsed = (now % window_seconds) / window_seconds
+    return previous * (1 - elapsed) + current
+
+
+def _retry_after(now, window_seconds):
+    return window_seconds - (now % window_seconds)
+
+
+def _rolled(state_window, current, previous, window_index):
+    """Roll stored (window, current, previous) counters forward to `window_index`."""
+    if state_window == window_index:
+        return current, previous
+    if state_window == window_index - 1:
+        return 0, current
+    return 0, 0
+
+
+class InMemoryBackend:
+    """
+    Per-process backend: fixed-size state per key in an LRU-ordered dict.
+    Keys idle for more than two windows are evicted lazily, and the dict never
+    grows past `max_keys`.
+    """
+    blocking = False
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._state = OrderedDict()  # key -> [window_index, current, previous, window_seconds]
+        self._lock = threading.Lock()
+
+    def acquire(self, key, limit, window_seconds, now, consume=True):
+        window_index = int(now // window_seconds)
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                current, previous = 0, 0
+            else:
+                current, previous = _rolled(state[0], state[1], state[2], window_index)
+
+            allowed = sliding_window_estimate(previous, current, now, window_seconds) < limit
+            if consume and allowed:
+                current += 1
+            if consume or state is not None:
+                self._state[key] = [window_index, current, previous, window_seconds]
+                self._state.move_to_end(key)
+            self._evict(now)
+
+        return Decision(allowed, 0.0 if allowed else _retry_after(now, window_seconds))
+
+    def _evict(self, now):
+        # ✅ Oldest keys sit at the front; stop at the first one still active
+        while self._state:
+            key, (window_index, _, _, window_seconds) = next(iter(self._state.items()))
+            if len(self._state) <= self.max_keys and (window_index + 2) * window_seconds > now:
+                break
+            self._state.popitem(last=False)
+
+    def __len__(self):
+        return len(self._state)
+
+
+class SQLiteBackend:
+    """
+    Shared backend for several workers on one host (and a stand-in for tests).
+    Each acquire is one IMMEDIATE transaction, so concurrent workers serialise.
+    """
+    blocking = True
+
+    def __init__(self, path, eviction_interval=60):
+        self.path = path
+        self.eviction_interval = eviction_interval
+        self._local = threading.local()
+        self._last_eviction = 0.0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, window_index INTEGER, current INTEGER, previous INTEGER, expires_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS rate_limits_expiry ON rate_limits (expires_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key, limit, window_seconds, now, consume=True):
+        window_index = int(now // window_seconds)
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT window_index, current, previous FROM rate_limits WHERE key = ?", (key,)
+            ).fetchone()
+            current, previous = _rolled(*row, window_index) if row else (0, 0)
+            allowed = sliding_window_estimate(previous, current, now, window_seconds) < limit
+            if consume:
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                    (key, window_index, current + (1 if allowed else 0), previous, (window_index + 2) * window_seconds)
+                )
+            if now - self._last_eviction > self.eviction_interval:
+                conn.execute("DELETE FROM rate_limits WHERE expires_at < ?", (now,))
+                self._last_eviction = now
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return Decision(allowed, 0.0 if allowed else _retry_after(now, window_seconds))
+
+
+class MongoBackend:
+    """
+    Shared backend for workers across hosts. One atomic pipeline update rolls the
+    window and increments; over-limit hits are rolled back. A TTL index on
+    `expires_at` evicts idle keys.
+    """
+    blocking = True
+
+    def __init__(self, repository):
+        self.repository = repository
+
+    def acquire(self, key, limit, window_seconds, now, consume=True):
+        window_index = int(now // window_seconds)
+        if not consume:
+            doc = self.repository.find_one({"_id": key}) or {}
+            current, previous = _rolled(doc.get("window_index"), doc.get("current", 0), doc.get("previous", 0), window_index)
+            allowed = sliding_window_estimate(previous, current, now, window_seconds) < limit
+            return Decision(allowed, 0.0 if allowed else _retry_after(now, window_seconds))
+
+        same_window = {"$eq": ["$window_index", window_index]}
+        doc = self.repository.collection.find_one_and_update(
+            {"_id": key},
+            [
+                {"$set": {
+                    "previous": {"$cond": [same_window, "$previous", {
+                        "$cond": [{"$eq": ["$window_index", window_index - 1]}, "$current", 0]
+                    }]},
+                    "current": {"$cond": [same_window, "$current", 0]},
+                    "window_index": window_index,
+                    "expires_at": self.repository.expiry((window_index + 2) * window_seconds),
+                }},
+                {"$set": {"current": {"$add": ["$current", 1]}}},
+            ],
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        allowed = sliding_window_estimate(doc["previous"], doc["current"], now, window_seconds) <= limit
+        if not allowed:
+            self.repository.update_one({"_id": key, "window_index": window_index}, {"$inc": {"current": -1}})
+        return Decision(allowed, 0.0 if allowed else _retry_after(now, window_seconds))
+
+
+class RateLimiter:
+    """Sliding-window-counter limiter over a pluggable backend; O(1) work per check."""
+
+    def __init__(self, backend, window_seconds=60):
+        self.backend = backend
+        self.window_seconds = window_seconds
+
+    def check(self, key, limit, consume=True, now=None):
+        now = time.time() if now is None else now
+        return self.backend.acquire(key, limit, self.window_seconds, now, consume=consume)
@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from config.settings import ANCHOR_BATCH_SIZE, ANCHOR_FLUSH_INTERVAL_MS, ANCHOR_COMMIT_RETRIES
+from services.workers import run_io
+
+logger = logging.getLogger("blockchain_anchor")
+
+
+def hash_pair(left: bytes, right: bytes) -> bytes:
+    """Sorted-pair SHA-256, identical to SecurePayments.verifyInclusion."""
+    if left <= right:
+        return hashlib.sha256(left + right).digest()
+    return hashlib.sha256(right + left).digest()
+
+
+def leaf_hash(record: dict) -> bytes:
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).digest()
+
+
+class MerkleTree:
+    """Binary Merkle tree; an odd node at the end of a level is promoted unchanged."""
+
+    def __init__(self, leaves):
+        if not leaves:
+            raise ValueError("Cannot build a Merkle tree without leaves")
+        self.levels = [list(leaves)]
+        while len(self.levels[-1]) > 1:
+            level = self.levels[-1]
+            parents = [hash_pair(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                parents.append(level[-1])
+            self.levels.append(parents)
+
+    @property
+    def root(self) -> bytes:
+        return self.levels[-1][0]
+
+    def proof(self, index: int) -> list:
+        proof = []
+        for level in self.levels[:-1]:
+            sibling = index ^ 1
+            if sibling < len(level):
+                proof.append(level[sibling])
+            index //= 2
+        return proof
+
+
+def verify_proof(leaf: bytes, proof: list, root: bytes) -> bool:
+    computed = leaf
+    for sibling in proof:
+        computed = hash_pair(computed, sibling)
+    return computed == root
+
+
+class AnchorService:
+    """
+    Collects payment records and anchors them on-chain as one Merkle root per batch.
+
+    A batch is sealed every `batch_size` records or `flush_interval_ms` after its
+    first record, whichever comes first. Callers get their batch id and Merkle
+    proof as soon as the batch is sealed; the chain commit runs in the background,
+    one transaction at a time so account nonces stay ordered.
+
+    :param commit_batch: Blocking callable (batch_id: int, merkle_root: bytes, size: int) -> tx hash
+    """
+
+    def __init__(self, commit_batch, batch_size=ANCHOR_BATCH_SIZE,
+                 flush_interval_ms=ANCHOR_FLUSH_INTERVAL_MS, retries=ANCHOR_COMMIT_RETRIES):
+        self.commit_batch = commit_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.retries = retries
+        self._pending = []
+        self._timer = None
+        self._commit_lock = asyncio.Lock()
+        self._commit_tasks = set()
+
+    async def anchor(self, record: dict) -> dict:
+        """Queue a record; resolves with its batch id and inclusion proof once the batch seals."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((leaf_hash(record), future))
+
+        if len(self._pending) >= self.batch_size:
+            self._seal()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self._seal)
+
+        return await future
+
+    def _seal(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        tree = MerkleTree([leaf for leaf, _ in batch])
+        batch_id = uuid.uuid4().int  # ✅ Unique across uvicorn workers, fits in uint256
+        root_hex = tree.root.hex()
+
+        for index, (leaf, future) in enumerate(batch):
+            if not future.done():
+                future.set_result({
+                    "batch_id": f"{batch_id:032x}",
+                    "leaf": leaf.hex(),
+                    "leaf_index": index,
+                    "merkle_root": root_hex,
+                    "merkle_proof": [node.hex() for node in tree.proof(index)],
+                })
+
+        task = asyncio.ensure_future(self._commit(batch_id, tree.root, len(batch)))
+        self._commit_tasks.add(task)
+        task.add_done_callback(self._commit_tasks.discard)
+
+    async def _commit(self, batch_id: int, merkle_root: bytes, size: int):
+        async with self._commit_lock:
+            for attempt in range(1, self.retries + 1):
+                try:
+                    tx_hash = await run_io(self.commit_batch, batch_id, merkle_root, size)
+                    logger.info(f"Anchored batch {batch_id:032x} ({size} payments) in tx {tx_hash}")
+                    return tx_hash
+                except Exception as e:
+                    logger.warning(f"Anchoring batch {batch_id:032x} failed (attempt {attempt}): {e}")
+                    await asyncio.sleep(0.1 * attempt)
+            logger.error(f"Giving up on batch {batch_id:032x} root {merkle_root.hex()}")
+
+    async def flush(self):
+        """Seal whatever is pending and wait for every in-flight commit (used on shutdown)."""
+        self._seal()
+        if self._commit_tasks:
+            await asyncio.gather(*list(self._commit_tasks), return_exceptions=True)
@@ -1,12 +1,4 @@
-from pymongo import MongoClient
-
-# Connect to MongoDB
-client = MongoClient("mongodb://localhost:27017/")
-db = client["secure_payment_db"]
-cardholders_collection = db["cardholders"]
-
-# Ensure indexing on card_number for fast lookups
-cardholders_collection.create_index("card_number")
+from models.cardholder import cardholders_repository
 
 def get_registered_mobile(card_number):
     """
@@ -20,13 +12,9 @@ def get_registered_mobile(card_number):
     formatted_card_number = card_number.replace(" ", "").strip()
 
     # Query MongoDB for the cardholder data
-    card_data = cardholders_collection.find_one(
-        {
-            "$or": [
-                {"card_number": formatted_card_number},  # Match non-spaced version
-                {"card_number": card_number}            # Match as entered
-            ]
-        }
+    card_data = cardholders_repository.find_by_card_number_variants(
+        formatted_card_number,  # Match non-spaced version
+        card_number             # Match as entered
     )
 
     if not card_data:
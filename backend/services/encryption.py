@@ -19,15 +19,14 @@ def encrypt_password(password: str, key: bytes = None):
     encryptor = cipher.encryptor()
 
     ciphertext = encryptor.update(password.encode()) + encryptor.finalize()
-    tag = encryptor.tag
-    encrypted_data = ciphertext + tag
+    encrypted_data = ciphertext + encryptor.tag
 
-    # Return base64-encoded values for easy storage
-    return {
-        "ciphertext": base64.b64encode(ciphertext).decode(),
-        "nonce": base64.b64encode(nonce).decode(),
-        "key": base64.b64encode(key).decode()             # Encryption key
-    }
+    # Return base64-encoded values in the order decrypt_password takes them
+    return (
+        base64.b64encode(encrypted_data).decode(),
+        base64.b64encode(nonce).decode(),
+        base64.b64encode(key).decode()             # Encryption key
+    )
 
 def decrypt_password(encrypted_password: str, nonce: str, key: str):
     """
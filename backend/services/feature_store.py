@@ -0,0 +1,194 @@
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from config.settings import FEATURE_STORE_MAX_USERS, FEATURE_STORE_MAX_DISTINCT
+from models.transaction import transactions_repository
+
+SNAPSHOT_VERSION = 1
+
+# ✅ name -> (window seconds, bucket count); memory per user is fixed by these
+WINDOWS = {
+    "1m": (60, 12),
+    "1h": (3600, 60),
+    "24h": (86400, 24),
+}
+DISTINCT_WINDOW_SECONDS = 86400
+
+
+def to_epoch(timestamp):
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return timestamp.timestamp()
+    return float(timestamp)
+
+
+def feature_key(transaction):
+    """Transactions are written with either user_email or user_identifier."""
+    return transaction.get("user_email") or transaction.get("user_identifier")
+
+
+class RollingWindow:
+    """Count and sum over a sliding window, kept in a fixed ring of time buckets."""
+    __slots__ = ("width", "slots", "bucket_ids", "counts", "sums")
+
+    def __init__(self, seconds, buckets):
+        self.width = seconds / buckets
+        self.slots = buckets
+        self.bucket_ids = [-1] * buckets
+        self.counts = [0] * buckets
+        self.sums = [0.0] * buckets
+
+    def add(self, ts, amount):
+        bucket = int(ts // self.width)
+        slot = bucket % self.slots
+        if self.bucket_ids[slot] != bucket:
+            self.bucket_ids[slot] = bucket
+            self.counts[slot] = 0
+            self.sums[slot] = 0.0
+        self.counts[slot] += 1
+        self.sums[slot] += amount
+
+    def totals(self, now):
+        oldest = int(now // self.width) - self.slots
+        count, total = 0, 0.0
+        for bucket, c, s in zip(self.bucket_ids, self.counts, self.sums):
+            if bucket > oldest:
+                count += c
+                total += s
+        return count, total
+
+
+class BoundedRecency:
+    """Distinct values seen within `ttl` seconds, capped at `limit` (oldest dropped)."""
+    __slots__ = ("limit", "ttl", "seen")
+
+    def __init__(self, limit, ttl):
+        self.limit = limit
+        self.ttl = ttl
+        self.seen = OrderedDict()
+
+    def add(self, value, ts):
+        if value is None:
+            return
+        self.seen[value] = ts
+        self.seen.move_to_end(value)
+        while len(self.seen) > self.limit:
+            self.seen.popitem(last=False)
+
+    def distinct(self, now):
+        cutoff = now - self.ttl
+        while self.seen and next(iter(self.seen.values())) < cutoff:
+            self.seen.popitem(last=False)
+        return len(self.seen)
+
+    def __contains__(self, value):
+        return value in self.seen
+
+
+class UserFeatures:
+    __slots__ = ("windows", "devices", "ips", "last_location", "last_seen")
+
+    def __init__(self, max_distinct):
+        self.windows = {name: RollingWindow(seconds, buckets) for name, (seconds, buckets) in WINDOWS.items()}
+        self.devices = BoundedRecency(max_distinct, DISTINCT_WINDOW_SECONDS)
+        self.ips = BoundedRecency(max_distinct, DISTINCT_WINDOW_SECONDS)
+        self.last_location = None
+        self.last_seen = 0.0
+
+
+class FeatureStore:
+    """
+    In-memory per-user rolling aggregates for fraud scoring.
+
+    Updated incrementally from every saved transaction and read in constant time.
+    Users are kept in LRU order and capped at `max_users`; each user's state is a
+    fixed set of buckets plus at most `max_distinct` devices and IPs. State is
+    per worker process and can be snapshotted to disk and restored on start.
+    """
+
+    def __init__(self, max_users=FEATURE_STORE_MAX_USERS, max_distinct=FEATURE_STORE_MAX_DISTINCT):
+        self.max_users = max_users
+        self.max_distinct = max_distinct
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, transaction):
+        user = feature_key(transaction)
+        if not user:
+            return
+        ts = to_epoch(transaction.get("timestamp"))
+        amount = float(transaction.get("amount") or 0)
+
+        with self._lock:
+            state = self._users.get(user)
+            if state is None:
+                state = self._users[user] = UserFeatures(self.max_distinct)
+                if len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._users.move_to_end(user)
+
+            for window in state.windows.values():
+                window.add(ts, amount)
+            state.devices.add(transaction.get("device"), ts)
+            state.ips.add(transaction.get("ip_address"), ts)
+            if transaction.get("location"):
+                state.last_location = transaction["location"]
+            state.last_seen = max(state.last_seen, ts)
+
+    def features(self, user, device=None, ip_address=None, location=None, now=None):
+        """Feature dict for scoring; zeros for users with no history."""
+        now = time.time() if now is None else now
+        features = {}
+        with self._lock:
+            state = self._users.get(user)
+            for name in WINDOWS:
+                count, total = state.windows[name].totals(now) if state else (0, 0.0)
+                features[f"txn_count_{name}"] = count
+                features[f"txn_sum_{name}"] = total
+            features["distinct_devices_24h"] = state.devices.distinct(now) if state else 0
+            features["distinct_ips_24h"] = state.ips.distinct(now) if state else 0
+            features["last_location"] = state.last_location if state else None
+            features["new_device"] = bool(state and device is not None and device not in state.devices)
+            features["new_ip"] = bool(state and ip_address is not None and ip_address not in state.ips)
+            features["location_changed"] = bool(
+                state and location and state.last_location and location != state.last_location
+            )
+        return features
+
+    def __len__(self):
+        return len(self._users)
+
+    def snapshot(self, path):
+        """Atomically write the store to `path` (temp file + rename)."""
+        with self._lock:
+            data = pickle.dumps({"version": SNAPSHOT_VERSION, "users": list(self._users.items())}, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def restore(self, path):
+        """Load a snapshot written by `snapshot`; returns the number of users restored."""
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") != SNAPSHOT_VERSION:
+            return 0
+        with self._lock:
+            self._users = OrderedDict(data["users"][-self.max_users:])
+        return len(self._users)
+
+
+feature_store = FeatureStore()
+
+# ✅ Every transaction write feeds the store
+transactions_repository.add_save_listener(feature_store.update)
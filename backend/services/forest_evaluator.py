@@ -0,0 +1,119 @@
+import json
+import os
+import numpy as np
+
+FORMAT_VERSION = 1
+ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+
+
+def compile_forest(model, positive_class=1):
+    """
+    Flatten a fitted sklearn RandomForestClassifier into node arrays.
+    Only reads estimator attributes, so sklearn is needed at export time but
+    never at inference time.
+
+    Leaves point to themselves (left == right == own index) so a fixed number of
+    vectorized steps settles every row; `value` holds P(positive_class).
+    """
+    column = list(model.classes_).index(positive_class)
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset = 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        is_leaf = tree.children_left == -1
+        counts = tree.value[:, 0, :]
+        totals = counts.sum(axis=1)
+        totals[totals == 0] = 1
+
+        own_index = np.arange(tree.node_count) + offset
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, own_index, tree.children_left + offset))
+        right.append(np.where(is_leaf, own_index, tree.children_right + offset))
+        value.append(counts[:, column] / totals)
+        offset += tree.node_count
+
+    return {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": int(max(estimator.tree_.max_depth for estimator in model.estimators_)),
+        "n_features": int(model.n_features_in_),
+    }
+
+
+def save_compiled_forest(compiled, directory, metadata=None):
+    """Write one uncompressed .npy per array (memory-mappable) plus metadata.json."""
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f"{name}.npy"), compiled[name])
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "max_depth": compiled["max_depth"],
+        "n_features": compiled["n_features"],
+        "n_trees": int(len(compiled["roots"])),
+        "n_nodes": int(len(compiled["feature"])),
+    }
+    meta.update(metadata or {})
+    with open(os.path.join(directory, "metadata.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class CompiledForest:
+    """
+    Pure numpy random-forest evaluator. Arrays are memory-mapped read-only, so
+    every worker process shares the same page-cache copy of the model.
+    """
+    classes_ = np.array([0, 1])
+
+    def __init__(self, arrays, max_depth, n_features, metadata=None):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.left = arrays["left"]
+        self.right = arrays["right"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.metadata = metadata or {}
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, "metadata.json")) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {meta.get('format_version')}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode) for name in ARRAYS}
+        return cls(arrays, meta["max_depth"], meta["n_features"], meta)
+
+    @classmethod
+    def from_model(cls, model):
+        compiled = compile_forest(model)
+        return cls(compiled, compiled["max_depth"], compiled["n_features"])
+
+    def predict_fraud_proba(self, X):
+        """Mean leaf probability over all trees; every tree walks all rows at once."""
+        # ✅ sklearn compares float32-cast features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_samples, n_features = X.shape
+        flat_X = X.ravel()
+        row_offsets = np.arange(n_samples) * n_features
+        nodes = np.repeat(self.roots[:, None], n_samples, axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = flat_X.take(row_offsets + self.feature.take(nodes)) <= self.threshold.take(nodes)
+            nodes = np.where(go_left, self.left.take(nodes), self.right.take(nodes))
+
+        return self.value.take(nodes).mean(axis=0)
+
+    def predict_proba(self, X):
+        """sklearn-compatible (n, 2) output so callers can swap models freely."""
+        fraud = self.predict_fraud_proba(X)
+        return np.column_stack([1 - fraud, fraud])
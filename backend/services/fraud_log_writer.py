@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from pymongo.errors import BulkWriteError
+from config.settings import FRAUD_LOG_QUEUE_SIZE, FRAUD_LOG_BATCH_SIZE
+from models.fraud_logs import fraud_logs_repository
+from monitoring.prometheus_metrics import FRAUD_LOG_QUEUE_DEPTH, FRAUD_LOG_FLUSH_LATENCY, FRAUD_LOG_WRITE_ERRORS
+from services.workers import run_io
+
+logger = logging.getLogger("fraud_log_writer")
+
+
+class FraudLogWriter:
+    """
+    Write-behind fraud log pipeline: handlers enqueue documents and return, a
+    background task drains the queue with unordered `insert_many` batches.
+
+    The queue is bounded; when it is full `submit` waits for room, which slows
+    down the flagged requests instead of growing memory without limit.
+    """
+
+    def __init__(self, repository=fraud_logs_repository, max_queue=FRAUD_LOG_QUEUE_SIZE, batch_size=FRAUD_LOG_BATCH_SIZE):
+        self.repository = repository
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self._queue = None
+        self._task = None
+        self._loop = None
+        self.written = 0
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            if self._loop is not loop:
+                self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._loop = loop
+            self._task = loop.create_task(self._drain())
+
+    async def submit(self, document: dict):
+        """Queue one fraud log document (waits while the queue is full)."""
+        self._ensure_started()
+        await self._queue.put(document)
+        FRAUD_LOG_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            FRAUD_LOG_QUEUE_DEPTH.set(self._queue.qsize())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch):
+        start = time.perf_counter()
+        try:
+            await run_io(self.repository.insert_many, batch, ordered=False)
+            self.written += len(batch)
+        except BulkWriteError as e:
+            # ✅ Unordered insert: everything except the reported documents was written
+            failed = len(e.details.get("writeErrors", []))
+            self.written += len(batch) - failed
+            FRAUD_LOG_WRITE_ERRORS.inc(failed)
+            logger.error(f"🚨 {failed} of {len(batch)} fraud logs failed to write")
+        except Exception as e:
+            FRAUD_LOG_WRITE_ERRORS.inc(len(batch))
+            logger.error(f"🚨 Error writing {len(batch)} fraud logs: {e}")
+        FRAUD_LOG_FLUSH_LATENCY.observe(time.perf_counter() - start)
+
+    async def flush(self):
+        """Waits until everything queued so far has been written."""
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            await self._queue.join()
+
+    async def close(self):
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+_writer = None
+
+
+def get_fraud_log_writer():
+    """Process-wide fraud log writer (created on first use)."""
+    global _writer
+    if _writer is None:
+        _writer = FraudLogWriter()
+    return _writer
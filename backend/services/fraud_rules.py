@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from typing import NamedTuple
+from config.settings import FRAUD_RULES_PATH, FRAUD_RULES_RELOAD_SECONDS
+from monitoring.prometheus_metrics import FRAUD_RULE_HITS
+
+logger = logging.getLogger("fraud_rules")
+
+EQUALITY_OPS = {"eq", "in"}
+NEGATED_OPS = {"ne", "not_in"}
+RANGE_OPS = {"gt", "gte", "lt", "lte"}
+
+
+class RuleError(ValueError):
+    pass
+
+
+class FiredRule(NamedTuple):
+    id: str
+    reason: str
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+class FieldIndex:
+    """
+    Per-field decision structure: hash lookups for (not-)membership and sorted
+    thresholds + bisect for range operators, so evaluation cost depends on the
+    number of matches rather than the number of rules.
+    """
+
+    def __init__(self):
+        self.equals = defaultdict(list)       # value -> condition ids (eq / in)
+        self.negated = []                     # condition ids of ne / not_in
+        self.negated_values = {}              # value -> ne / not_in conditions it does NOT satisfy
+        self.ranges = {op: ([], []) for op in RANGE_OPS}  # op -> (sorted thresholds, condition ids)
+        self.active_ranges = []
+
+    def add(self, condition_id, op, value):
+        if op in EQUALITY_OPS:
+            for item in (value if op == "in" else [value]):
+                self.equals[_hashable(item)].append(condition_id)
+        elif op in NEGATED_OPS:
+            self.negated.append(condition_id)
+            for item in (value if op == "not_in" else [value]):
+                self.negated_values.setdefault(_hashable(item), set()).add(condition_id)
+        elif op in RANGE_OPS:
+            thresholds, ids = self.ranges[op]
+            position = bisect_right(thresholds, value)
+            thresholds.insert(position, value)
+            ids.insert(position, condition_id)
+            self.active_ranges = [(o, r) for o, r in self.ranges.items() if r[0]]
+        else:
+            raise RuleError(f"Unknown operator: {op}")
+
+    def matches(self, value):
+        key = _hashable(value)
+        matched = list(self.equals.get(key, ()))
+        if self.negated:
+            excluded = self.negated_values.get(key, ())
+            matched.extend(c for c in self.negated if c not in excluded)
+
+        if self.active_ranges and isinstance(value, (int, float)) and not isinstance(value, bool):
+            for op, (thresholds, ids) in self.active_ranges:
+                if op == "gt":      # value > t
+                    matched.extend(ids[:bisect_left(thresholds, value)])
+                elif op == "gte":   # value >= t
+                    matched.extend(ids[:bisect_right(thresholds, value)])
+                elif op == "lt":    # value < t
+                    matched.extend(ids[bisect_right(thresholds, value):])
+                else:               # value <= t
+                    matched.extend(ids[bisect_left(thresholds, value):])
+        return matched
+
+
+class CompiledRules:
+    """A rule set compiled once into per-field indexes."""
+
+    def __init__(self, rules):
+        self.rules = []
+        self.fields = {}
+        self.condition_rule = []   # condition id -> rule index
+        self.required = []         # rule index -> number of conditions that must match
+        seen = set()
+
+        for rule in rules:
+            rule_id = rule.get("id")
+            if not rule_id or rule_id in seen:
+                raise RuleError(f"Rule id missing or duplicated: {rule_id!r}")
+            seen.add(rule_id)
+            conditions = rule.get("all") or [rule]
+            rule_index = len(self.rules)
+            self.rules.append(FiredRule(rule_id, rule.get("reason", rule_id)))
+            self.required.append(len(conditions))
+
+            for condition in conditions:
+                op, value = condition.get("op"), condition.get("value")
+                if op in {"in", "not_in"} and not isinstance(value, list):
+                    raise RuleError(f"Rule {rule_id}: '{op}' needs a list value")
+                if op in RANGE_OPS and not isinstance(value, (int, float)):
+                    raise RuleError(f"Rule {rule_id}: '{op}' needs a numeric value")
+                condition_id = len(self.condition_rule)
+                self.condition_rule.append(rule_index)
+                self.fields.setdefault(condition["field"], FieldIndex()).add(condition_id, op, value)
+
+    def evaluate(self, transaction):
+        hits = {}
+        condition_rule = self.condition_rule
+        for field, index in self.fields.items():
+            if field in transaction:
+                for condition_id in index.matches(transaction[field]):
+                    rule_index = condition_rule[condition_id]
+                    hits[rule_index] = hits.get(rule_index, 0) + 1
+        required = self.required
+        return [self.rules[i] for i in sorted(hits) if hits[i] == required[i]]
+
+
+class RuleEngine:
+    """
+    Loads rules from a JSON file, recompiling when its mtime changes (checked at
+    most every `reload_seconds`). A bad edit is logged and the previous rule set
+    stays active.
+    """
+
+    def __init__(self, path=FRAUD_RULES_PATH, reload_seconds=FRAUD_RULES_RELOAD_SECONDS):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self.hit_counts = Counter()
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self.compiled = CompiledRules([])
+        self.reload(force=True)
+
+    def reload(self, force=False):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            logger.error(f"🚨 Fraud rules file not found: {self.path}")
+            return False
+        if not force and mtime == self._mtime:
+            return False
+
+        with self._lock:
+            try:
+                with open(self.path) as f:
+                    compiled = CompiledRules(json.load(f)["rules"])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.error(f"🚨 Keeping previous fraud rules, {self.path} is invalid: {e}")
+                self._mtime = mtime
+                return False
+            self.compiled = compiled
+            self._mtime = mtime
+        logger.info(f"✅ Loaded {len(compiled.rules)} fraud rules from {self.path}")
+        return True
+
+    def evaluate(self, transaction):
+        """Rules matched by this transaction, in file order."""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._next_check = now + self.reload_seconds
+            self.reload()
+
+        fired = self.compiled.evaluate(transaction)
+        for rule in fired:
+            self.hit_counts[rule.id] += 1
+            FRAUD_RULE_HITS.labels(rule.id).inc()
+        return fired
+
+
+_engine = None
+
+
+def get_rule_engine():
+    global _engine
+    if _engine is None:
+        _engine = RuleEngine()
+    return _engine
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+from config.settings import FRAUD_BATCH_MAX_SIZE, FRAUD_BATCH_MAX_WAIT_MS
+from monitoring.prometheus_metrics import FRAUD_BATCH_SIZE, FRAUD_SCORING_LATENCY
+from services.workers import run_io
+
+logger = logging.getLogger("fraud_scoring")
+
+
+class MicroBatcher:
+    """
+    Collects concurrent scoring requests for up to `max_wait_ms` (or until
+    `max_batch_size` arrive) and scores them with one vectorized call.
+
+    :param score_batch: Blocking callable (list of transactions) -> sequence of probabilities
+    """
+
+    def __init__(self, score_batch, max_batch_size=FRAUD_BATCH_MAX_SIZE, max_wait_ms=FRAUD_BATCH_MAX_WAIT_MS):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = []
+        self._timer = None
+
+    async def score(self, transaction: dict) -> float:
+        """Fraud probability for one transaction, scored together with its neighbours."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((transaction, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        FRAUD_BATCH_SIZE.observe(len(batch))
+        try:
+            probabilities = await run_io(self.score_batch, [transaction for transaction, _, _ in batch])
+        except Exception as e:
+            # ✅ Same fail-open behaviour as detect_fraud; the rule checks still apply
+            logger.error(f"🚨 Error scoring fraud batch of {len(batch)}: {e}")
+            probabilities = [0.0] * len(batch)
+
+        finished = time.perf_counter()
+        for (_, future, queued_at), probability in zip(batch, probabilities):
+            FRAUD_SCORING_LATENCY.observe(finished - queued_at)
+            if not future.done():
+                future.set_result(float(probability))
+
+
+_batcher = None
+
+
+def get_fraud_batcher():
+    """Process-wide batcher over the ML model (created on first use)."""
+    global _batcher
+    if _batcher is None:
+        from services.ml_fraud_detection import score_batch
+        _batcher = MicroBatcher(score_batch)
+    return _batcher
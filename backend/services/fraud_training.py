@@ -0,0 +1,185 @@
+import os
+import shutil
+from datetime import datetime
+from itertools import zip_longest
+import numpy as np
+from services.forest_evaluator import compile_forest, save_compiled_forest
+from services.ml_fraud_detection import build_features
+
+# ✅ Only the columns the model needs leave the database
+TRAINING_PROJECTION = {"_id": 1, "amount": 1, "payment_method": 1}
+POINTER_FILE = "CURRENT"
+
+
+def iter_collection(repository, since_id=None, chunk_size=50000):
+    """
+    Streams a collection in `_id` order through a server-side cursor, yielding
+    lists of at most `chunk_size` projected documents.
+
+    :param since_id: Only documents inserted after this `_id` (incremental runs)
+    """
+    query = {"_id": {"$gt": since_id}} if since_id is not None else {}
+    cursor = repository.find(query, TRAINING_PROJECTION, batch_size=chunk_size).sort("_id", 1)
+    chunk = []
+    for document in cursor:
+        chunk.append(document)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def chunk_features(documents):
+    """(features, last _id) for one chunk of documents."""
+    usable = [d for d in documents if d.get("amount") is not None and d.get("payment_method") is not None]
+    last_id = documents[-1].get("_id") if documents else None
+    return build_features(usable), last_id
+
+
+class Reservoir:
+    """Fixed-size uniform sample of feature rows (algorithm R, vectorized per chunk)."""
+
+    def __init__(self, capacity, n_features=2, rows=None, seen=0, seed=0):
+        self.capacity = capacity
+        self.rows = rows if rows is not None else np.empty((0, n_features))
+        self.seen = seen
+        self.rng = np.random.default_rng(seed + seen)
+
+    def add(self, X):
+        if not len(X):
+            return
+        room = self.capacity - len(self.rows)
+        if room > 0:
+            self.rows = np.vstack([self.rows, X[:room]])
+            self.seen += min(room, len(X))
+            X = X[room:]
+        if len(X):
+            slots = self.rng.integers(0, self.seen + np.arange(1, len(X) + 1))
+            keep = slots < self.capacity
+            # Later rows overwrite earlier ones on the same slot, as in the sequential algorithm
+            self.rows[slots[keep]] = X[keep]
+            self.seen += len(X)
+
+
+def train_incremental(transaction_chunks, fraud_chunks, model=None, state=None,
+                      trees_per_chunk=10, max_trees=200, reservoir_size=20000, random_state=42):
+    """
+    Warm-start random forest training over chunked data.
+
+    Each chunk of new rows adds `trees_per_chunk` trees, fitted on the chunk plus
+    bounded reservoirs of earlier legitimate and fraudulent rows (so every tree
+    sees both classes even when fraud is rare). Only the newest `max_trees`
+    trees are kept. Transactions are label 0, fraud logs label 1.
+
+    :param transaction_chunks: Iterable of document lists from `iter_collection`
+    :param fraud_chunks: Iterable of document lists from `iter_collection`
+    :param model: Previous model to extend, or None to start fresh
+    :param state: Previous training state (reservoirs, watermarks), or None
+    :return: (model, state)
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    state = dict(state or {})
+    legit = Reservoir(reservoir_size, rows=state.get("legit_rows"), seen=state.get("legit_seen", 0), seed=random_state)
+    fraud = Reservoir(reservoir_size, rows=state.get("fraud_rows"), seen=state.get("fraud_seen", 0), seed=random_state + 1)
+    if model is None:
+        model = RandomForestClassifier(
+            n_estimators=0, warm_start=True, max_depth=12, min_samples_leaf=5,
+            n_jobs=-1, random_state=random_state,
+        )
+    rows = {"transactions": 0, "fraud_logs": 0}
+
+    for legit_docs, fraud_docs in zip_longest(transaction_chunks, fraud_chunks, fillvalue=[]):
+        X_legit, last_legit = chunk_features(legit_docs)
+        X_fraud, last_fraud = chunk_features(fraud_docs)
+        if last_legit is not None:
+            state["transactions_watermark"] = last_legit
+        if last_fraud is not None:
+            state["fraud_logs_watermark"] = last_fraud
+
+        X = np.vstack([X_legit, legit.rows, X_fraud, fraud.rows])
+        y = np.concatenate([
+            np.zeros(len(X_legit) + len(legit.rows)),
+            np.ones(len(X_fraud) + len(fraud.rows)),
+        ])
+        legit.add(X_legit)
+        fraud.add(X_fraud)
+        rows["transactions"] += len(X_legit)
+        rows["fraud_logs"] += len(X_fraud)
+        if len(np.unique(y)) < 2:
+            continue
+
+        trees = getattr(model, "estimators_", [])
+        model.set_params(n_estimators=len(trees) + trees_per_chunk)
+        model.fit(X, y)
+        if len(model.estimators_) > max_trees:
+            model.estimators_ = model.estimators_[-max_trees:]
+            model.set_params(n_estimators=max_trees)
+
+    state.update({
+        "legit_rows": legit.rows, "legit_seen": legit.seen,
+        "fraud_rows": fraud.rows, "fraud_seen": fraud.seen,
+        "rows": rows,
+    })
+    return model, state
+
+
+# ✅ Versioned artifacts: one directory per version, CURRENT names the live one
+
+def current_version_dir(registry_dir):
+    """Directory of the live model version, or None if nothing has been published."""
+    try:
+        with open(os.path.join(registry_dir, POINTER_FILE)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return os.path.join(registry_dir, version) if version else None
+
+
+def publish_model(model, state, registry_dir, metadata=None, keep=3):
+    """
+    Writes a new model version and atomically repoints CURRENT at it.
+    Serving processes pick it up on their next reload check.
+    """
+    import joblib
+    import sklearn
+
+    os.makedirs(registry_dir, exist_ok=True)
+    version = "v" + datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    directory = os.path.join(registry_dir, version)
+
+    meta = {
+        "version": version,
+        "sklearn_version": sklearn.__version__,
+        "rows": state.get("rows", {}),
+        "transactions_watermark": str(state.get("transactions_watermark") or ""),
+        "fraud_logs_watermark": str(state.get("fraud_logs_watermark") or ""),
+    }
+    meta.update(metadata or {})
+    save_compiled_forest(compile_forest(model), directory, meta)
+    joblib.dump(model, os.path.join(directory, "model.pkl"))
+    joblib.dump({k: v for k, v in state.items() if k != "rows"}, os.path.join(directory, "state.pkl"))
+
+    tmp = os.path.join(registry_dir, POINTER_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, os.path.join(registry_dir, POINTER_FILE))
+
+    versions = sorted(d for d in os.listdir(registry_dir) if d.startswith("v") and d != version)
+    for old in versions[:max(0, len(versions) - (keep - 1))]:
+        shutil.rmtree(os.path.join(registry_dir, old), ignore_errors=True)
+    return directory
+
+
+def load_training_checkpoint(registry_dir):
+    """(model, state) of the live version, or (None, None) for a fresh start."""
+    import joblib
+
+    directory = current_version_dir(registry_dir)
+    if directory is None or not os.path.exists(os.path.join(directory, "state.pkl")):
+        return None, None
+    return joblib.load(os.path.join(directory, "model.pkl")), joblib.load(os.path.join(directory, "state.pkl"))
+
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+import uuid
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from pymongo.errors import DuplicateKeyError
+from config.settings import (
+    KEM_SESSION_MAX_MESSAGES,
+    KEM_SESSION_MAX_AGE_SECONDS,
+    KEM_PLATFORM_PARTY,
+    KEM_KEY_CACHE_SIZE,
+    KEM_KEY_WRAP_PASSWORD,
+)
+from models.kem import kem_recipients_repository, kem_sessions_repository
+from quantum_simulation.hybrid_kem import generate_keypair, encapsulate, decapsulate, kem_name
+from quantum_simulation.envelope import encode_envelope, as_envelope
+from quantum_simulation.key_management import get_wrap_key, HYBRID_KEM_FORMAT_VERSION
+from services.cache import TTLCache
+
+SECRET_WRAP_INFO = b"kem-secret-wrap/v1"
+
+
+class Session:
+    __slots__ = ("key_id", "key", "created", "uses")
+
+    def __init__(self, key_id, key, created):
+        self.key_id = key_id
+        self.key = key
+        self.created = created
+        self.uses = 0
+
+
+class SessionKeyManager:
+    """
+    Per-party (client or merchant) AES-256-GCM session keys established with the
+    hybrid KEM. A session is reused for at most `max_messages` payloads or
+    `max_age_seconds`, then a fresh key is encapsulated.
+
+    Parties that registered a KEM public key get sessions only they can open.
+    Everyone else gets sessions encapsulated to the platform's own keypair
+    (secret wrapped under the master key), so stored payloads stay decryptable.
+    """
+
+    def __init__(self, recipients=kem_recipients_repository, sessions=kem_sessions_repository,
+                 max_messages=KEM_SESSION_MAX_MESSAGES, max_age_seconds=KEM_SESSION_MAX_AGE_SECONDS,
+                 platform_party=KEM_PLATFORM_PARTY, wrap_password=KEM_KEY_WRAP_PASSWORD,
+                 cache_size=KEM_KEY_CACHE_SIZE, clock=time.monotonic):
+        self.recipients = recipients
+        self.sessions = sessions
+        self.max_messages = max_messages
+        self.max_age_seconds = max_age_seconds
+        self.platform_party = platform_party
+        self.wrap_password = wrap_password
+        self.clock = clock
+        self.keys = TTLCache(cache_size, ttl=float("inf"))
+        self._active = {}
+        self._platform = None
+        self._lock = threading.Lock()
+
+    # ✅ Recipient keys
+
+    def _wrap_secret(self, secret):
+        aead, wrapped = AESGCM(get_wrap_key(self.wrap_password, SECRET_WRAP_INFO)), {}
+        for name, value in secret.items():
+            if isinstance(value, bytes):
+                nonce = os.urandom(12)
+                value = nonce + aead.encrypt(nonce, value, name.encode())
+            wrapped[name] = value
+        return wrapped
+
+    def _unwrap_secret(self, wrapped):
+        aead = AESGCM(get_wrap_key(self.wrap_password, SECRET_WRAP_INFO))
+        return {
+            name: aead.decrypt(value[:12], value[12:], name.encode()) if isinstance(value, bytes) else value
+            for name, value in wrapped.items()
+        }
+
+    def platform_keypair(self):
+        """(public, secret) of the platform recipient, created and persisted on first use."""
+        if self._platform is None:
+            document = self.recipients.find_recipient(self.platform_party)
+            if document is None or "wrapped_secret" not in document:
+                public, secret = generate_keypair()
+                try:
+                    self.recipients.insert_one({"_id": self.platform_party, "public": public, "wrapped_secret": self._wrap_secret(secret)})
+                except DuplicateKeyError:
+                    return self.platform_keypair()  # another worker won the race; use its key
+                self._platform = (public, secret)
+            else:
+                self._platform = (document["public"], self._unwrap_secret(document["wrapped_secret"]))
+        return self._platform
+
+    def register_recipient(self, party_id, public):
+        """Stores a party's KEM public key; its next payload starts a new session."""
+        self.recipients.save_recipient(party_id, public)
+        self.rotate(party_id)
+
+    def _recipient_for(self, party_id):
+        document = self.recipients.find_recipient(party_id) if party_id != self.platform_party else None
+        if document is not None:
+            return party_id, document["public"]
+        return self.platform_party, self.platform_keypair()[0]
+
+    # ✅ Sessions
+
+    def session_for(self, party_id) -> Session:
+        """Current session for a party, rotating when it is used up or too old."""
+        now = self.clock()
+        with self._lock:
+            session = self._active.get(party_id)
+            if session is None or session.uses >= self.max_messages or now - session.created >= self.max_age_seconds:
+                session = self._new_session(party_id, now)
+                self._active[party_id] = session
+            session.uses += 1
+            return session
+
+    def _new_session(self, party_id, now):
+        recipient, public = self._recipient_for(party_id)
+        key, encapsulation = encapsulate(public)
+        key_id = uuid.uuid4().hex
+        self.sessions.save_session(key_id, party_id, recipient, kem_name(public), encapsulation)
+        self.keys.set(key_id, key)
+        return Session(key_id, key, now)
+
+    def rotate(self, party_id=None):
+        """Ends the current session of one party (or of all parties)."""
+        with self._lock:
+            if party_id is None:
+                self._active.clear()
+            else:
+                self._active.pop(party_id, None)
+
+    def key_for(self, key_id):
+        """Session key by id: in-memory cache, else decapsulated with the platform secret."""
+        key = self.keys.get(key_id)
+        if key is None:
+            document = self.sessions.find_session(key_id)
+            if document is None:
+                raise KeyError(f"Unknown session key id: {key_id}")
+            if document["recipient"] != self.platform_party:
+                raise PermissionError(f"Session {key_id} was encapsulated to {document['recipient']}, not the platform")
+            key = decapsulate(self.platform_keypair()[1], document["encapsulation"])
+            self.keys.set(key_id, key)
+        return key
+
+    # ✅ Payload encryption (binary envelope; key_id is bound as associated data)
+
+    def encrypt(self, party_id, message) -> bytes:
+        session = self.session_for(party_id)
+        iv = os.urandom(12)
+        data = message.encode() if isinstance(message, str) else message
+        sealed = AESGCM(session.key).encrypt(iv, data, session.key_id.encode())
+        return encode_envelope(HYBRID_KEM_FORMAT_VERSION, bytes.fromhex(session.key_id), iv, sealed)
+
+    def decrypt(self, encrypted_data) -> bytes:
+        """Opens an envelope, or a v3 base64 dict written before the binary format."""
+        envelope = as_envelope(encrypted_data)
+        if envelope.version != HYBRID_KEM_FORMAT_VERSION:
+            raise ValueError(f"Unsupported ciphertext version: {envelope.version}")
+        key_id = envelope.key_id
+        return AESGCM(self.key_for(key_id)).decrypt(envelope.iv, envelope.sealed, key_id.encode())
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager():
+    """Process-wide session key manager (created on first use)."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = SessionKeyManager()
+    return _manager
@@ -1,18 +1,33 @@
-import pandas as pd
 import numpy as np
-import joblib
-from sklearn.ensemble import RandomForestClassifier
 import os
+import threading
+import time
+import warnings
+from services.forest_evaluator import CompiledForest
 
 # Get the absolute path of the current file
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(BASE_DIR, "fraud_detection_model.pkl")
+COMPILED_MODEL_DIR = os.getenv("FRAUD_COMPILED_MODEL_DIR", os.path.join(BASE_DIR, "fraud_model_compiled"))
+# ✅ Versions published by scripts/train_fraud_model.py; checked for a new CURRENT every few seconds
+MODEL_REGISTRY_DIR = os.getenv("FRAUD_MODEL_REGISTRY_DIR", os.path.join(BASE_DIR, "fraud_models"))
+MODEL_RELOAD_SECONDS = float(os.getenv("FRAUD_MODEL_RELOAD_SECONDS", "30"))
+
+# ✅ Feature encoding shared by training and scoring
+PAYMENT_METHOD_CODES = {"card": 0, "upi": 1, "netbanking": 2}
+
+# The model was fitted on a DataFrame; scoring passes plain arrays on purpose
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
 
 
 def train_fraud_detection_model():
     """
     Train a simple fraud detection model and save it.
     """
+    import pandas as pd
+    import joblib
+    from sklearn.ensemble import RandomForestClassifier
+
     # Sample training data (Replace this with real data)
     data = {
         "amount": [100, 5000, 12000, 200, 7500, 30000],
@@ -36,8 +51,9 @@ def train_fraud_detection_model():
 
 def load_fraud_detection_model():
     """
-    Load trained fraud detection model.
+    Load trained fraud detection model (sklearn pickle).
     """
+    import joblib
     try:
         model = joblib.load(MODEL_PATH)
         return model
@@ -46,19 +62,97 @@ def load_fraud_detection_model():
         train_fraud_detection_model()
         return joblib.load(MODEL_PATH)
 
-# ✅ Load the Model
-fraud_model = load_fraud_detection_model()
+_fraud_model = None
+_model_dir = None
+_next_check = 0.0
+_model_lock = threading.Lock()
+
+
+def resolve_model_dir():
+    """Published version from the registry, else the bundled compiled model, else None."""
+    from services.fraud_training import current_version_dir
+
+    published = current_version_dir(MODEL_REGISTRY_DIR)
+    if published is not None:
+        return published
+    if os.path.exists(os.path.join(COMPILED_MODEL_DIR, "metadata.json")):
+        return COMPILED_MODEL_DIR
+    return None
+
+
+def get_fraud_model():
+    """
+    Model used on the request path, loaded on first use.
+    Prefers the compiled array model (numpy only, memory-mapped); falls back to
+    the sklearn pickle when `scripts/export_fraud_model.py` has not been run.
+    When the training pipeline publishes a new version the reference is swapped
+    in place; in-flight batches finish on the model they started with.
+    """
+    global _fraud_model, _model_dir, _next_check
+    now = time.monotonic()
+    if _fraud_model is None or now >= _next_check:
+        with _model_lock:
+            if _fraud_model is None or now >= _next_check:
+                _next_check = now + MODEL_RELOAD_SECONDS
+                model_dir = resolve_model_dir()
+                if _fraud_model is not None and model_dir == _model_dir:
+                    return _fraud_model
+                if model_dir is not None:
+                    _fraud_model = CompiledForest.load(model_dir)
+                    print(f"✅ Fraud model loaded from {model_dir}")
+                else:
+                    print("🚨 Compiled fraud model not found, loading sklearn pickle. Run scripts/export_fraud_model.py")
+                    _fraud_model = load_fraud_detection_model()
+                _model_dir = model_dir
+    return _fraud_model
+
+
+def set_fraud_model(model):
+    """Pin a model (tests, benchmarks); None reloads from disk on next use."""
+    global _fraud_model, _model_dir, _next_check
+    _fraud_model = model
+    _model_dir = None
+    _next_check = float("inf") if model is not None else 0.0
+
+
+def encode_payment_method(payment_method):
+    """Accept the numeric code used in training or the API's method name."""
+    if isinstance(payment_method, (int, float)):
+        return payment_method
+    return PAYMENT_METHOD_CODES.get(str(payment_method).strip().lower().replace(" ", ""), -1)
+
+
+def build_features(transactions):
+    """(n, 2) float matrix of [amount, payment_method] for a batch of transactions."""
+    count = len(transactions)
+    features = np.empty((count, 2), dtype=np.float64)
+    features[:, 0] = np.fromiter((t["amount"] for t in transactions), dtype=np.float64, count=count)
+    features[:, 1] = np.fromiter((encode_payment_method(t["payment_method"]) for t in transactions), dtype=np.float64, count=count)
+    return features
+
+
+def score_batch(transactions):
+    """
+    Fraud probability for every transaction in one vectorized model call.
+    :param transactions: List of dictionaries with "amount" and "payment_method".
+    :return: numpy array of probabilities in [0, 1]
+    """
+    if not transactions:
+        return np.empty(0)
+    model = get_fraud_model()
+    probabilities = model.predict_proba(build_features(transactions))
+    fraud_column = list(model.classes_).index(1)
+    return probabilities[:, fraud_column]
+
 
-def detect_fraud(transaction_data):
+def detect_fraud(transaction_data, threshold=0.5):
     """
     Predict whether a transaction is fraudulent.
     :param transaction_data: Dictionary with "amount" and "payment_method".
     :return: True (fraud) or False (legitimate)
     """
     try:
-        features = np.array([[transaction_data["amount"], transaction_data["payment_method"]]])
-        prediction = fraud_model.predict(features)
-        return bool(prediction[0])
+        return bool(score_batch([transaction_data])[0] >= threshold)
     except Exception as e:
         print(f"🚨 Error detecting fraud: {str(e)}")
         return False
@@ -0,0 +1,38 @@
+import asyncio
+import random
+from config import settings
+from models.transaction import transactions_repository
+from services.pq_signatures import get_record_signer
+from services.kem_sessions import get_session_manager
+from services.workers import run_io
+
+
+async def simulate_settlement(min_seconds=None, max_seconds=None):
+    """
+    Awaitable stand-in for the bank/network settlement round trip.
+    Returns the simulated processing time in seconds.
+    """
+    if min_seconds is None:
+        min_seconds = settings.SETTLEMENT_MIN_SECONDS
+    if max_seconds is None:
+        max_seconds = settings.SETTLEMENT_MAX_SECONDS
+
+    processing_time = round(random.uniform(min_seconds, max_seconds), 2)
+    await asyncio.sleep(processing_time)
+    return processing_time
+
+
+async def encrypt_payment_details(amount, payment_method, party_id=None):
+    """
+    Encrypts the payment summary under the party's hybrid-KEM session key
+    (client identifier or merchant bank code; the platform session otherwise).
+    The KEM only runs when a session rotates; the session store is hit then too.
+    """
+    manager = get_session_manager()
+    return await run_io(manager.encrypt, party_id or manager.platform_party, f"{amount} INR via {payment_method}")
+
+
+async def record_transaction(transaction_record):
+    """Sign and persist a transaction document without blocking the event loop."""
+    transaction_record.update(get_record_signer().sign_record(transaction_record))
+    return await run_io(transactions_repository.save, transaction_record)
@@ -0,0 +1,166 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from config.settings import PQ_SIGNATURE_ALGORITHM, PQ_KEY_DIR, PQ_VERIFY_CHUNK_SIZE
+from services.workers import run_cpu
+
+logger = logging.getLogger("pq_signatures")
+
+try:
+    import oqs
+except ImportError:  # liboqs not installed: fall back to a classical stand-in
+    oqs = None
+
+FALLBACK_ALGORITHM = "Ed25519"
+SIGNATURE_FIELDS = ("pq_signature", "pq_algorithm", "pq_key_id")
+
+
+# ✅ Canonical bytes of a record (stable across a MongoDB round trip)
+
+def _canonical(value):
+    if isinstance(value, datetime):
+        # BSON keeps milliseconds only
+        return value.replace(microsecond=value.microsecond // 1000 * 1000).isoformat()
+    if isinstance(value, dict):
+        return {k: _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return value
+
+
+def record_payload(record: dict) -> bytes:
+    body = {k: v for k, v in record.items() if k != "_id" and k not in SIGNATURE_FIELDS}
+    return json.dumps(_canonical(body), sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+# ✅ Algorithm backends
+
+def _load_signing_key(algorithm, secret_key):
+    """Long-lived object with .sign(message), created once per process."""
+    if algorithm == FALLBACK_ALGORITHM:
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        return Ed25519PrivateKey.from_private_bytes(secret_key)
+    return oqs.Signature(algorithm, secret_key)
+
+
+@lru_cache(maxsize=8)
+def _verifier(algorithm, public_key):
+    """Reusable verification object per process and key."""
+    if algorithm == FALLBACK_ALGORITHM:
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+        return Ed25519PublicKey.from_public_bytes(public_key)
+    return oqs.Signature(algorithm)
+
+
+def _verify_chunk(algorithm, public_key, key_id, records):
+    """
+    Runs in a worker process (canonical encoding included): [record] -> [bool].
+    Records signed by another key or algorithm fail.
+    """
+    verifier = _verifier(algorithm, public_key)
+    results = []
+    for record in records:
+        if record.get("pq_key_id") != key_id or record.get("pq_algorithm") != algorithm:
+            results.append(False)
+            continue
+        message, signature = record_payload(record), base64.b64decode(record["pq_signature"])
+        if algorithm == FALLBACK_ALGORITHM:
+            from cryptography.exceptions import InvalidSignature
+            try:
+                verifier.verify(signature, message)
+                results.append(True)
+            except InvalidSignature:
+                results.append(False)
+        else:
+            results.append(verifier.verify(message, signature, public_key))
+    return results
+
+
+def _generate_keypair(algorithm):
+    if algorithm == FALLBACK_ALGORITHM:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+        private = Ed25519PrivateKey.generate()
+        secret = private.private_bytes(serialization.Encoding.Raw, serialization.PrivateFormat.Raw, serialization.NoEncryption())
+        public = private.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        return public, secret
+    with oqs.Signature(algorithm) as signer:
+        public = signer.generate_keypair()
+        return public, signer.export_secret_key()
+
+
+class RecordSigner:
+    """
+    Long-lived signing key, loaded from `key_dir` or created there on first use
+    (secret key file is 0600). Dilithium via liboqs when available, otherwise
+    Ed25519 so the pipeline and storage format still work locally.
+    """
+
+    def __init__(self, key_dir=PQ_KEY_DIR, algorithm=PQ_SIGNATURE_ALGORITHM):
+        self.algorithm = algorithm if oqs is not None else FALLBACK_ALGORITHM
+        if oqs is None and algorithm != FALLBACK_ALGORITHM:
+            logger.warning(f"⚠️ liboqs not installed, signing with {FALLBACK_ALGORITHM} instead of {algorithm}")
+        self.public_key, self.secret_key = self._load_or_create(key_dir)
+        self.key_id = hashlib.sha256(self.public_key).hexdigest()[:16]
+        self._signing_key = _load_signing_key(self.algorithm, self.secret_key)
+
+    def _load_or_create(self, key_dir):
+        public_path = os.path.join(key_dir, f"{self.algorithm}.pub")
+        secret_path = os.path.join(key_dir, f"{self.algorithm}.key")
+        if os.path.exists(secret_path):
+            with open(public_path, "rb") as f, open(secret_path, "rb") as g:
+                return f.read(), g.read()
+
+        public, secret = _generate_keypair(self.algorithm)
+        os.makedirs(key_dir, exist_ok=True)
+        with open(public_path, "wb") as f:
+            f.write(public)
+        fd = os.open(secret_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(secret)
+        print(f"✅ Created {self.algorithm} signing key {hashlib.sha256(public).hexdigest()[:16]} in {key_dir}")
+        return public, secret
+
+    def sign(self, message: bytes) -> bytes:
+        return self._signing_key.sign(message)
+
+    def sign_record(self, record: dict) -> dict:
+        """Signature fields to store alongside the record."""
+        return {
+            "pq_signature": base64.b64encode(self.sign(record_payload(record))).decode(),
+            "pq_algorithm": self.algorithm,
+            "pq_key_id": self.key_id,
+        }
+
+    def verify_record(self, record: dict) -> bool:
+        return _verify_chunk(self.algorithm, self.public_key, self.key_id, [record])[0]
+
+    async def verify_records(self, records, chunk_size=PQ_VERIFY_CHUNK_SIZE):
+        """Bulk verification, spread over the CPU process pool in chunks."""
+        results = await asyncio.gather(*[
+            run_cpu(_verify_chunk, self.algorithm, self.public_key, self.key_id, records[i:i + chunk_size])
+            for i in range(0, len(records), chunk_size)
+        ])
+        return [ok for chunk in results for ok in chunk]
+
+
+_signer = None
+_signer_lock = threading.Lock()
+
+
+def get_record_signer():
+    """Process-wide signer; keys are loaded (or generated) once."""
+    global _signer
+    if _signer is None:
+        with _signer_lock:
+            if _signer is None:
+                _signer = RecordSigner()
+    return _signer
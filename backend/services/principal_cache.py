@@ -0,0 +1,46 @@
+import hashlib
+import time
+from config.settings import PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS
+from monitoring.prometheus_metrics import PRINCIPAL_CACHE_REQUESTS
+from services.cache import TTLCache
+from models.user import users_repository
+
+# ✅ token id -> (user generation, principal)
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+# ✅ Bumped whenever a user document changes; older cache entries stop matching
+_generations = {}
+
+
+def token_id(payload: dict, token: str) -> str:
+    """The JWT `jti`, or a fingerprint of the token for tokens issued before jti existed."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_principal(key: str):
+    entry = principal_cache.get(key)
+    if entry is not None and entry[0] == _generations.get(entry[1]["identifier"], 0):
+        PRINCIPAL_CACHE_REQUESTS.labels("hit").inc()
+        return dict(entry[1])
+    PRINCIPAL_CACHE_REQUESTS.labels("miss").inc()
+    return None
+
+
+def put_principal(key: str, principal: dict, expires_at=None):
+    """Cache a principal no longer than the token itself is valid."""
+    ttl = PRINCIPAL_CACHE_TTL_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, float(expires_at) - time.time())
+    generation = _generations.get(principal["identifier"], 0)
+    principal_cache.set(key, (generation, dict(principal)), ttl)
+
+
+def invalidate_user(*identifiers):
+    """Drop every cached principal for these identifiers (email and/or mobile number)."""
+    for identifier in identifiers:
+        if identifier:
+            _generations[identifier] = _generations.get(identifier, 0) + 1
+
+
+# ✅ Any write through the user repository invalidates that user's principals
+users_repository.add_update_listener(invalidate_user)
@@ -0,0 +1,152 @@
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from config.settings import (
+    QKD_KEY_BYTES,
+    QKD_POOL_LOW_WATER,
+    QKD_POOL_HIGH_WATER,
+    QKD_REFILL_BATCH,
+    QKD_POOL_WAIT_SECONDS,
+    QKD_KEY_CACHE_SIZE,
+    QKD_KEY_WRAP_PASSWORD,
+)
+from models.qkd_key import qkd_keys_repository
+from monitoring.prometheus_metrics import QKD_POOL_SIZE, QKD_POOL_WAITS
+from quantum_simulation.bb84_simulation import generate_qkd_keys
+from quantum_simulation.key_management import get_wrap_key
+from services.cache import TTLCache
+
+logger = logging.getLogger("qkd_key_pool")
+
+
+class KeyPoolExhausted(RuntimeError):
+    pass
+
+
+class QkdKeyPool:
+    """
+    Bounded pool of pre-generated BB84 keys.
+
+    A background thread refills the pool up to `high_water` whenever it drops
+    below `low_water`, simulating keys in vectorized batches. Every key is
+    persisted (wrapped) before it can be handed out, so `lookup` can always
+    resolve a key id found next to a ciphertext, including after a restart.
+    Pooled-but-unused keys are not reloaded on restart; keys are never reused.
+    """
+
+    def __init__(self, repository=qkd_keys_repository, key_bytes=QKD_KEY_BYTES, low_water=QKD_POOL_LOW_WATER,
+                 high_water=QKD_POOL_HIGH_WATER, batch_size=QKD_REFILL_BATCH, wait_seconds=QKD_POOL_WAIT_SECONDS,
+                 cache_size=QKD_KEY_CACHE_SIZE, wrap_password=QKD_KEY_WRAP_PASSWORD):
+        self.repository = repository
+        self.key_bytes = key_bytes
+        self.low_water = low_water
+        self.high_water = high_water
+        self.batch_size = batch_size
+        self.wait_seconds = wait_seconds
+        self.wrap_password = wrap_password
+        self.index = TTLCache(cache_size, ttl=float("inf"))
+        self._pool = deque()
+        self._ready = threading.Condition()
+        self._refill = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    # ✅ Background refill
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="qkd-key-pool", daemon=True)
+            self._thread.start()
+        self._refill.set()
+
+    def stop(self, timeout=5):
+        self._stopped.set()
+        self._refill.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._refill.wait()
+            self._refill.clear()
+            try:
+                while not self._stopped.is_set() and len(self._pool) < self.high_water:
+                    self.fill(min(self.batch_size, self.high_water - len(self._pool)))
+            except Exception as e:
+                logger.error(f"🚨 QKD key pool refill failed: {e}")
+                self._stopped.wait(1)
+                self._refill.set()
+
+    def fill(self, count):
+        """Generates, persists and pools `count` keys (blocking)."""
+        keys = generate_qkd_keys(count, key_bytes=self.key_bytes)
+        entries = [(uuid.uuid4().hex, key) for key in keys]
+        self.repository.save_wrapped(self._wrap(key_id, key) for key_id, key in entries)
+        for key_id, key in entries:
+            self.index.set(key_id, key)
+        with self._ready:
+            self._pool.extend(entries)
+            self._ready.notify_all()
+        QKD_POOL_SIZE.set(len(self._pool))
+
+    # ✅ Request path: no simulation, only a pop
+
+    def take(self):
+        """(key_id, key) for one encryption. Waits for a refill if the pool is empty."""
+        try:
+            entry = self._pool.popleft()
+        except IndexError:
+            QKD_POOL_WAITS.inc()
+            if self._thread is None:
+                self.start()
+            self._refill.set()
+            with self._ready:
+                if not self._ready.wait_for(lambda: self._pool, timeout=self.wait_seconds):
+                    raise KeyPoolExhausted("QKD key pool is empty")
+                entry = self._pool.popleft()
+        if len(self._pool) < self.low_water:
+            self._refill.set()
+        QKD_POOL_SIZE.set(len(self._pool))
+        return entry
+
+    def lookup(self, key_id):
+        """Key for a stored ciphertext: in-memory index first, then the persistent store."""
+        key = self.index.get(key_id)
+        if key is None:
+            document = self.repository.find_wrapped(key_id)
+            if document is None:
+                raise KeyError(f"Unknown QKD key id: {key_id}")
+            key = self._unwrap(key_id, document["nonce"], document["wrapped_key"])
+            self.index.set(key_id, key)
+        return key
+
+    def __len__(self):
+        return len(self._pool)
+
+    # ✅ Key wrapping (AES-GCM under the master-derived wrap key, key id as AAD)
+
+    def _wrap(self, key_id, key):
+        nonce = os.urandom(12)
+        return key_id, nonce, AESGCM(get_wrap_key(self.wrap_password)).encrypt(nonce, key, key_id.encode())
+
+    def _unwrap(self, key_id, nonce, wrapped):
+        return AESGCM(get_wrap_key(self.wrap_password)).decrypt(nonce, wrapped, key_id.encode())
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_key_pool():
+    """Process-wide key pool (created on first use; `start()` launches the refill thread)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = QkdKeyPool()
+    return _pool
@@ -1,32 +1,36 @@
-from quantum_simulation.bb84_simulation import bb84_key_exchange
+from services.qkd_key_pool import get_key_pool
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 import os
 
-# ✅ Quantum Secure AES Encryption
+# ✅ Quantum Secure AES Encryption (key taken from the pre-generated QKD pool)
 def encrypt_transaction(data):
-    key = bb84_key_exchange()[:16].encode()  # Use first 16 chars for AES key
+    key_id, key = get_key_pool().take()
     iv = os.urandom(16)  # Random IV for AES-GCM
 
     cipher = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend())
     encryptor = cipher.encryptor()
+    encryptor.authenticate_additional_data(key_id.encode())
     ciphertext = encryptor.update(data.encode()) + encryptor.finalize()
 
     return {
+        "key_id": key_id,
         "ciphertext": ciphertext.hex(),
         "iv": iv.hex(),
         "tag": encryptor.tag.hex()
     }
 
-# ✅ Quantum Secure AES Decryption
+# ✅ Quantum Secure AES Decryption (same key, looked up by the id stored with the ciphertext)
 def decrypt_transaction(encrypted_data):
-    key = bb84_key_exchange()[:16].encode()
+    key_id = encrypted_data["key_id"]
+    key = get_key_pool().lookup(key_id)
     iv = bytes.fromhex(encrypted_data["iv"])
     tag = bytes.fromhex(encrypted_data["tag"])
     ciphertext = bytes.fromhex(encrypted_data["ciphertext"])
 
     cipher = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=default_backend())
     decryptor = cipher.decryptor()
+    decryptor.authenticate_additional_data(key_id.encode())
     decrypted_data = decryptor.update(ciphertext) + decryptor.finalize()
 
     return decrypted_data.decode()
@@ -0,0 +1,139 @@
+import io
+import os
+import struct
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from config.settings import STREAM_CHUNK_SIZE
+
+# ✅ Chunked AEAD framing (STREAM construction)
+#
+#   header  = MAGIC | chunk_size (u32) | nonce prefix (7 B) | len(key_id) (u8) | key_id
+#   chunk i = AES-GCM(key, nonce = prefix | i (u32) | last (u8), aad = header)
+#
+# Every chunk holds exactly `chunk_size` plaintext bytes except the last, which is
+# shorter (possibly empty) and flagged, so truncation, reordering and splicing
+# between streams all fail authentication. Memory use is one chunk at a time.
+MAGIC = b"SPS1"
+NONCE_PREFIX_SIZE = 7
+TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = STREAM_CHUNK_SIZE
+MAX_CHUNKS = 2 ** 32
+
+
+class StreamError(ValueError):
+    pass
+
+
+def _nonce(prefix, index, last):
+    if index >= MAX_CHUNKS:
+        raise StreamError("Stream too long for a 32-bit chunk counter")
+    return prefix + struct.pack(">IB", index, 1 if last else 0)
+
+
+def _header(chunk_size, prefix, key_id):
+    key_id = key_id.encode() if isinstance(key_id, str) else key_id
+    if len(key_id) > 255:
+        raise StreamError("key_id longer than 255 bytes")
+    return MAGIC + struct.pack(">I", chunk_size) + prefix + bytes([len(key_id)]) + key_id
+
+
+def encrypt_stream(key, reader, chunk_size=DEFAULT_CHUNK_SIZE, key_id=b""):
+    """
+    Generator of encrypted frames (header first) for a binary file-like object.
+    Reads with `readinto` into one reused buffer, so plaintext is never copied
+    into intermediate strings.
+    """
+    aead = AESGCM(key)
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    header = _header(chunk_size, prefix, key_id)
+    yield header
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    index = 0
+    while True:
+        filled = _read_full(reader, view)
+        last = filled < chunk_size
+        yield aead.encrypt(_nonce(prefix, index, last), view[:filled], header)
+        if last:
+            return
+        index += 1
+
+
+def encrypt_buffer(key, data, chunk_size=DEFAULT_CHUNK_SIZE, key_id=b""):
+    """Same framing for an in-memory bytes/bytearray/memoryview (sliced, not copied)."""
+    view = memoryview(data).cast("B")
+    aead = AESGCM(key)
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+    header = _header(chunk_size, prefix, key_id)
+    yield header
+
+    index = 0
+    for start in range(0, len(view) + 1, chunk_size):
+        chunk = view[start:start + chunk_size]
+        last = len(chunk) < chunk_size
+        yield aead.encrypt(_nonce(prefix, index, last), chunk, header)
+        if last:
+            return
+        index += 1
+
+
+def read_header(reader):
+    """(header bytes, chunk_size, nonce prefix, key_id) from the start of a stream."""
+    fixed = _read_exact(reader, len(MAGIC) + 4 + NONCE_PREFIX_SIZE + 1)
+    if fixed[:len(MAGIC)] != MAGIC:
+        raise StreamError("Not an encrypted stream (bad magic)")
+    chunk_size = struct.unpack(">I", fixed[4:8])[0]
+    prefix = fixed[8:8 + NONCE_PREFIX_SIZE]
+    key_id = _read_exact(reader, fixed[-1])
+    return fixed + key_id, chunk_size, prefix, key_id
+
+
+def decrypt_stream(key, reader, header=None):
+    """
+    Generator of plaintext chunks. Raises StreamError on any tampering,
+    truncation or trailing data; chunks yielded before that were authentic.
+    :param header: Result of `read_header` if the caller already consumed it (e.g. to pick the key)
+    """
+    header_bytes, chunk_size, prefix, _ = header or read_header(reader)
+    aead = AESGCM(key)
+    frame = bytearray(chunk_size + TAG_SIZE)
+    view = memoryview(frame)
+    index = 0
+    while True:
+        filled = _read_full(reader, view)
+        last = filled < len(frame)
+        if filled < TAG_SIZE:
+            raise StreamError("Truncated stream")
+        try:
+            yield aead.decrypt(_nonce(prefix, index, last), view[:filled], header_bytes)
+        except InvalidTag:
+            raise StreamError(f"Chunk {index} failed authentication")
+        if last:
+            if reader.read(1):
+                raise StreamError("Trailing data after final chunk")
+            return
+        index += 1
+
+
+def decrypt_buffer(key, data):
+    """Whole-message convenience wrapper around `decrypt_stream`."""
+    return b"".join(decrypt_stream(key, io.BytesIO(data)))
+
+
+def _read_full(reader, view):
+    """Fill `view` unless EOF comes first; returns bytes read."""
+    filled = 0
+    while filled < len(view):
+        n = reader.readinto(view[filled:])
+        if not n:
+            break
+        filled += n
+    return filled
+
+
+def _read_exact(reader, size):
+    data = reader.read(size)
+    if len(data) != size:
+        raise StreamError("Truncated stream header")
+    return data
@@ -0,0 +1,62 @@
+import base64
+import io
+import json
+from config.settings import EXPORT_BATCH_SIZE
+from models.transaction import transactions_repository
+from services.kem_sessions import get_session_manager
+from services.stream_encryption import encrypt_stream, decrypt_stream, read_header
+
+
+class IterReader(io.RawIOBase):
+    """Read-only file object over an iterator of byte strings (keeps one pending piece)."""
+
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+        self._pending = memoryview(b"")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            piece = next(self._pieces, None)
+            if piece is None:
+                return 0
+            self._pending = memoryview(piece)
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+def _json_default(value):
+    if isinstance(value, bytes):  # binary envelopes
+        return base64.b64encode(value).decode()
+    return str(value)
+
+
+def iter_transaction_lines(user_identifier, batch_size=EXPORT_BATCH_SIZE, repository=transactions_repository):
+    """A user's transactions, newest first, as JSON lines straight off the cursor."""
+    cursor = repository.find({"user_identifier": user_identifier}).sort("timestamp", -1).batch_size(batch_size)
+    for document in cursor:
+        document["_id"] = str(document["_id"])
+        yield json.dumps(document, default=_json_default, separators=(",", ":")).encode() + b"\n"
+
+
+def export_transactions(user_identifier, manager=None):
+    """
+    (key_id, encrypted frames) for a user's transaction history. Frames are
+    produced lazily, so memory stays at one cursor batch plus one chunk.
+    The stream is sealed under the user's KEM session key; the key id is in the header.
+    """
+    manager = manager or get_session_manager()
+    session = manager.session_for(user_identifier)
+    reader = IterReader(iter_transaction_lines(user_identifier))
+    return session.key_id, encrypt_stream(session.key, reader, key_id=session.key_id)
+
+
+def open_export(reader, manager=None):
+    """Plaintext chunks of an export, resolving the session key from the stream header."""
+    manager = manager or get_session_manager()
+    header = read_header(reader)
+    return decrypt_stream(manager.key_for(header[3].decode()), reader, header=header)
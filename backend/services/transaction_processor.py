@@ -1,10 +1,10 @@
-from api.payment_gateway import store_transaction_on_blockchain
+from api.payment_gateway import anchor_transaction
 from services.ml_fraud_detection import detect_fraud
-from services.encryption import encrypt_data
+from services.payment_pipeline import encrypt_payment_details, record_transaction
+from quantum_simulation.envelope import to_text
 from datetime import datetime
-from models.database import transactions_collection
 
-def process_transaction(user_email, amount, payment_method):
+async def process_transaction(user_email, amount, payment_method):
     """
     Processes a secure transaction with fraud detection, encryption, and blockchain.
 
@@ -25,11 +25,11 @@ def process_transaction(user_email, amount, payment_method):
     if is_fraud:
         return {"status": "Failed", "reason": "Fraudulent transaction detected"}
 
-    # ✅ Encrypt Transaction Data
-    encrypted_data, nonce, key = encrypt_data(f"{amount} INR via {payment_method}")
+    # ✅ Encrypt Transaction Data (per-user hybrid KEM session)
+    encrypted_data = await encrypt_payment_details(amount, payment_method, user_email)
 
-    # ✅ Store Transaction on Blockchain
-    blockchain_tx = store_transaction_on_blockchain(int(amount), payment_method, "Success")
+    # ✅ Anchor Transaction on Blockchain (batched Merkle root)
+    anchor = await anchor_transaction(amount, payment_method, "Success")
 
     # ✅ Save transaction in MongoDB
     transaction = {
@@ -38,13 +38,17 @@ def process_transaction(user_email, amount, payment_method):
         "payment_method": payment_method,
         "status": "Success",
         "timestamp": datetime.utcnow(),
-        "transaction_id": blockchain_tx,
+        "transaction_id": anchor["leaf"],
+        "batch_id": anchor["batch_id"],
+        "merkle_proof": anchor["merkle_proof"],
         "encrypted_data": encrypted_data,
     }
-    transactions_collection.insert_one(transaction)
+    await record_transaction(transaction)
 
     return {
         "message": "Transaction processed securely",
-        "transaction_id": blockchain_tx,
-        "encrypted_data": encrypted_data
+        "transaction_id": anchor["leaf"],
+        "batch_id": anchor["batch_id"],
+        "merkle_proof": anchor["merkle_proof"],
+        "encrypted_data": to_text(encrypted_data)
     }
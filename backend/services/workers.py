@@ -0,0 +1,50 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from config.settings import IO_WORKERS, CPU_WORKERS
+
+# ✅ Lazily created executors (one pair per worker process)
+_io_executor = None
+_cpu_executor = None
+
+
+def get_io_executor():
+    """Thread pool for blocking I/O (pymongo, web3, SMS providers)."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="io-worker")
+    return _io_executor
+
+
+def get_cpu_executor():
+    """Process pool for CPU-bound work such as key derivation."""
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ProcessPoolExecutor(max_workers=CPU_WORKERS)
+    return _cpu_executor
+
+
+async def run_io(func, *args, **kwargs):
+    """Run a blocking call on the I/O pool without stalling the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), partial(func, *args, **kwargs))
+
+
+async def run_cpu(func, *args, **kwargs):
+    """
+    Run a CPU-bound call on the process pool.
+    `func` and its arguments must be picklable (module-level functions only).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_workers():
+    """Stop both pools; called on application shutdown."""
+    global _io_executor, _cpu_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=True)
+        _io_executor = None
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=True)
+        _cpu_executor = None
@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+
+# ✅ Make backend packages (api, services, models, ...) importable as in `uvicorn main:app`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# ✅ Signing keys generated during tests stay out of the source tree
+os.environ.setdefault("PQ_KEY_DIR", tempfile.mkdtemp(prefix="pq-keys-"))
+
+import pytest
+
+
+@pytest.fixture
+def mongo():
+    """Point the shared data-access layer at an in-memory mongomock client."""
+    mongomock = pytest.importorskip("mongomock")
+    from models import database
+
+    client = mongomock.MongoClient()
+    database.set_client(client)
+    yield database.get_db()
+    database.set_client(None)
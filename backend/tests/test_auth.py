@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("mongomock")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from api.auth import router as auth_router
+from models.migrations import ensure_indexes
+from models.user import users_repository, identifier_field
+
+
+@pytest.fixture
+def client(mongo):
+    ensure_indexes()
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/auth")
+    return TestClient(app)
+
+
+def register(client, **overrides):
+    payload = {"name": "Asha", "email": "asha@example.com", "mobile_number": "9876543210", "password": "secret123"}
+    payload.update(overrides)
+    return client.post("/auth/register", json=payload)
+
+
+def test_identifier_routes_to_a_single_field():
+    assert identifier_field("asha@example.com") == "email"
+    assert identifier_field("9876543210") == "mobile_number"
+
+
+def test_duplicate_email_or_mobile_is_rejected_by_unique_index(client):
+    assert register(client).status_code == 200
+    assert register(client, mobile_number="9123456789").status_code == 400
+    assert register(client, email="other@example.com").status_code == 400
+    assert users_repository.count_documents({}) == 1
+
+
+def test_lookup_by_either_identifier(client):
+    register(client)
+
+    assert users_repository.find_by_identifier("asha@example.com")["mobile_number"] == "9876543210"
+    assert users_repository.find_by_identifier("9876543210")["email"] == "asha@example.com"
+
+
+@pytest.fixture
+def protected_client(client, monkeypatch):
+    from fastapi import Depends
+    from api.auth import get_current_user
+    from services.principal_cache import principal_cache
+
+    principal_cache.clear()
+    lookups = []
+    original = users_repository.find_by_identifier
+
+    def counting_lookup(identifier):
+        lookups.append(identifier)
+        return original(identifier)
+
+    monkeypatch.setattr(users_repository, "find_by_identifier", counting_lookup)
+
+    @client.app.get("/me")
+    async def me(current_user: dict = Depends(get_current_user)):
+        return current_user
+
+    return client, lookups
+
+
+def test_principal_cache_skips_database_after_first_request(protected_client):
+    from api.auth import create_access_token
+    client, lookups = protected_client
+    register(client)
+    headers = {"Authorization": f"Bearer {create_access_token('asha@example.com')}"}
+
+    for _ in range(5):
+        response = client.get("/me", headers=headers)
+        assert response.json()["mobile_number"] == "9876543210"
+
+    assert len(lookups) == 1
+
+
+def test_user_update_invalidates_cached_principal(protected_client):
+    from api.auth import create_access_token
+    client, lookups = protected_client
+    register(client)
+    headers = {"Authorization": f"Bearer {create_access_token('9876543210')}"}
+
+    assert client.get("/me", headers=headers).json()["name"] == "Asha"
+    users_repository.update_by_identifier("asha@example.com", {"name": "Asha R"})
+
+    assert client.get("/me", headers=headers).json()["name"] == "Asha R"
+    assert len(lookups) == 2
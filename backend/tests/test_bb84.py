@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from quantum_simulation.bb84_simulation import simulate_bb84, generate_qkd_keys, bb84_key_exchange, toeplitz_hash
+
+
+def test_noiseless_channel_yields_identical_independent_keys():
+    batch = simulate_bb84(200, key_bytes=32, noise=0.0, rng=np.random.default_rng(1))
+
+    assert batch.alice_keys.shape == (200, 32) and batch.alice_keys.dtype == np.uint8
+    assert batch.accepted.all() and (batch.qber == 0).all()
+    assert (batch.alice_keys == batch.bob_keys).all()
+    assert len({row.tobytes() for row in batch.alice_keys}) == 200
+
+
+def test_noise_is_estimated_and_corrected():
+    batch = simulate_bb84(500, key_bytes=16, noise=0.03, rng=np.random.default_rng(2))
+
+    assert batch.qber.mean() == pytest.approx(0.03, abs=0.005)
+    assert batch.accepted.mean() > 0.9
+    assert (batch.alice_keys[batch.accepted] == batch.bob_keys[batch.accepted]).all()
+
+
+def test_intercept_resend_eavesdropper_aborts_the_exchange():
+    batch = simulate_bb84(200, key_bytes=16, noise=0.0, eavesdrop=1.0, rng=np.random.default_rng(3))
+
+    assert batch.qber.mean() == pytest.approx(0.25, abs=0.02)
+    assert not batch.accepted.any()
+    with pytest.raises(RuntimeError):
+        generate_qkd_keys(1, key_bytes=16, eavesdrop=1.0, max_rounds=2)
+
+
+def test_toeplitz_hash_is_linear_over_gf2():
+    rng = np.random.default_rng(4)
+    x, y = rng.integers(0, 2, (2, 300), dtype=np.uint8)
+    seed = rng.integers(0, 2, 300 + 64 - 1, dtype=np.uint8)
+
+    assert ((toeplitz_hash(x[None], 64, seed) ^ toeplitz_hash(y[None], 64, seed)) == toeplitz_hash((x ^ y)[None], 64, seed)).all()
+
+
+def test_wrappers_return_bytes_and_bit_strings():
+    keys = generate_qkd_keys(3, key_bytes=16)
+
+    assert [len(k) for k in keys] == [16, 16, 16] and all(isinstance(k, bytes) for k in keys)
+    assert set(bb84_key_exchange()) <= {"0", "1"} and len(bb84_key_exchange()) == 128
@@ -0,0 +1,28 @@
+import pytest
+
+pytest.importorskip("pymongo")
+
+from models import database
+from models.user import users_repository
+from models.cardholder import cardholders_repository
+
+
+def test_client_is_shared_and_lazy():
+    database.close_client()
+
+    first = database.get_client()
+    assert first is database.get_client()
+    database.close_client()
+
+
+def test_repositories_share_the_injected_client(mongo):
+    users_repository.create({"name": "A", "email": "a@x.com", "mobile_number": "9876543210"})
+    cardholders_repository.insert_one({"card_number": "4111111111111111", "mobile_number": "9876543210"})
+
+    assert users_repository.find_by_identifier("9876543210")["email"] == "a@x.com"
+    assert users_repository.collection.database is cardholders_repository.collection.database
+    assert mongo["users"].count_documents({}) == 1
+
+
+def test_health_probe_reports_up(mongo):
+    assert database.ping()["status"] == "up"
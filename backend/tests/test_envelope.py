@@ -0,0 +1,86 @@
+import base64
+import os
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("bson")
+
+from quantum_simulation.envelope import encode_envelope, decode_envelope, from_legacy, is_envelope
+from quantum_simulation.quantum_encrypt import encrypt_message
+from quantum_simulation.quantum_decrypt import decrypt_message
+
+PASSWORD = "quantumSecureKey"
+
+
+def test_envelope_round_trip_and_legacy_conversion():
+    blob = encode_envelope(3, bytes(16), b"i" * 12, b"c" * 40)
+    envelope = decode_envelope(blob)
+
+    assert is_envelope(blob)
+    assert (envelope.version, envelope.key_id, envelope.iv) == (3, "00" * 16, b"i" * 12)
+    assert envelope.ciphertext == b"c" * 24 and envelope.tag == b"c" * 16
+
+    legacy = encrypt_message("1000 INR via upi", PASSWORD)
+    converted = from_legacy(legacy)
+    assert len(converted) < sum(len(str(v)) for v in legacy.values())
+    assert decrypt_message(converted, PASSWORD) == decrypt_message(legacy, PASSWORD) == b"1000 INR via upi"
+    assert decrypt_message(from_legacy(str(legacy)), PASSWORD) == b"1000 INR via upi"
+
+
+def test_truncated_envelope_is_rejected():
+    blob = encode_envelope(2, os.urandom(16), os.urandom(12), os.urandom(20))
+
+    with pytest.raises(ValueError):
+        decode_envelope(blob[:20])
+
+
+class _BulkResult:
+    def __init__(self, modified_count):
+        self.modified_count = modified_count
+
+
+def _record_batches(repository):
+    """mongomock cannot run pymongo's UpdateOne in bulk_write: apply each batch op by op, noting its size."""
+    batches = []
+
+    def bulk_write(ops, ordered=False):
+        batches.append(len(ops))
+        return _BulkResult(sum(repository.update_one(op._filter, op._doc).modified_count for op in ops))
+
+    repository.bulk_write = bulk_write
+    return batches
+
+
+def test_migration_rewrites_in_batches_and_keeps_signatures_valid(mongo):
+    from services.kem_sessions import SessionKeyManager
+    from services.pq_signatures import get_record_signer
+    from services.envelope_migration import migrate_envelopes, storage_report
+    from models.transaction import TransactionRepository
+
+    manager, signer = SessionKeyManager(), get_record_signer()
+    records = []
+    for i in range(25):
+        envelope = decode_envelope(manager.encrypt("client-1", f"{i} INR via card"))
+        legacy = {"version": 3, "key_id": envelope.key_id, "ciphertext": base64.b64encode(envelope.ciphertext).decode(),
+                  "iv": base64.b64encode(envelope.iv).decode(), "tag": base64.b64encode(envelope.tag).decode()}
+        record = {"user_identifier": "client-1", "n": i, "amount": float(i), "encrypted_data": legacy if i % 5 else str(legacy)}
+        if i < 20:
+            record.update(signer.sign_record(record))
+        records.append(record)
+    records[0]["amount"] = -1.0  # tampered after signing: must not be re-signed
+    mongo.transactions.insert_many(records)
+    transactions_repository = TransactionRepository()
+    batches = _record_batches(transactions_repository)
+    before = storage_report(transactions_repository)
+
+    stats = migrate_envelopes(transactions_repository, batch_size=7, signer=signer)
+
+    assert stats == {"matched": 25, "migrated": 25, "resigned": 19, "skipped": 0}
+    assert batches == [7, 7, 7, 4]
+    assert migrate_envelopes(transactions_repository, signer=signer)["matched"] == 0
+    assert storage_report(transactions_repository)["size"] < before["size"]
+    for document in mongo.transactions.find():
+        assert is_envelope(document["encrypted_data"])
+        assert manager.decrypt(document["encrypted_data"]) == f"{document['n']} INR via card".encode()
+        if "pq_signature" in document:
+            assert signer.verify_record(document) == (document["n"] != 0)
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+import pytest
+
+pytest.importorskip("pymongo")
+
+from services.feature_store import FeatureStore
+
+NOW = 1_700_000_000.0
+
+
+def txn(user="a@x.com", amount=100.0, at=NOW, **extra):
+    return {"user_email": user, "amount": amount, "timestamp": at, **extra}
+
+
+def test_rolling_counts_and_sums_expire_per_window():
+    store = FeatureStore()
+    store.update(txn(amount=10, at=NOW - 30))
+    store.update(txn(amount=20, at=NOW - 600))
+    store.update(txn(amount=40, at=NOW - 7200))
+
+    features = store.features("a@x.com", now=NOW)
+
+    assert (features["txn_count_1m"], features["txn_sum_1m"]) == (1, 10)
+    assert (features["txn_count_1h"], features["txn_sum_1h"]) == (2, 30)
+    assert (features["txn_count_24h"], features["txn_sum_24h"]) == (3, 70)
+    assert store.features("a@x.com", now=NOW + 2 * 86400)["txn_count_24h"] == 0
+
+
+def test_devices_ips_and_location_are_tracked_with_bounded_state():
+    store = FeatureStore(max_users=2, max_distinct=3)
+    for i in range(5):
+        store.update(txn(device=f"dev-{i}", ip_address="10.0.0.1", location="Mumbai"))
+
+    features = store.features("a@x.com", device="dev-0", ip_address="10.0.0.9", location="Delhi", now=NOW)
+    assert features["distinct_devices_24h"] == 3
+    assert features["distinct_ips_24h"] == 1
+    assert features["new_device"] and features["new_ip"] and features["location_changed"]
+    assert features["last_location"] == "Mumbai"
+
+    store.update(txn(user="b@x.com"))
+    store.update(txn(user="c@x.com"))
+    assert len(store) == 2
+    assert store.features("a@x.com", now=NOW)["txn_count_24h"] == 0
+
+
+def test_snapshot_and_restore_survive_a_restart(tmp_path):
+    path = str(tmp_path / "features.pkl")
+    store = FeatureStore()
+    store.update(txn(amount=50, at=datetime.fromtimestamp(NOW - 10, tz=timezone.utc).replace(tzinfo=None)))
+    store.snapshot(path)
+
+    restarted = FeatureStore()
+    assert restarted.restore(path) == 1
+    assert restarted.features("a@x.com", now=NOW)["txn_sum_1m"] == 50
+
+
+def test_every_saved_transaction_updates_the_store(mongo):
+    from services.feature_store import feature_store
+    from models.transaction import transactions_repository
+
+    transactions_repository.save({"user_identifier": "9876543210", "amount": 75.0, "timestamp": datetime.utcnow()})
+
+    assert feature_store.features("9876543210")["txn_sum_1m"] == 75.0
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("prometheus_client")
+
+from services import ml_fraud_detection
+from services.ml_fraud_detection import score_batch, detect_fraud, build_features, load_fraud_detection_model
+from services.fraud_scoring import MicroBatcher
+from services.forest_evaluator import CompiledForest, compile_forest, save_compiled_forest
+
+TRANSACTIONS = [
+    {"amount": 100, "payment_method": "card"},
+    {"amount": 30000, "payment_method": "netbanking"},
+    {"amount": 5000, "payment_method": "upi"},
+    {"amount": 250, "payment_method": 0},
+]
+
+
+def test_score_batch_matches_row_by_row_prediction():
+    fraud_model = load_fraud_detection_model()
+    probabilities = score_batch(TRANSACTIONS)
+
+    for transaction, probability in zip(TRANSACTIONS, probabilities):
+        expected = fraud_model.predict_proba(build_features([transaction]))[0, 1]
+        assert probability == pytest.approx(expected)
+        assert detect_fraud(transaction) == (probability >= 0.5)
+
+
+def test_method_names_are_encoded_like_training_data():
+    assert build_features([{"amount": 1, "payment_method": "UPI"}])[0, 1] == 1
+    assert build_features([{"amount": 1, "payment_method": "netbanking"}])[0, 1] == 2
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    calls = []
+
+    def fake_score_batch(transactions):
+        calls.append(len(transactions))
+        return [t["amount"] / 100000 for t in transactions]
+
+    batcher = MicroBatcher(fake_score_batch, max_batch_size=16, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*[batcher.score({"amount": i * 1000, "payment_method": "card"}) for i in range(40)])
+
+    results = asyncio.run(run())
+
+    assert results == [i * 1000 / 100000 for i in range(40)]
+    assert calls == [16, 16, 8]
+
+
+def test_compiled_forest_accuracy_parity(tmp_path):
+    """The memory-mapped numpy evaluator must reproduce sklearn's probabilities."""
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(7)
+    X = np.column_stack([rng.uniform(0, 50000, 2000), rng.integers(0, 3, 2000)])
+    y = ((X[:, 0] > 9000) ^ (rng.random(2000) < 0.1)).astype(int)
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+
+    save_compiled_forest(compile_forest(model), str(tmp_path))
+    compiled = CompiledForest.load(str(tmp_path))
+    X_test = np.column_stack([rng.uniform(0, 50000, 5000), rng.integers(0, 3, 5000)])
+
+    assert isinstance(compiled.feature, np.memmap)
+    np.testing.assert_allclose(compiled.predict_proba(X_test), model.predict_proba(X_test), atol=1e-12)
+    assert (compiled.predict_proba(X_test).argmax(axis=1) == model.predict(X_test)).all()
+
+
+def test_request_path_prefers_compiled_model(tmp_path, monkeypatch):
+    save_compiled_forest(compile_forest(load_fraud_detection_model()), str(tmp_path))
+    monkeypatch.setattr(ml_fraud_detection, "COMPILED_MODEL_DIR", str(tmp_path))
+    ml_fraud_detection.set_fraud_model(None)
+
+    try:
+        assert isinstance(ml_fraud_detection.get_fraud_model(), CompiledForest)
+        assert score_batch(TRANSACTIONS) == pytest.approx(load_fraud_detection_model().predict_proba(build_features(TRANSACTIONS))[:, 1])
+    finally:
+        ml_fraud_detection.set_fraud_model(None)
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import pytest
+
+pytest.importorskip("pymongo")
+pytest.importorskip("prometheus_client")
+
+from models.fraud_logs import fraud_logs_repository, build_fraud_log
+from services.fraud_log_writer import FraudLogWriter
+
+
+def test_queued_logs_are_written_in_unordered_batches(mongo):
+    batches = []
+    original = fraud_logs_repository.insert_many
+
+    class RecordingRepository:
+        def insert_many(self, documents, ordered=True):
+            batches.append((len(documents), ordered))
+            return original(documents, ordered=ordered)
+
+    writer = FraudLogWriter(RecordingRepository(), max_queue=100, batch_size=10)
+
+    async def run():
+        for i in range(25):
+            await writer.submit(build_fraud_log("a@x.com", {"amount": i}, "High transaction amount"))
+        await writer.close()
+
+    asyncio.run(run())
+
+    assert mongo.fraud_logs.count_documents({}) == 25
+    assert writer.written == 25
+    assert all(size <= 10 and not ordered for size, ordered in batches)
+    assert len(batches) < 25
+
+
+def test_full_queue_applies_backpressure(mongo):
+    release = threading.Event()
+
+    class SlowRepository:
+        def insert_many(self, documents, ordered=True):
+            release.wait(5)
+            return fraud_logs_repository.insert_many(documents, ordered=ordered)
+
+    writer = FraudLogWriter(SlowRepository(), max_queue=2, batch_size=1)
+
+    async def run():
+        for i in range(3):  # one in flight, two queued
+            await writer.submit({"n": i})
+        blocked = asyncio.ensure_future(writer.submit({"n": 3}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        release.set()
+        await blocked
+        await writer.close()
+
+    asyncio.run(run())
+
+    assert mongo.fraud_logs.count_documents({}) == 4
@@ -0,0 +1,90 @@
+import json
+import os
+import random
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from services.fraud_rules import CompiledRules, RuleEngine, RuleError
+
+OPS = {
+    "eq": lambda v, t: v == t,
+    "ne": lambda v, t: v != t,
+    "in": lambda v, t: v in t,
+    "not_in": lambda v, t: v not in t,
+    "gt": lambda v, t: v > t,
+    "gte": lambda v, t: v >= t,
+    "lt": lambda v, t: v < t,
+    "lte": lambda v, t: v <= t,
+}
+
+
+def naive(rules, txn):
+    def hit(c):
+        return c["field"] in txn and OPS[c["op"]](txn[c["field"]], c["value"])
+    return [r["id"] for r in rules if all(hit(c) for c in (r.get("all") or [r]))]
+
+
+def random_condition(rng):
+    op = rng.choice(list(OPS))
+    if op in ("in", "not_in"):
+        return {"field": "location", "op": op, "value": rng.sample(["IN", "US", "Iran", "Russia", "UK"], 2)}
+    if op in ("eq", "ne"):
+        return {"field": "device", "op": op, "value": rng.choice(["Unknown", "iPhone", "Pixel"])}
+    return {"field": rng.choice(["amount", "txn_count_1m"]), "op": op, "value": rng.choice([0, 1, 5, 100, 5000, 10000])}
+
+
+def test_compiled_rules_match_naive_evaluation():
+    rng = random.Random(3)
+    rules = []
+    for i in range(300):
+        if i % 3:
+            rules.append({"id": f"r{i}", **random_condition(rng)})
+        else:
+            rules.append({"id": f"r{i}", "all": [random_condition(rng) for _ in range(2)]})
+    compiled = CompiledRules(rules)
+
+    for _ in range(500):
+        txn = {
+            "amount": rng.choice([0, 1, 5, 99, 100, 101, 5000, 10000, 20000]),
+            "txn_count_1m": rng.randint(0, 7),
+            "device": rng.choice(["Unknown", "iPhone", "Pixel"]),
+            "location": rng.choice(["IN", "US", "Iran", "Russia", "UK"]),
+        }
+        assert [r.id for r in compiled.evaluate(txn)] == naive(rules, txn)
+
+
+def test_shipped_rules_reproduce_previous_checks():
+    engine = RuleEngine()
+    txn = {"amount": 20000, "location": "Iran", "device": "Unknown", "txn_count_1m": 5, "new_device": False}
+
+    assert [r.reason for r in engine.evaluate(txn)] == [
+        "High transaction amount", "Unusual location", "Unrecognized device", "High transaction velocity",
+    ]
+    assert engine.evaluate({"amount": 100, "location": "India", "device": "iPhone", "txn_count_1m": 0}) == []
+
+
+def test_hot_reload_and_hit_counters(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [{"id": "big", "field": "amount", "op": "gt", "value": 100, "reason": "big"}]}))
+    engine = RuleEngine(str(path), reload_seconds=0)
+
+    assert [r.id for r in engine.evaluate({"amount": 500})] == ["big"]
+
+    path.write_text(json.dumps({"rules": [{"id": "huge", "field": "amount", "op": "gt", "value": 1000, "reason": "huge"}]}))
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+    assert engine.evaluate({"amount": 500}) == []
+    assert [r.id for r in engine.evaluate({"amount": 5000})] == ["huge"]
+
+    # A broken edit keeps the last good rule set
+    path.write_text("{not json")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2_000_000))
+    assert [r.id for r in engine.evaluate({"amount": 5000})] == ["huge"]
+    assert engine.hit_counts == {"big": 1, "huge": 2}
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(RuleError):
+        CompiledRules([{"id": "x", "field": "amount", "op": "between", "value": 1}])
+    with pytest.raises(RuleError):
+        CompiledRules([{"id": "x", "field": "location", "op": "in", "value": "Iran"}])
@@ -0,0 +1,80 @@
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("pymongo")
+
+from models.transaction import transactions_repository
+from models.fraud_logs import fraud_logs_repository
+from services import ml_fraud_detection
+from services.forest_evaluator import CompiledForest
+from services.fraud_training import Reservoir, iter_collection, train_incremental, publish_model, load_training_checkpoint, current_version_dir
+
+
+def seed(count, fraud=False):
+    """Legitimate transactions are small card payments, fraud logs large UPI ones."""
+    rng = np.random.default_rng(int(fraud))
+    repository, low, high, method = (fraud_logs_repository, 20000, 50000, "upi") if fraud else (transactions_repository, 10, 2000, "card")
+    repository.insert_many([
+        {"amount": float(a), "payment_method": method, "user_email": "a@x.com"} for a in rng.uniform(low, high, count)
+    ])
+
+
+def train(registry, chunk_size=100):
+    model, state = load_training_checkpoint(registry)
+    state = state or {}
+    model, state = train_incremental(
+        iter_collection(transactions_repository, state.get("transactions_watermark"), chunk_size),
+        iter_collection(fraud_logs_repository, state.get("fraud_logs_watermark"), chunk_size),
+        model=model, state=state, trees_per_chunk=5, max_trees=30,
+    )
+    return model, state
+
+
+def test_collections_are_streamed_in_projected_chunks(mongo):
+    seed(250)
+    chunks = list(iter_collection(transactions_repository, chunk_size=100))
+
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert set(chunks[0][0]) == {"_id", "amount", "payment_method"}
+    assert [len(c) for c in iter_collection(transactions_repository, chunks[1][-1]["_id"], 100)] == [50]
+
+
+def test_reservoir_stays_bounded():
+    reservoir = Reservoir(100)
+    for start in range(0, 10000, 1000):
+        reservoir.add(np.full((1000, 2), start, dtype=float))
+
+    assert reservoir.rows.shape == (100, 2) and reservoir.seen == 10000
+    assert len(np.unique(reservoir.rows[:, 0])) > 5
+
+
+def test_incremental_training_only_reads_new_rows_and_swaps_model(mongo, tmp_path, monkeypatch):
+    registry = str(tmp_path)
+    seed(300)
+    seed(60, fraud=True)
+
+    model, state = train(registry)
+    first = publish_model(model, state, registry)
+    assert state["rows"] == {"transactions": 300, "fraud_logs": 60}
+    assert len(model.estimators_) == 15
+    assert model.predict([[45000, 1], [50, 0]]).tolist() == [1, 0]
+
+    monkeypatch.setattr(ml_fraud_detection, "MODEL_REGISTRY_DIR", registry)
+    ml_fraud_detection.set_fraud_model(None)
+    try:
+        served = ml_fraud_detection.get_fraud_model()
+        assert isinstance(served, CompiledForest) and served.metadata["version"] == os.path.basename(first)
+
+        seed(100)
+        model, state = train(registry)
+        second = publish_model(model, state, registry)
+        assert state["rows"] == {"transactions": 100, "fraud_logs": 0}
+        assert len(model.estimators_) == 20
+        assert current_version_dir(registry) == second
+
+        monkeypatch.setattr(ml_fraud_detection, "_next_check", 0.0)
+        assert ml_fraud_detection.get_fraud_model().metadata["version"] == os.path.basename(second)
+    finally:
+        ml_fraud_detection.set_fraud_model(None)
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("pymongo")
+
+from quantum_simulation.hybrid_kem import generate_keypair, encapsulate, decapsulate
+from quantum_simulation.envelope import decode_envelope, encode_envelope
+from services.kem_sessions import SessionKeyManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hybrid_kem_round_trip():
+    public, secret = generate_keypair()
+    key, encapsulation = encapsulate(public)
+
+    assert len(key) == 32
+    assert decapsulate(secret, encapsulation) == key
+    assert encapsulate(public)[0] != key
+
+
+def test_session_is_reused_then_rotated_by_message_count(mongo):
+    manager = SessionKeyManager(max_messages=3, max_age_seconds=3600)
+    key_ids = [decode_envelope(manager.encrypt("client-1", f"{i} INR via card")).key_id for i in range(7)]
+
+    assert key_ids[0] == key_ids[1] == key_ids[2]
+    assert key_ids[3] == key_ids[4] == key_ids[5] != key_ids[0]
+    assert key_ids[6] not in key_ids[:6]
+    assert mongo.kem_sessions.count_documents({"party_id": "client-1"}) == 3
+
+
+def test_session_rotates_by_age_and_parties_are_separate(mongo):
+    clock = FakeClock()
+    manager = SessionKeyManager(max_messages=1000, max_age_seconds=60, clock=clock)
+
+    def key_id(party, message):
+        return decode_envelope(manager.encrypt(party, message)).key_id
+
+    first = key_id("client-1", "a")
+    assert key_id("client-1", "b") == first
+    assert key_id("merchant-9", "c") != first
+
+    clock.now += 61
+    assert key_id("client-1", "d") != first
+
+
+def test_payloads_decrypt_after_restart_via_stored_encapsulation(mongo):
+    encrypted = SessionKeyManager().encrypt("client-1", "2499.0 INR via card")
+
+    envelope = decode_envelope(encrypted)
+    assert envelope.version == 3 and len(envelope.key_ref) == 16
+    restarted = SessionKeyManager()
+    assert restarted.decrypt(encrypted) == b"2499.0 INR via card"
+
+    other = decode_envelope(SessionKeyManager().encrypt("client-2", "x"))
+    with pytest.raises(Exception):
+        restarted.decrypt(encode_envelope(3, other.key_ref, envelope.iv, envelope.sealed))  # key id is authenticated
+
+
+def test_registered_recipient_gets_sessions_only_it_can_open(mongo):
+    manager = SessionKeyManager()
+    manager.encrypt("merchant-1", "before registration")
+    public, secret = generate_keypair()
+    manager.register_recipient("merchant-1", public)
+
+    encrypted = manager.encrypt("merchant-1", "1000 INR via upi")
+    key_id = decode_envelope(encrypted).key_id
+    session = mongo.kem_sessions.find_one({"_id": key_id})
+
+    assert session["recipient"] == "merchant-1"
+    assert decapsulate(secret, session["encapsulation"]) == manager.keys.get(key_id)
+    with pytest.raises(PermissionError):
+        SessionKeyManager().decrypt(encrypted)
@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("prometheus_client")
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from monitoring.prometheus_metrics import setup_metrics, REQUEST_COUNT
+
+
+def sample(method, path, status):
+    return REQUEST_COUNT.labels(method, path, status)._value.get()
+
+
+def test_asgi_metrics_record_status_and_pass_streams_through():
+    app = FastAPI()
+    setup_metrics(app)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n".encode()
+        return StreamingResponse(chunks(), status_code=202)
+
+    client = TestClient(app)
+    before = sample("GET", "/stream", 202)
+    response = client.get("/stream")
+
+    assert response.status_code == 202
+    assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+    assert sample("GET", "/stream", 202) == before + 1
+    assert b"http_requests_total" in client.get("/metrics").content
@@ -0,0 +1,107 @@
+import re
+import sys
+import threading
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("twilio")
+
+from services import otp_service
+
+MOBILE = "+919876543210"
+
+
+class FakeSms:
+    def __init__(self):
+        self.sent = []
+        self.messages = self
+
+    def create(self, body, from_, to):
+        self.sent.append((to, body))
+
+    def last_otp(self):
+        return re.search(r"is (\d{6})", self.sent[-1][1]).group(1)
+
+
+@pytest.fixture
+def sms(monkeypatch, mongo):
+    from models.otp import otp_repository
+    otp_repository.ensure_indexes()
+    fake = FakeSms()
+    monkeypatch.setattr(otp_service, "client", fake)
+    return fake
+
+
+def test_otp_is_stored_hashed_and_consumed_once(sms, mongo):
+    assert otp_service.send_otp(MOBILE, "t-1")["status"] == "success"
+    otp = sms.last_otp()
+    stored = mongo.otp_storage.find_one({"transaction_id": "t-1"})
+
+    assert "otp" not in stored and otp not in str(stored)
+    assert otp_service.verify_otp(MOBILE, otp, "t-1")["status"] == "success"
+    assert otp_service.verify_otp(MOBILE, otp, "t-1")["status"] == "failed"
+
+
+def test_resend_window_and_transactions_are_independent(sms, mongo):
+    otp_service.send_otp(MOBILE, "t-1")
+    first = sms.last_otp()
+    assert otp_service.send_otp(MOBILE, "t-1")["message"] == "Please wait before requesting a new OTP"
+
+    otp_service.send_otp(MOBILE, "t-2")
+    second = sms.last_otp()
+    assert otp_service.verify_otp(MOBILE, second, "t-2")["status"] == "success"
+    assert otp_service.verify_otp(MOBILE, first, "t-1")["status"] == "success"  # t-2's verify left t-1 alone
+
+    otp_service.send_otp(MOBILE, "t-3")
+    mongo.otp_storage.update_one({"transaction_id": "t-3"}, {"$set": {"resend_at": datetime.utcnow() - timedelta(seconds=1)}})
+    assert otp_service.send_otp(MOBILE, "t-3")["status"] == "success"
+    assert mongo.otp_storage.count_documents({"transaction_id": "t-3"}) == 1
+
+
+def test_expired_and_brute_forced_otps_are_rejected(sms, mongo):
+    otp_service.send_otp(MOBILE, "t-1")
+    mongo.otp_storage.update_one({"transaction_id": "t-1"}, {"$set": {"expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+    assert otp_service.verify_otp(MOBILE, sms.last_otp(), "t-1")["message"] == "Invalid OTP or expired"
+
+    otp_service.send_otp(MOBILE, "t-2")
+    otp = sms.last_otp()
+    wrong = "000000" if otp != "000000" else "111111"
+    results = [otp_service.verify_otp(MOBILE, wrong, "t-2")["message"] for _ in range(otp_service.OTP_MAX_ATTEMPTS)]
+    assert results[-1] == "Too many attempts, request a new OTP"
+    assert otp_service.verify_otp(MOBILE, otp, "t-2")["status"] == "failed"
+
+
+@pytest.fixture
+def atomic_calls(monkeypatch):
+    """Each mongomock call runs under one lock, like a single-document operation on a real server."""
+    import mongomock
+    lock = threading.Lock()
+    for name in ("find_one", "find_one_and_delete", "find_one_and_update", "update_one", "delete_one"):
+        method = getattr(mongomock.Collection, name)
+
+        def atomic(self, *args, _method=method, **kwargs):
+            with lock:
+                return _method(self, *args, **kwargs)
+        monkeypatch.setattr(mongomock.Collection, name, atomic)
+
+
+def test_concurrent_verifies_accept_exactly_one(sms, atomic_calls):
+    """Verification must hinge on one atomic operation: a find-then-delete would let several threads through."""
+    sys.setswitchinterval(1e-6)
+    otp_service.send_otp(MOBILE, "t-1")
+    otp = sms.last_otp()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def verify():
+        barrier.wait()
+        results.append(otp_service.verify_otp(MOBILE, otp, "t-1")["status"])
+
+    threads = [threading.Thread(target=verify) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sys.setswitchinterval(0.005)
+    assert sorted(results) == ["failed"] * 7 + ["success"]
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime
+import pytest
+
+pytest.importorskip("cryptography")
+pytest.importorskip("pymongo")
+
+from models.transaction import transactions_repository
+from services.pq_signatures import RecordSigner
+from services.workers import shutdown_workers
+
+
+def record(i=0):
+    return {"user_identifier": "a@x.com", "amount": 100.0 + i, "payment_method": "card", "status": "Success",
+            "timestamp": datetime(2026, 1, 2, 3, 4, 5, 678901), "encrypted_data": {"version": 2, "ciphertext": "abc"}}
+
+
+def test_keys_are_created_once_and_reused(tmp_path):
+    first = RecordSigner(key_dir=str(tmp_path))
+    second = RecordSigner(key_dir=str(tmp_path))
+
+    assert first.key_id == second.key_id and first.public_key == second.public_key
+    assert oct((tmp_path / f"{first.algorithm}.key").stat().st_mode & 0o777) == "0o600"
+
+
+def test_signature_survives_a_database_round_trip(mongo, tmp_path):
+    signer = RecordSigner(key_dir=str(tmp_path))
+    document = record()
+    document.update(signer.sign_record(document))
+    transactions_repository.save(document)
+
+    stored = transactions_repository.find_one({"_id": document["_id"]})
+    assert signer.verify_record(stored)
+
+    stored["amount"] = 1_000_000.0
+    assert not signer.verify_record(stored)
+    assert not RecordSigner(key_dir=str(tmp_path / "other")).verify_record(document)
+
+
+def test_bulk_verification_on_the_process_pool(tmp_path):
+    signer = RecordSigner(key_dir=str(tmp_path))
+    records = []
+    for i in range(50):
+        r = record(i)
+        r.update(signer.sign_record(r))
+        records.append(r)
+    records[7]["status"] = "Failed"
+    records[9]["pq_key_id"] = "someone-else"
+
+    try:
+        results = asyncio.run(signer.verify_records(records, chunk_size=8))
+    finally:
+        shutdown_workers()
+
+    assert results == [i not in (7, 9) for i in range(50)]
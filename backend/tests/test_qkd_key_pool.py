@@ -0,0 +1,65 @@
+import time
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pymongo")
+pytest.importorskip("prometheus_client")
+
+from models.qkd_key import qkd_keys_repository
+from services import qkd_key_pool, quantum_cryptography
+from services.qkd_key_pool import QkdKeyPool, KeyPoolExhausted
+
+
+def wait_until(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_encrypted_transactions_decrypt_with_the_stored_key_id(mongo, monkeypatch):
+    pool = QkdKeyPool(low_water=2, high_water=8, batch_size=8)
+    monkeypatch.setattr(qkd_key_pool, "_pool", pool)
+    pool.fill(8)
+
+    encrypted = [quantum_cryptography.encrypt_transaction(f"Transaction {i}: 1000 INR") for i in range(3)]
+
+    assert len({e["key_id"] for e in encrypted}) == 3
+    assert [quantum_cryptography.decrypt_transaction(e) for e in encrypted] == [f"Transaction {i}: 1000 INR" for i in range(3)]
+
+    # A fresh process (empty index) resolves the key ids from the persistent store
+    monkeypatch.setattr(qkd_key_pool, "_pool", QkdKeyPool())
+    assert quantum_cryptography.decrypt_transaction(encrypted[0]) == "Transaction 0: 1000 INR"
+
+
+def test_keys_are_stored_wrapped(mongo):
+    pool = QkdKeyPool(low_water=1, high_water=4)
+    pool.fill(4)
+    key_id, key = pool.take()
+    document = mongo.qkd_keys.find_one({"_id": key_id})
+
+    assert key not in document["wrapped_key"]
+    with pytest.raises(Exception):
+        QkdKeyPool(wrap_password="someone-else").lookup(key_id)
+
+
+def test_pool_refills_between_water_marks(mongo):
+    pool = QkdKeyPool(low_water=4, high_water=16, batch_size=8, wait_seconds=10)
+    pool.start()
+    try:
+        wait_until(lambda: len(pool) == 16)
+        taken = [pool.take() for _ in range(13)]
+        wait_until(lambda: len(pool) == 16)
+
+        assert len({key_id for key_id, _ in taken}) == 13
+        assert qkd_keys_repository.count_documents({}) == 16 + 13
+    finally:
+        pool.stop()
+
+
+def test_empty_pool_without_refill_fails_fast(mongo):
+    pool = QkdKeyPool(wait_seconds=0.05)
+    pool._thread = object()  # pretend a (stalled) refill thread exists
+
+    with pytest.raises(KeyPoolExhausted):
+        pool.take()
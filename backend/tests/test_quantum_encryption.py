@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("cryptography")
+
+from quantum_simulation.quantum_encrypt import encrypt_message
+from quantum_simulation.quantum_decrypt import decrypt_message
+from quantum_simulation import key_management
+from scripts.bench_quantum_encrypt import legacy_encrypt_message
+
+PASSWORD = "quantumSecureKey"
+
+
+def test_v2_round_trip_uses_fresh_nonce():
+    first = encrypt_message("1000 INR via upi", PASSWORD)
+    second = encrypt_message("1000 INR via upi", PASSWORD)
+
+    assert first["version"] == key_management.CURRENT_FORMAT_VERSION
+    assert "salt" not in first
+    assert first["nonce"] != second["nonce"]
+    assert decrypt_message(first, PASSWORD) == b"1000 INR via upi"
+
+
+def test_legacy_salt_blob_still_decrypts():
+    legacy = legacy_encrypt_message("500 INR via card", PASSWORD)
+
+    assert "version" not in legacy
+    assert decrypt_message(legacy, PASSWORD) == b"500 INR via card"
+
+
+def test_master_key_is_derived_once():
+    key_management.clear_key_caches()
+    for _ in range(5):
+        encrypt_message("x", PASSWORD)
+
+    assert key_management.get_master_key.cache_info().misses == 1
+
+
+def test_unknown_version_is_rejected():
+    blob = encrypt_message("x", PASSWORD)
+    blob["version"] = 99
+
+    with pytest.raises(ValueError):
+        decrypt_message(blob, PASSWORD)
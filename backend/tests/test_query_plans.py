@@ -0,0 +1,73 @@
+"""
+Explain-plan checks for hot queries. Needs a real mongod (mongomock has no
+query planner); set TEST_MONGO_URI or run one on localhost, otherwise skipped.
+"""
+import os
+from datetime import datetime
+import pytest
+
+pymongo = pytest.importorskip("pymongo")
+
+from models import database
+from models.migrations import ensure_indexes
+from models.user import identifier_field
+
+TEST_MONGO_URI = os.getenv("TEST_MONGO_URI", "mongodb://localhost:27017/")
+TEST_DB_NAME = "secure_payment_db_test_plans"
+
+HOT_QUERIES = [
+    ("users", {identifier_field("a@x.com"): "a@x.com"}, None),
+    ("users", {identifier_field("9876543210"): "9876543210"}, None),
+    ("transactions", {"user_identifier": "a@x.com"}, [("timestamp", -1)]),
+    ("transactions", {"user_email": "a@x.com"}, [("timestamp", -1)]),
+    ("fraud_logs", {"user_email": "a@x.com"}, [("timestamp", -1)]),
+    ("otp_storage", {"mobile_number": "9876543210", "transaction_id": "t-1"}, None),
+    ("cardholders", {"card_number": "4111111111111111"}, None),
+]
+
+
+def plan_stages(plan):
+    """Yield every `stage` name anywhere in an explain() document."""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+@pytest.fixture(scope="module")
+def live_db():
+    client = pymongo.MongoClient(TEST_MONGO_URI, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except pymongo.errors.PyMongoError:
+        pytest.skip("no mongod available for explain-plan checks")
+
+    client.drop_database(TEST_DB_NAME)
+    database.set_client(client)
+    original_name, database.MONGO_DB_NAME = database.MONGO_DB_NAME, TEST_DB_NAME
+    ensure_indexes()
+
+    db = client[TEST_DB_NAME]
+    db["users"].insert_one({"email": "a@x.com", "mobile_number": "9876543210", "name": "A"})
+    db["transactions"].insert_one({"user_identifier": "a@x.com", "timestamp": datetime.utcnow()})
+    yield db
+
+    client.drop_database(TEST_DB_NAME)
+    database.MONGO_DB_NAME = original_name
+    database.set_client(None)
+    client.close()
+
+
+@pytest.mark.parametrize("collection, query, sort", HOT_QUERIES)
+def test_hot_query_uses_an_index(live_db, collection, query, sort):
+    cursor = live_db[collection].find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    stages = set(plan_stages(cursor.explain()["queryPlanner"]["winningPlan"]))
+
+    assert "COLLSCAN" not in stages, f"{collection} {query} falls back to a collection scan: {stages}"
+    assert "IXSCAN" in stages or "EXPRESS_IXSCAN" in stages or "IDHACK" in stages
@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from security.firewalls.rate_limiter import RateLimiter, InMemoryBackend, SQLiteBackend, MongoBackend
+from security.firewalls import ddos_protection
+
+WINDOW = 60
+T0 = 6_000_000.0  # ✅ Start of a window
+
+
+def exhaust(limiter, key, limit, now):
+    return [limiter.check(key, limit, now=now).allowed for _ in range(limit + 2)]
+
+
+def test_memory_backend_enforces_limit_and_slides():
+    limiter = RateLimiter(InMemoryBackend(), window_seconds=WINDOW)
+
+    assert exhaust(limiter, "ip:a", 10, T0) == [True] * 10 + [False, False]
+    # ✅ Half-way through the next window half of the previous count still applies
+    assert sum(exhaust(limiter, "ip:a", 10, T0 + WINDOW * 1.5)) == 5
+    assert all(exhaust(limiter, "ip:a", 10, T0 + WINDOW * 3)[:10])
+
+
+def test_memory_backend_state_is_bounded_and_idle_keys_evicted():
+    backend = InMemoryBackend(max_keys=100)
+    limiter = RateLimiter(backend, window_seconds=WINDOW)
+
+    for i in range(1000):
+        limiter.check(f"ip:{i}", 5, now=T0)
+    assert len(backend) == 100
+
+    limiter.check("ip:late", 5, now=T0 + WINDOW * 3)
+    assert len(backend) == 1
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "limits.db")
+    worker_a = RateLimiter(SQLiteBackend(path), window_seconds=WINDOW)
+    worker_b = RateLimiter(SQLiteBackend(path), window_seconds=WINDOW)
+
+    results = [(worker_a if i % 2 else worker_b).check("ip:shared", 6, now=T0).allowed for i in range(8)]
+    assert results == [True] * 6 + [False, False]
+
+
+def test_mongo_backend_matches_memory_semantics(mongo):
+    from models.rate_limit import rate_limit_repository
+    limiter = RateLimiter(MongoBackend(rate_limit_repository), window_seconds=WINDOW)
+
+    assert exhaust(limiter, "ip:m", 4, T0) == [True] * 4 + [False, False]
+    assert mongo["rate_limits"].find_one({"_id": "ip:m"})["current"] == 4
+
+
+def test_middleware_applies_route_limit_and_check_ddos_shares_state():
+    ddos_protection.set_rate_limiter(RateLimiter(InMemoryBackend(), window_seconds=WINDOW))
+
+    app = FastAPI()
+    app.add_middleware(ddos_protection.RateLimitMiddleware, limit_per_minute=5, route_limits={"/otp/send": 2})
+
+    @app.post("/otp/send")
+    async def send():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert [client.post("/otp/send").status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/health").status_code == 200
+    assert "Retry-After" in client.post("/otp/send").headers
+
+    assert ddos_protection.check_ddos("testclient", limit_per_minute=3) is True
+    assert ddos_protection.check_ddos("other", limit_per_minute=3) is False
+    ddos_protection.set_rate_limiter(None)
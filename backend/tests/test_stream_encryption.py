@@ -0,0 +1,75 @@
+import io
+import json
+import os
+from datetime import datetime, timedelta
+import pytest
+
+pytest.importorskip("cryptography")
+
+from services.stream_encryption import StreamError, encrypt_stream, encrypt_buffer, decrypt_buffer, TAG_SIZE
+
+KEY = bytes(range(32))
+CHUNK = 1024
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK - 1, CHUNK, CHUNK + 1, 3 * CHUNK, 3 * CHUNK + 17])
+def test_round_trip_from_file_bytes_and_memoryview(size):
+    data = os.urandom(size)
+
+    from_file = b"".join(encrypt_stream(KEY, io.BytesIO(data), chunk_size=CHUNK, key_id="k1"))
+    from_view = b"".join(encrypt_buffer(KEY, memoryview(bytearray(data)), chunk_size=CHUNK))
+
+    assert decrypt_buffer(KEY, from_file) == data
+    assert decrypt_buffer(KEY, from_view) == data
+
+
+def _frames(data):
+    frames = list(encrypt_buffer(KEY, data, chunk_size=CHUNK))
+    return frames[0], frames[1:]
+
+
+def test_truncation_reordering_and_tampering_are_detected():
+    header, chunks = _frames(os.urandom(3 * CHUNK + 10))
+
+    with pytest.raises(StreamError):  # final chunk dropped
+        decrypt_buffer(KEY, header + b"".join(chunks[:-1]))
+    with pytest.raises(StreamError):  # cut on a chunk boundary
+        decrypt_buffer(KEY, header + b"".join(chunks[:2]))
+    with pytest.raises(StreamError):  # chunks swapped
+        decrypt_buffer(KEY, header + chunks[1] + chunks[0] + b"".join(chunks[2:]))
+    with pytest.raises(StreamError):  # trailing garbage
+        decrypt_buffer(KEY, header + b"".join(chunks) + b"x")
+
+    flipped = bytearray(header + b"".join(chunks))
+    flipped[len(header) + CHUNK + TAG_SIZE + 5] ^= 1
+    with pytest.raises(StreamError):
+        decrypt_buffer(KEY, bytes(flipped))
+
+
+def test_chunks_cannot_be_spliced_between_streams():
+    data = os.urandom(2 * CHUNK + 1)
+    header_a, chunks_a = _frames(data)
+    _, chunks_b = _frames(data)
+
+    with pytest.raises(StreamError):
+        decrypt_buffer(KEY, header_a + chunks_a[0] + b"".join(chunks_b[1:]))
+    with pytest.raises(StreamError):
+        decrypt_buffer(os.urandom(32), header_a + b"".join(chunks_a))
+
+
+def test_encrypted_export_round_trip(mongo):
+    from services.kem_sessions import SessionKeyManager
+    from services.transaction_export import export_transactions, open_export
+
+    start = datetime(2024, 1, 1)
+    mongo.transactions.insert_many([
+        {"user_identifier": "exporter", "amount": float(i), "timestamp": start + timedelta(minutes=i)} for i in range(50)
+    ] + [{"user_identifier": "someone-else", "amount": 1.0, "timestamp": start}])
+
+    manager = SessionKeyManager()
+    key_id, frames = export_transactions("exporter", manager=manager)
+    blob = b"".join(frames)
+
+    assert key_id.encode() in blob[:64]
+    rows = [json.loads(line) for line in b"".join(open_export(io.BytesIO(blob), manager=SessionKeyManager())).splitlines()]
+    assert [row["amount"] for row in rows] == [float(i) for i in reversed(range(50))]
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+import httpx
+from fastapi import FastAPI
+import api.transactions as transactions_api
+import services.payment_pipeline as payment_pipeline
+from api.auth import get_current_user
+from models.transaction import TransactionRepository
+
+SETTLEMENT_SECONDS = 0.5
+CONCURRENT_PAYMENTS = 8
+
+
+class SlowTransactionRepository(TransactionRepository):
+    def save(self, transaction):
+        time.sleep(0.05)  # ✅ Blocking round trip, like pymongo against a real server
+        return super().save(transaction)
+
+
+@pytest.fixture
+def payments_app(monkeypatch, mongo):
+    monkeypatch.setattr(payment_pipeline, "transactions_repository", SlowTransactionRepository())
+    monkeypatch.setattr(payment_pipeline.settings, "SETTLEMENT_MIN_SECONDS", SETTLEMENT_SECONDS)
+    monkeypatch.setattr(payment_pipeline.settings, "SETTLEMENT_MAX_SECONDS", SETTLEMENT_SECONDS)
+    monkeypatch.setattr(transactions_api.random, "random", lambda: 1.0)
+
+    app = FastAPI()
+    app.include_router(transactions_api.router, prefix="/transactions")
+    app.dependency_overrides[get_current_user] = lambda: {"identifier": "load@test.com"}
+    return app, mongo["transactions"]
+
+
+def test_concurrent_payments_overlap(payments_app):
+    """Load test: N concurrent payments must take ~1 settlement, not N settlements."""
+    app, collection = payments_app
+
+    async def run_load():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            payload = {"amount": 250.0, "payment_method": "upi", "upi_id": "load@upi"}
+            start = time.perf_counter()
+            responses = await asyncio.gather(*[
+                client.post("/transactions/process", json=payload) for _ in range(CONCURRENT_PAYMENTS)
+            ])
+            return time.perf_counter() - start, responses
+
+    elapsed, responses = asyncio.run(run_load())
+
+    assert all(response.status_code == 200 for response in responses)
+    assert collection.count_documents({}) == CONCURRENT_PAYMENTS
+    sequential_time = CONCURRENT_PAYMENTS * SETTLEMENT_SECONDS
+    assert elapsed < sequential_time / 2, f"payments ran serially: {elapsed:.2f}s for {CONCURRENT_PAYMENTS}"